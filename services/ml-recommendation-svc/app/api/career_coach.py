@@ -4,12 +4,17 @@ Personalized career guidance for freelancers
 Sprint M7: AI Work Assistant
 """
 
+from __future__ import annotations
+
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from enum import Enum
 import logging
 
+from app.services.feature_store import FeatureStore, get_feature_store
+from app.services.market_demand import get_market_demand_table
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,10 +148,18 @@ class CareerCoachService:
     based on freelancer data and market trends.
     """
     
-    def __init__(self, llm_client, market_data, metrics):
+    def __init__(
+        self,
+        llm_client,
+        market_data,
+        metrics,
+        feature_store: Optional[FeatureStore] = None
+    ):
         self.llm = llm_client
         self.market = market_data
         self.metrics = metrics
+        self.demand = get_market_demand_table()
+        self.features = feature_store or get_feature_store()
     
     # -------------------------------------------------------------------------
     # CAREER ANALYSIS
@@ -188,18 +201,7 @@ class CareerCoachService:
     
     async def _get_current_state(self, user_id: str) -> CareerSnapshot:
         """Get current career state"""
-        # In production: Query database
-        return CareerSnapshot(
-            current_monthly_earnings=5000,
-            average_hourly_rate=75,
-            active_clients=3,
-            total_projects=45,
-            completion_rate=0.96,
-            rating=4.8,
-            top_skills=["python", "django", "react"],
-            experience_years=5,
-            specialization="Web Development"
-        )
+        return CareerSnapshot(**await self.features.career_state(user_id))
     
     async def _calculate_trajectory(self, user_id: str) -> EarningsTrajectory:
         """Calculate earnings trajectory"""
@@ -228,10 +230,14 @@ class CareerCoachService:
         else:
             rate_percentile = 50
         
+        # Shared demand table scores skills 0-100
+        demand = self.demand.mean_score(state.top_skills)
+        skill_demand_score = round(demand / 100, 2) if demand is not None else 0.78
+        
         return MarketPosition(
             rate_percentile=rate_percentile,
             earnings_percentile=65,
-            skill_demand_score=0.78,
+            skill_demand_score=skill_demand_score,
             competition_level="medium",
             market_saturation=0.65
         )
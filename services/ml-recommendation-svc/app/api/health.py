@@ -23,6 +23,8 @@ async def health_check(request: Request) -> HealthResponse:
         version=settings.VERSION,
         models_loaded=model_service.is_initialized if model_service else False,
         uptime_seconds=int(time.time() - _start_time),
+        runtime=model_service.runtime_stats() if model_service else None,
+        startup=model_service.startup_report() if model_service else None,
     )
 
 
@@ -8,7 +8,8 @@ from typing import Optional
 from pydantic import BaseModel
 from enum import Enum
 import logging
-import re
+
+from app.services.text_analysis import TextDocument, analyze_text
 
 logger = logging.getLogger(__name__)
 
@@ -100,9 +101,12 @@ class ProposalAnalyzer:
         # Parse job requirements
         requirements = await self._parse_requirements(job_post)
         
+        # Tokenize once; every category reads the same document
+        proposal = analyze_text(proposal_text)
+        
         # Score each category
         category_scores = await self._score_categories(
-            proposal_text, requirements, job_post
+            proposal, requirements, job_post
         )
         
         # Calculate overall score
@@ -166,19 +170,11 @@ Return:
         return JobRequirements(
             must_haves=job_post.get('skills', []),
             nice_to_haves=[],
-            keywords=self._extract_keywords(description),
+            keywords=list(analyze_text(description).keywords[:20]),
             preferred_tone="professional",
             budget_range=self._parse_budget(job_post.get('budget'))
         )
     
-    def _extract_keywords(self, text: str) -> list[str]:
-        """Extract important keywords"""
-        words = re.findall(r'\b\w+\b', text.lower())
-        stopwords = {'the', 'a', 'an', 'is', 'are', 'we', 'you', 'for', 'to', 'of'}
-        keywords = [w for w in words if w not in stopwords and len(w) > 3]
-        # Return unique keywords
-        return list(set(keywords))[:20]
-    
     def _parse_budget(self, budget: Optional[str]) -> Optional[tuple[float, float]]:
         """Parse budget string into range"""
         if not budget:
@@ -192,7 +188,7 @@ Return:
     
     async def _score_categories(
         self,
-        proposal: str,
+        proposal: TextDocument,
         requirements: JobRequirements,
         job_post: dict
     ) -> list[CategoryScore]:
@@ -230,11 +226,11 @@ Return:
     
     def _score_requirement_coverage(
         self,
-        proposal: str,
+        proposal: TextDocument,
         requirements: JobRequirements
     ) -> CategoryScore:
         """Score how well proposal covers requirements"""
-        proposal_lower = proposal.lower()
+        proposal_lower = proposal.lower
         
         # Check must-haves
         must_have_covered = sum(
@@ -272,14 +268,14 @@ Return:
     
     def _score_personalization(
         self,
-        proposal: str,
+        proposal: TextDocument,
         job_post: dict
     ) -> CategoryScore:
         """Score personalization level"""
         score = 50
         suggestions = []
         
-        proposal_lower = proposal.lower()
+        proposal_lower = proposal.lower
         
         # Check for job-specific mentions
         title = job_post.get('title', '').lower()
@@ -311,14 +307,14 @@ Return:
     
     async def _score_tone(
         self,
-        proposal: str,
+        proposal: TextDocument,
         preferred_tone: str
     ) -> CategoryScore:
         """Score tone match"""
         # Use LLM to analyze tone
         prompt = f"""
 Analyze the tone of this proposal:
-"{proposal[:500]}"
+"{proposal.text[:500]}"
 
 Is it: formal, casual, technical, friendly, professional?
 Does it match "{preferred_tone}" tone?
@@ -336,9 +332,9 @@ Score from 0-100 how well it matches.
             suggestions=suggestions
         )
     
-    def _score_length(self, proposal: str) -> CategoryScore:
+    def _score_length(self, proposal: TextDocument) -> CategoryScore:
         """Score proposal length"""
-        word_count = len(proposal.split())
+        word_count = proposal.word_count
         
         # Optimal range: 150-400 words
         if 150 <= word_count <= 400:
@@ -369,9 +365,9 @@ Score from 0-100 how well it matches.
             suggestions=suggestions
         )
     
-    def _score_cta(self, proposal: str) -> CategoryScore:
+    def _score_cta(self, proposal: TextDocument) -> CategoryScore:
         """Score call-to-action"""
-        proposal_lower = proposal.lower()
+        proposal_lower = proposal.lower
         
         strong_ctas = [
             'schedule a call', 'let\'s discuss', 'book a meeting',
@@ -405,17 +401,16 @@ Score from 0-100 how well it matches.
             suggestions=suggestions
         )
     
-    def _score_grammar(self, proposal: str) -> CategoryScore:
+    def _score_grammar(self, proposal: TextDocument) -> CategoryScore:
         """Basic grammar scoring"""
         # Simplified checks (in production: use proper grammar checker)
         issues = []
         
         # Check for common issues
-        if '  ' in proposal:
+        if '  ' in proposal.text:
             issues.append("Double spaces found")
         
-        sentences = proposal.split('.')
-        for s in sentences:
+        for s in proposal.sentences:
             s = s.strip()
             if s and s[0].islower():
                 issues.append("Sentence starts with lowercase")
@@ -430,14 +425,12 @@ Score from 0-100 how well it matches.
             suggestions=issues[:3]
         )
     
-    async def _score_clarity(self, proposal: str) -> CategoryScore:
+    async def _score_clarity(self, proposal: TextDocument) -> CategoryScore:
         """Score clarity and readability"""
         # Calculate reading ease (simplified Flesch-Kincaid)
-        words = proposal.split()
-        sentences = proposal.count('.') + proposal.count('!') + proposal.count('?')
-        sentences = max(sentences, 1)
+        sentences = max(proposal.sentence_marks, 1)
         
-        words_per_sentence = len(words) / sentences
+        words_per_sentence = proposal.word_count / sentences
         
         if words_per_sentence < 20:
             score = 90
@@ -459,9 +452,11 @@ Score from 0-100 how well it matches.
             suggestions=suggestions
         )
     
-    def _score_opening(self, proposal: str) -> CategoryScore:
+    def _score_opening(self, proposal: TextDocument) -> CategoryScore:
         """Score opening strength"""
-        first_sentence = proposal.split('.')[0] if '.' in proposal else proposal[:100]
+        first_sentence = (
+            proposal.sentences[0] if len(proposal.sentences) > 1 else proposal.text[:100]
+        )
         first_lower = first_sentence.lower()
         
         # Weak openers
@@ -499,10 +494,10 @@ Score from 0-100 how well it matches.
             suggestions=suggestions
         )
     
-    def _score_closing(self, proposal: str) -> CategoryScore:
+    def _score_closing(self, proposal: TextDocument) -> CategoryScore:
         """Score closing strength"""
         # Get last 100 characters
-        closing = proposal[-100:].lower() if len(proposal) > 100 else proposal.lower()
+        closing = proposal.lower[-100:]
         
         strong_closings = [
             'look forward', 'discuss', 'call', 'chat',
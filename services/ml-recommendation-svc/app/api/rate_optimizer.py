@@ -5,13 +5,24 @@ Sprint M7: AI Work Assistant
 """
 
 from typing import Optional
+from dataclasses import asdict
 from pydantic import BaseModel
 from enum import Enum
 from datetime import datetime
+import asyncio
 import logging
+import numpy as np
+
+from app.core.config import settings
+from app.services.feature_store import EntityLoader
+from app.services.rate_cube import get_rate_cube
+from app.services.rate_sketches import get_rate_sketch_store
 
 logger = logging.getLogger(__name__)
 
+# Rates sampled across the recommended range when building a win curve
+WIN_CURVE_POINTS = 201
+
 
 # =============================================================================
 # TYPES
@@ -44,6 +55,13 @@ class RateAnalysis(BaseModel):
     recommendations: list[str]
 
 
+class RateRecommendationResult(BaseModel):
+    """One job's outcome in a batch rate optimization"""
+    job_id: str
+    recommendation: Optional[RateRecommendation] = None
+    error: Optional[str] = None
+
+
 class MarketRateData(BaseModel):
     """Market rate information"""
     skill: str
@@ -92,10 +110,25 @@ class RateOptimizerService:
     and historical win rates to recommend optimal pricing.
     """
     
-    def __init__(self, rate_model, market_data, metrics):
+    def __init__(self, rate_model, market_data, metrics, rate_sketches=None, rate_cube=None):
         self.model = rate_model
         self.market = market_data
         self.metrics = metrics
+        # Percentiles of accepted rates, streamed in from bid outcomes
+        self.sketches = rate_sketches if rate_sketches is not None else get_rate_sketch_store()
+        # Bid history rollups by skill, level and location
+        self.cube = rate_cube if rate_cube is not None else get_rate_cube()
+        
+        # Market rates change slowly; cache them per skill (the backend's
+        # only key) and bound how many lookups hit it at once
+        self._market_fetches = asyncio.Semaphore(settings.MARKET_RATE_CONCURRENCY)
+        self.market_rates = EntityLoader(
+            "market_rate",
+            self._load_market_rates,
+            ttl_seconds=settings.MARKET_RATE_CACHE_TTL_SECONDS,
+            max_entries=settings.MARKET_RATE_CACHE_MAX_ENTRIES,
+            max_batch_size=settings.FEATURE_STORE_BATCH_SIZE,
+        )
     
     # -------------------------------------------------------------------------
     # RATE RECOMMENDATION
@@ -138,6 +171,85 @@ class RateOptimizerService:
             adjusted_range, job, freelancer
         )
         
+        return self._recommend(
+            rate_curve, adjusted_range, market_rates, job, freelancer, strategy
+        )
+    
+    async def get_optimal_rates(
+        self,
+        jobs: list[JobContext],
+        freelancer: FreelancerProfile,
+        strategy: RateStrategy = RateStrategy.BALANCED
+    ) -> list[RateRecommendationResult]:
+        """
+        Get optimal rate recommendations for many jobs for one freelancer
+        
+        Market rates are looked up once per distinct skill across all
+        jobs, and every job's win curve is computed in one vectorized
+        model call. Results come back in input order; a job that fails
+        carries its error instead of a recommendation.
+        """
+        logger.info(f"Getting optimal rates for {len(jobs)} jobs")
+        
+        results = [RateRecommendationResult(job_id=job.job_id) for job in jobs]
+        
+        # One market lookup per distinct skill across the feed
+        skills = list(dict.fromkeys(s for job in jobs for s in job.skills_required))
+        fetched = await self._fetch_market_rates(skills)
+        
+        # Rate ranges are cheap per-job arithmetic
+        ranged = []
+        for i, job in enumerate(jobs):
+            try:
+                market_rates = self._market_rates_for(job.skills_required, fetched)
+                skill_match = self._calculate_skill_match(freelancer.skills, job.skills_required)
+                base_range = self._calculate_base_range(freelancer, market_rates, skill_match)
+                ranged.append((i, market_rates, self._adjust_for_job(base_range, job, freelancer)))
+            except Exception as e:
+                logger.warning(f"Rate range failed for job {job.job_id}: {e}")
+                results[i].error = str(e)
+        
+        if not ranged:
+            return results
+        
+        # Win curves for every job in one pass: (jobs, WIN_CURVE_POINTS)
+        rates = np.linspace(
+            [r['min'] for _, _, r in ranged],
+            [r['max'] for _, _, r in ranged],
+            WIN_CURVE_POINTS,
+            axis=1
+        )
+        win_probs, failed = await self.model.predict_win_curves(
+            rates=rates,
+            job_ids=[jobs[i].job_id for i, _, _ in ranged],
+            user_id=freelancer.user_id
+        )
+        
+        for row, (i, market_rates, adjusted_range) in enumerate(ranged):
+            if row in failed:
+                results[i].error = str(failed[row])
+                continue
+            try:
+                results[i].recommendation = self._recommend(
+                    self._build_curve(rates[row], win_probs[row]),
+                    adjusted_range, market_rates, jobs[i], freelancer, strategy
+                )
+            except Exception as e:
+                logger.warning(f"Rate recommendation failed for job {jobs[i].job_id}: {e}")
+                results[i].error = str(e)
+        
+        return results
+    
+    def _recommend(
+        self,
+        rate_curve: list[dict],
+        adjusted_range: dict,
+        market_rates: dict,
+        job: JobContext,
+        freelancer: FreelancerProfile,
+        strategy: RateStrategy
+    ) -> RateRecommendation:
+        """Pick the rate for a strategy from a win curve and explain it"""
         # Select optimal rate based on strategy
         optimal = self._select_optimal_rate(rate_curve, strategy)
         
@@ -163,11 +275,19 @@ class RateOptimizerService:
     
     async def _get_market_rates(self, skills: list[str]) -> dict:
         """Get market rates for skills"""
-        rates = {}
-        for skill in skills:
-            market_data = await self.market.get_rate_data(skill)
-            if market_data:
-                rates[skill] = market_data
+        return self._market_rates_for(skills, await self._fetch_market_rates(skills))
+    
+    async def _fetch_market_rates(self, skills: list[str]) -> dict:
+        """Look up market data for each distinct skill"""
+        return await self.get_market_rates(skills)
+    
+    def _market_rates_for(self, skills: list[str], fetched: dict) -> dict:
+        """Market rates for a job's skills from already fetched data"""
+        rates = {
+            skill: fetched[skill]
+            for skill in skills
+            if fetched.get(skill)
+        }
         
         # If no data, use defaults
         if not rates:
@@ -272,29 +392,31 @@ class RateOptimizerService:
         freelancer: FreelancerProfile
     ) -> list[dict]:
         """Calculate win probability at different rates"""
-        curve = []
-        
-        # Sample rates across range
-        min_rate = rate_range['min']
-        max_rate = rate_range['max']
-        step = (max_rate - min_rate) / 10
-        
-        for i in range(11):
-            rate = min_rate + (step * i)
-            win_prob = await self.model.predict_win_at_rate(
-                rate=rate,
-                job_id=job.job_id,
-                user_id=freelancer.user_id
-            )
-            expected_value = rate * win_prob
-            
-            curve.append({
-                'rate': round(rate, 2),
-                'win_prob': win_prob,
-                'expected_value': round(expected_value, 2)
-            })
+        # Sample rates across range, evaluated in one model call
+        rates = np.linspace(rate_range['min'], rate_range['max'], WIN_CURVE_POINTS)
+        win_probs = await self.model.predict_win_curve(
+            rates=rates,
+            job_id=job.job_id,
+            user_id=freelancer.user_id
+        )
+        return self._build_curve(rates, win_probs)
+    
+    def _build_curve(self, rates: np.ndarray, win_probs: np.ndarray) -> list[dict]:
+        """Win curve points with expected value (rate * win probability)"""
+        expected_values = rates * win_probs
         
-        return curve
+        return [
+            {
+                'rate': rate,
+                'win_prob': win_prob,
+                'expected_value': expected_value
+            }
+            for rate, win_prob, expected_value in zip(
+                np.round(rates, 2).tolist(),
+                win_probs.tolist(),
+                np.round(expected_values, 2).tolist()
+            )
+        ]
     
     def _select_optimal_rate(
         self,
@@ -308,7 +430,7 @@ class RateOptimizerService:
         elif strategy == RateStrategy.PREMIUM:
             # Maximize rate with acceptable win probability (>30%)
             viable = [p for p in curve if p['win_prob'] >= 0.3]
-            optimal = max(viable, key=lambda x: x['rate']) if viable else curve[5]
+            optimal = max(viable, key=lambda x: x['rate']) if viable else curve[len(curve) // 2]
         else:  # BALANCED
             # Maximize expected value
             optimal = max(curve, key=lambda x: x['expected_value'])
@@ -479,9 +601,85 @@ class RateOptimizerService:
     # MARKET RATES
     # -------------------------------------------------------------------------
     
-    async def get_market_rate(self, skill: str) -> Optional[MarketRateData]:
-        """Get market rate for a specific skill"""
-        return await self.market.get_rate_data(skill)
+    async def get_market_rate(
+        self,
+        skill: str,
+        experience_level: str = "mid",
+        location: Optional[str] = None
+    ) -> Optional[MarketRateData]:
+        """
+        Get market rate for a specific skill
+        
+        Answered from the rate sketches, then the rate cube, once enough
+        outcomes have been recorded for the (skill, level, location);
+        otherwise from market data, which is per skill only.
+        """
+        percentiles = self.sketches.percentiles(skill, experience_level, location)
+        if percentiles is not None:
+            return MarketRateData(
+                skill=skill,
+                experience_level=experience_level,
+                **asdict(percentiles)
+            )
+        
+        cell = self.cube.slice(skill, experience_level, location)
+        if cell is not None and cell.accepted >= settings.RATE_SKETCH_MIN_SAMPLES:
+            return MarketRateData(
+                skill=skill,
+                experience_level=experience_level,
+                percentile_25=cell.percentile_25,
+                percentile_50=cell.percentile_50,
+                percentile_75=cell.percentile_75,
+                percentile_90=cell.percentile_90,
+                sample_size=cell.accepted,
+                last_updated=self.cube.updated_at
+            )
+        
+        try:
+            return await self.market_rates.load(skill)
+        except KeyError:
+            return None
+    
+    async def get_market_rates(
+        self,
+        skills: list[str],
+        experience_level: str = "mid",
+        location: Optional[str] = None
+    ) -> dict[str, Optional[MarketRateData]]:
+        """
+        Get market rates for several skills at once
+        
+        Lookups run concurrently (at most MARKET_RATE_CONCURRENCY at a time)
+        and are served from the cache when possible. Returns one entry per
+        distinct skill, None where no data is available.
+        """
+        distinct = list(dict.fromkeys(skills))
+        rates = await asyncio.gather(*(
+            self.get_market_rate(skill, experience_level, location)
+            for skill in distinct
+        ))
+        return dict(zip(distinct, rates))
+    
+    async def _load_market_rates(self, skills: list[str]) -> dict:
+        """Fetch a batch of skills from the market backend"""
+        if self.market is None:
+            # No external backend: sketches and the cube are the only sources
+            return {}
+        
+        async def fetch(skill):
+            async with self._market_fetches:
+                return await self.market.get_rate_data(skill)
+        
+        results = await asyncio.gather(*(fetch(skill) for skill in skills), return_exceptions=True)
+        
+        loaded = {}
+        for skill, result in zip(skills, results):
+            if isinstance(result, Exception):
+                # Left out so the lookup reports no data and is retried next time
+                logger.warning(f"Market rate lookup failed for {skill}: {result}")
+                continue
+            loaded[skill] = result
+        return loaded
     
     # -------------------------------------------------------------------------
     # FEEDBACK LOOP
@@ -491,12 +689,26 @@ class RateOptimizerService:
         self,
         job_id: str,
         proposed_rate: float,
-        outcome: str,  # won, lost
-        final_rate: Optional[float] = None
+        outcome: str,  # won, lost, withdrawn
+        final_rate: Optional[float] = None,
+        skills: Optional[list[str]] = None,
+        experience_level: str = "mid",
+        location: Optional[str] = None
     ):
-        """Record bid outcome for model training"""
+        """
+        Record a bid outcome for model training
+        
+        Won and lost bids feed the rate cube, and accepted rates the rate
+        sketches, right away. This is the only place outcomes are counted.
+        """
         logger.info(f"Recording outcome: job={job_id}, outcome={outcome}")
         
+        if skills and outcome in ("won", "lost"):
+            rate = final_rate or proposed_rate
+            self.cube.record(skills, rate, outcome == "won", experience_level, location)
+            if outcome == "won":
+                self.sketches.record(skills, rate, experience_level, location)
+        
         await self.model.add_training_data({
             'job_id': job_id,
             'proposed_rate': proposed_rate,
@@ -519,12 +731,13 @@ def get_rate_optimizer_service() -> RateOptimizerService:
     global _service
     if _service is None:
         from app.models.rate_model import get_rate_model
-        from app.data.market_data import get_market_data
         from app.metrics import get_metrics
         
+        # Market rates come from the rate sketches and the rate cube; no
+        # external market data backend is deployed with this service
         _service = RateOptimizerService(
             rate_model=get_rate_model(),
-            market_data=get_market_data(),
+            market_data=None,
             metrics=get_metrics()
         )
     return _service
@@ -5,12 +5,17 @@ Recommendation generation endpoints.
 import time
 import structlog
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.schemas import (
     GenerateRecommendationsRequest,
     GenerateRecommendationsResponse,
+    BatchRecommendationsRequest,
+    BatchJobStatus,
+    BatchOutputFormat,
 )
 from app.core.config import settings
+from app.services.batch_recommendations import apply_request_filters, get_batch_runner
 
 router = APIRouter()
 logger = structlog.get_logger()
@@ -58,18 +63,8 @@ async def generate_recommendations(
             max_recommendations=body.max_recommendations,
         )
         
-        # Filter by content types if specified
-        if body.filter_content_types:
-            recommendations = [
-                r for r in recommendations
-                if r.content_type in body.filter_content_types
-            ]
-        
-        # Filter by minimum confidence
-        recommendations = [
-            r for r in recommendations
-            if r.confidence_score >= body.min_confidence
-        ]
+        # Filter by content types and minimum confidence
+        recommendations = apply_request_filters(recommendations, body)
         
         processing_time = int((time.time() - start_time) * 1000)
         
@@ -100,23 +95,66 @@ async def generate_recommendations(
         )
 
 
-@router.post("/recommendations/batch")
+@router.post("/recommendations/batch", response_model=None)
 async def batch_generate_recommendations(
     request: Request,
-    user_ids: list[str],
-):
+    body: BatchRecommendationsRequest,
+) -> BatchJobStatus | StreamingResponse:
     """
     Generate recommendations for multiple users in batch.
     
-    Useful for scheduled recommendation refresh jobs.
+    Useful for scheduled recommendation refresh jobs. Users come from the
+    inline request list or an NDJSON file under BATCH_INPUT_PATH, and are
+    sharded across a pool of workers that each load the models once.
+    
+    With ``stream`` set, results are streamed back as NDJSON (one user per
+    line, in completion order). Otherwise a resumable job is started that
+    writes NDJSON or Parquet partitions; poll it with
+    ``GET /recommendations/batch/{job_id}``.
     """
     model_service = request.app.state.model_service
     if not model_service:
         raise HTTPException(status_code=503, detail="ML models not initialized")
     
-    # In production, this would queue batch processing
-    return {
-        "status": "queued",
-        "user_count": len(user_ids),
-        "message": "Batch recommendation generation has been queued",
-    }
+    if not body.requests and not body.input_path:
+        raise HTTPException(status_code=400, detail="Provide requests or input_path")
+    if body.stream and body.output_format != BatchOutputFormat.NDJSON:
+        raise HTTPException(status_code=400, detail="Streaming output is NDJSON only")
+    
+    runner = get_batch_runner()
+    
+    try:
+        if body.input_path:
+            runner.resolve_input(body.input_path)
+        
+        if body.stream:
+            return StreamingResponse(runner.stream(body), media_type="application/x-ndjson")
+        
+        job = runner.submit(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info(
+        "Batch recommendation job started",
+        job_id=job.job_id,
+        output_format=job.output_format,
+    )
+    return job
+
+
+@router.get("/recommendations/batch/{job_id}", response_model=BatchJobStatus)
+async def get_batch_status(job_id: str) -> BatchJobStatus:
+    """Progress and throughput of a batch recommendation job."""
+    job = get_batch_runner().status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
+
+
+@router.post("/recommendations/batch/{job_id}/resume", response_model=BatchJobStatus)
+async def resume_batch_job(job_id: str) -> BatchJobStatus:
+    """Resume an interrupted batch job from its last completed shard."""
+    job = get_batch_runner().resume(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
@@ -13,8 +13,9 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 import structlog
 
-from app.api.rate_optimizer import RateOptimizerService
+from app.api.rate_optimizer import get_rate_optimizer_service
 from app.api.career_coach import CareerCoachService
+from app.services.market_demand import get_market_demand_table
 
 router = APIRouter(prefix="/ai/market", tags=["Market Insights"])
 logger = structlog.get_logger()
@@ -73,31 +74,20 @@ async def get_market_insights(
     )
 
     try:
-        rate_service = RateOptimizerService(
-            rate_model=None,
-            market_data=None,
-            metrics=None,
+        rate_service = get_rate_optimizer_service()
+
+        # Aggregate market rate data across skills (fetched concurrently, cached)
+        market_rates = await rate_service.get_market_rates(
+            request.skills,
+            experience_level="mid",
+            location=request.location,
         )
+        available = [rates for rates in market_rates.values() if rates is not None]
 
-        # Aggregate market rate data across skills
-        total_p25 = 0.0
-        total_p50 = 0.0
-        total_p75 = 0.0
-        valid_skills = 0
-
-        for skill in request.skills[:5]:  # Limit to first 5 skills for performance
-            try:
-                market_data = await rate_service.get_market_rate(
-                    skill=skill,
-                    experience_level="mid",
-                    location=request.location,
-                )
-                total_p25 += market_data.percentile_25
-                total_p50 += market_data.percentile_50
-                total_p75 += market_data.percentile_75
-                valid_skills += 1
-            except Exception:
-                continue
+        total_p25 = sum(rates.percentile_25 for rates in available)
+        total_p50 = sum(rates.percentile_50 for rates in available)
+        total_p75 = sum(rates.percentile_75 for rates in available)
+        valid_skills = len(available)
 
         if valid_skills > 0:
             avg_p25 = total_p25 / valid_skills
@@ -154,7 +144,7 @@ async def get_market_insights(
 # INTERNAL HELPERS
 # =============================================================================
 
-# Skills considered high-demand in the current market
+# Fallback for skills missing from the market demand table
 _HIGH_DEMAND_SKILLS = {
     "ai", "machine learning", "ml", "deep learning", "llm",
     "rust", "golang", "kubernetes", "devops", "cloud architecture",
@@ -184,10 +174,30 @@ def _classify_demand(p50: float, p75: float) -> str:
     return "LOW"
 
 
+# Demand score (0-100) from which a skill counts as high-demand
+_HIGH_DEMAND_SCORE = 70.0
+
+# Posting growth over 30 days treated as a rising / falling trend
+_TREND_GROWTH_THRESHOLD = 0.05
+
+
+def _is_high_demand(skill: str) -> bool:
+    score = get_market_demand_table().score(skill)
+    if score is None:
+        return skill.lower() in _HIGH_DEMAND_SKILLS
+    return score >= _HIGH_DEMAND_SCORE
+
+
 def _classify_trend(skills: list[str]) -> str:
-    high_demand_count = sum(
-        1 for s in skills if s.lower() in _HIGH_DEMAND_SKILLS
-    )
+    growth = get_market_demand_table().mean_growth(skills)
+    if growth is not None:
+        if growth > _TREND_GROWTH_THRESHOLD:
+            return "RISING"
+        elif growth < -_TREND_GROWTH_THRESHOLD:
+            return "FALLING"
+        return "STABLE"
+
+    high_demand_count = sum(1 for s in skills if _is_high_demand(s))
     ratio = high_demand_count / max(len(skills), 1)
     if ratio >= 0.5:
         return "RISING"
@@ -234,7 +244,7 @@ def _estimate_competitors(skills: list[str]) -> int:
     """Rough competitor estimate based on skill popularity."""
     base = 200
     for skill in skills:
-        if skill.lower() in _HIGH_DEMAND_SKILLS:
+        if _is_high_demand(skill):
             base += 150
         else:
             base += 50
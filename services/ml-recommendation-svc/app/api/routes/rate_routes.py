@@ -5,11 +5,19 @@ Sprint M7: AI Work Assistant
 """
 
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from dataclasses import asdict
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel, Field
 import structlog
 
-from app.api.rate_optimizer import RateOptimizerService
+from app.api.rate_optimizer import (
+    RateStrategy,
+    FreelancerProfile,
+    JobContext,
+    RateRecommendationResult,
+    get_rate_optimizer_service,
+)
+from app.services.rate_cube import get_rate_cube
 
 router = APIRouter(prefix="/ai/rate", tags=["Rate Optimizer"])
 logger = structlog.get_logger()
@@ -53,6 +61,21 @@ class OptimizeRateResponse(BaseModel):
     market_position: dict
 
 
+class OptimizeRateBatchRequest(BaseModel):
+    """Request to optimize rates for many jobs for one freelancer"""
+    freelancer_profile: FreelancerProfile
+    jobs: List[JobContext] = Field(..., min_length=1, max_length=200)
+    strategy: RateStrategy = RateStrategy.BALANCED
+
+
+class OptimizeRateBatchResponse(BaseModel):
+    """Per-job recommendations, in request order"""
+    results: List[RateRecommendationResult]
+    succeeded: int
+    failed: int
+    processing_time_ms: int
+
+
 class AnalyzeRateRequest(BaseModel):
     """Request to analyze a proposed rate"""
     job_id: str
@@ -92,6 +115,28 @@ class MarketRateResponse(BaseModel):
     last_updated: str
 
 
+class RateSliceResponse(BaseModel):
+    """Bid history rollup for one location or experience level"""
+    experience_level: Optional[str] = None
+    location: Optional[str] = None
+    bids: int
+    accepted: int
+    win_rate: float
+    mean_rate: Optional[float] = None
+    percentile_25: Optional[float] = None
+    percentile_50: Optional[float] = None
+    percentile_75: Optional[float] = None
+    percentile_90: Optional[float] = None
+    trend: Optional[float] = None
+
+
+class MarketRateBreakdownResponse(BaseModel):
+    """Market rates of a skill broken down along one dimension"""
+    skill: str
+    by: str
+    slices: List[RateSliceResponse]
+
+
 class RateFeedbackRequest(BaseModel):
     """Request to record rate outcome"""
     job_id: str
@@ -102,6 +147,13 @@ class RateFeedbackRequest(BaseModel):
         description="won, lost, or withdrawn"
     )
     client_feedback: Optional[str] = None
+    final_rate: Optional[float] = Field(
+        default=None,
+        description="Agreed rate when it differs from the proposed rate"
+    )
+    skills: List[str] = Field(default_factory=list)
+    experience_level: str = "mid"
+    location: Optional[str] = None
 
 
 # =============================================================================
@@ -134,11 +186,7 @@ async def optimize_rate(
     )
     
     try:
-        service = RateOptimizerService(
-            rate_model=None,  # Injected
-            market_data=None,  # Injected
-            metrics=None,  # Injected
-        )
+        service = get_rate_optimizer_service()
         
         recommendation = await service.get_optimal_rate(
             job_context={
@@ -191,6 +239,54 @@ async def optimize_rate(
         )
 
 
+@router.post("/optimize/batch", response_model=OptimizeRateBatchResponse)
+async def optimize_rates_batch(
+    request: OptimizeRateBatchRequest,
+) -> OptimizeRateBatchResponse:
+    """
+    Get optimal rate recommendations for a feed of jobs in one call.
+    
+    Market rates are looked up once per distinct skill and all win
+    curves are computed together. A failing job gets an error entry
+    and does not fail the batch.
+    """
+    import time
+    start_time = time.time()
+    
+    logger.info(
+        "Optimizing rates in batch",
+        freelancer_id=request.freelancer_profile.user_id,
+        jobs=len(request.jobs),
+        strategy=request.strategy.value,
+    )
+    
+    try:
+        service = get_rate_optimizer_service()
+        results = await service.get_optimal_rates(
+            jobs=request.jobs,
+            freelancer=request.freelancer_profile,
+            strategy=request.strategy,
+        )
+    except Exception as e:
+        logger.error(
+            "Batch rate optimization failed",
+            freelancer_id=request.freelancer_profile.user_id,
+            error=str(e),
+        )
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to optimize rates: {str(e)}"
+        )
+    
+    failed = sum(1 for result in results if result.error)
+    return OptimizeRateBatchResponse(
+        results=results,
+        succeeded=len(results) - failed,
+        failed=failed,
+        processing_time_ms=int((time.time() - start_time) * 1000),
+    )
+
+
 @router.post("/analyze", response_model=AnalyzeRateResponse)
 async def analyze_rate(
     request: AnalyzeRateRequest,
@@ -211,11 +307,7 @@ async def analyze_rate(
     )
     
     try:
-        service = RateOptimizerService(
-            rate_model=None,
-            market_data=None,
-            metrics=None,
-        )
+        service = get_rate_optimizer_service()
         
         analysis = await service.analyze_proposed_rate(
             job_id=request.job_id,
@@ -267,11 +359,7 @@ async def get_market_rate(
     )
     
     try:
-        service = RateOptimizerService(
-            rate_model=None,
-            market_data=None,
-            metrics=None,
-        )
+        service = get_rate_optimizer_service()
         
         market_data = await service.get_market_rate(
             skill=skill,
@@ -303,6 +391,37 @@ async def get_market_rate(
         )
 
 
+@router.get("/market/{skill}/breakdown", response_model=MarketRateBreakdownResponse)
+async def get_market_rate_breakdown(
+    skill: str,
+    by: str = Query("location", pattern="^(location|experience_level)$"),
+    experience_level: Optional[str] = None,
+    location: Optional[str] = None,
+) -> MarketRateBreakdownResponse:
+    """
+    Get market rates for a skill per location or per experience level.
+    
+    Answered from the in-memory rate cube's precomputed rollups, without
+    touching the database.
+    """
+    cube = get_rate_cube()
+    if by == "location":
+        breakdown = cube.by_location(skill, experience_level)
+    else:
+        breakdown = cube.by_experience(skill, location)
+    
+    return MarketRateBreakdownResponse(
+        skill=skill,
+        by=by,
+        slices=[
+            RateSliceResponse(**{
+                field: value for field, value in asdict(cell).items() if field != "skill"
+            })
+            for cell in breakdown.values()
+        ],
+    )
+
+
 @router.post("/feedback")
 async def record_rate_feedback(
     request: RateFeedbackRequest,
@@ -332,6 +451,16 @@ async def record_rate_feedback(
         request.client_feedback,
     )
     
+    await get_rate_optimizer_service().record_outcome(
+        job_id=request.job_id,
+        proposed_rate=request.proposed_rate,
+        outcome=request.outcome,
+        final_rate=request.final_rate,
+        skills=request.skills,
+        experience_level=request.experience_level,
+        location=request.location,
+    )
+    
     return {
         "status": "recorded",
         "job_id": request.job_id,
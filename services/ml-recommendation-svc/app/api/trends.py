@@ -9,6 +9,8 @@ from fastapi import APIRouter, Request, HTTPException, Query
 from app.schemas import (
     ForecastTrendRequest,
     ForecastTrendResponse,
+    ForecastTrendBatchRequest,
+    ForecastTrendBatchResponse,
 )
 from app.core.config import settings
 
@@ -86,6 +88,68 @@ async def forecast_skill_trend(
         )
 
 
+@router.post(
+    "/trends/forecast/batch",
+    response_model=ForecastTrendBatchResponse,
+)
+async def forecast_skill_trends_batch(
+    request: Request,
+    body: ForecastTrendBatchRequest,
+) -> ForecastTrendBatchResponse:
+    """
+    Forecast demand trends for many skills in one call.
+    
+    All series are fitted and projected together; forecasts are
+    returned in request order.
+    """
+    start_time = time.time()
+    
+    model_service = request.app.state.model_service
+    if not model_service or not model_service.is_initialized:
+        raise HTTPException(
+            status_code=503,
+            detail="ML models not initialized"
+        )
+    
+    try:
+        forecasts = await model_service.forecast_trends(
+            skill_ids=body.skill_ids,
+            periods_ahead=body.periods_ahead,
+        )
+        
+        if not body.include_confidence_intervals:
+            for forecast in forecasts:
+                for f in forecast.forecasts:
+                    f.pop("lower_bound", None)
+                    f.pop("upper_bound", None)
+        
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        logger.info(
+            "Batch trend forecast complete",
+            skills=len(body.skill_ids),
+            periods_ahead=body.periods_ahead,
+            processing_time_ms=processing_time,
+        )
+        
+        return ForecastTrendBatchResponse(
+            forecasts=forecasts,
+            model_version=settings.VERSION,
+            processing_time_ms=processing_time,
+        )
+        
+    except Exception as e:
+        logger.error(
+            "Failed to forecast trends",
+            skills=len(body.skill_ids),
+            error=str(e),
+        )
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to forecast trends: {str(e)}"
+        )
+
+
 @router.post("/trends/analyze")
 async def analyze_market_trends(
     request: Request,
@@ -102,18 +166,19 @@ async def analyze_market_trends(
     if not model_service:
         raise HTTPException(status_code=503, detail="ML models not initialized")
     
-    analyses = []
-    for skill_id in skill_ids[:20]:  # Limit to 20 skills
-        forecast = await model_service.forecast_trend(
-            skill_id=skill_id,
-            periods_ahead=6,
-        )
-        analyses.append({
-            "skill_id": skill_id,
+    forecasts = await model_service.forecast_trends(
+        skill_ids=skill_ids[:20],  # Limit to 20 skills
+        periods_ahead=6,
+    )
+    analyses = [
+        {
+            "skill_id": forecast.skill_id,
             "current_demand": forecast.current_demand_score,
             "trend_direction": forecast.trend_direction.value,
             "6_month_outlook": forecast.forecasts[-1]["predicted_demand"] if forecast.forecasts else None,
-        })
+        }
+        for forecast in forecasts
+    ]
     
     processing_time = int((time.time() - start_time) * 1000)
     
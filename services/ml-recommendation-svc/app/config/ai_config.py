@@ -66,6 +66,7 @@ class ProposalAISettings(BaseModel):
     )
     max_suggestions_per_request: int = 5
     cache_ttl_seconds: int = 3600
+    prediction_model_path: str = "./models/proposal_predictor.pkl"
 
 
 class RateOptimizerSettings(BaseModel):
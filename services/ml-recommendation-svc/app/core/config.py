@@ -2,7 +2,7 @@
 Configuration settings for the ML Recommendation Service.
 """
 
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -33,6 +33,86 @@ class Settings(BaseSettings):
     MODEL_PATH: str = "./models"
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BACKEND: str = "torch"  # torch, onnx or onnx-int8
+    EMBEDDING_ONNX_PATH: str = "./models/embedding_onnx"
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256
+    EMBEDDING_COSINE_TOLERANCE: float = 0.01  # max 1 - cosine vs torch output
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 3.0
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EMBEDDING_CACHE_DTYPE: str = "int8"  # int8 or float16
+    
+    # Content catalog
+    CONTENT_CATALOG_PATH: str = "./models/content_catalog"
+    CATALOG_CANDIDATES: int = 300
+    CATALOG_IVF_PROBES: int = 16
+    CATALOG_RELOAD_INTERVAL_SECONDS: int = 60
+    
+    # Model loading
+    SERVICE_ROLE: str = "all"  # all, recommendations, ai
+    EAGER_MODELS: Optional[List[str]] = None  # overrides the role's startup set
+    MODEL_LOAD_CONCURRENCY: int = 4
+    MODEL_MMAP: bool = True  # memory-map joblib artifacts via uncompressed sidecars
+    
+    # Inference executor
+    INFERENCE_EXECUTOR: str = "thread"  # thread or process
+    INFERENCE_WORKERS: int = 2
+    INFERENCE_TORCH_THREADS: int = 0  # 0 = cpu_count // INFERENCE_WORKERS
+    
+    # Batch recommendations
+    BATCH_INPUT_PATH: str = "./data/batch_inputs"
+    BATCH_OUTPUT_PATH: str = "./data/batch_recommendations"
+    BATCH_WORKERS: int = 2
+    BATCH_SHARD_SIZE: int = 500
+    BATCH_USER_CONCURRENCY: int = 32
+    BATCH_LEASE_SECONDS: float = 60.0  # a job whose lease heartbeat is older may be taken over
+    
+    # Market signal index
+    SIGNAL_INDEX_PERSIST: bool = False  # rolling per-user index in Redis
+    SIGNAL_INDEX_WINDOW_DAYS: int = 180
+    
+    # Market demand table
+    MARKET_DEMAND_PATH: str = "./data/market_demand"
+    MARKET_DEMAND_REFRESH_SECONDS: float = 300.0
+    MARKET_DEMAND_HISTORY_MONTHS: int = 24  # monthly history kept for forecasting
+    
+    # Forecast grid
+    FORECAST_GRID_PATH: str = "./data/forecast_grid"
+    FORECAST_GRID_HORIZON: int = 52
+    FORECAST_GRID_RELOAD_SECONDS: float = 60.0
+    
+    # Feature store (job / freelancer / market lookups)
+    FEATURE_STORE_TTL_SECONDS: float = 60.0  # 0 = request-scoped memo only
+    FEATURE_STORE_MAX_ENTRIES: int = 50000
+    FEATURE_STORE_BATCH_SIZE: int = 100
+    
+    # Market rate lookups (per skill, experience level and location)
+    MARKET_RATE_CACHE_TTL_SECONDS: float = 900.0
+    MARKET_RATE_CACHE_MAX_ENTRIES: int = 10000
+    MARKET_RATE_CONCURRENCY: int = 8
+    
+    # Streaming market rate percentiles (t-digest per skill/level/location)
+    RATE_SKETCH_REDIS: bool = False  # share shards through Redis instead of RATE_SKETCH_PATH
+    RATE_SKETCH_PATH: str = "./data/rate_sketches"
+    RATE_SKETCH_SHARD: str = ""  # defaults to <hostname>-w<gunicorn worker index>
+    RATE_SKETCH_SHARD_TTL_HOURS: float = 24.0  # silent shards are folded into the compacted shard
+    RATE_SKETCH_COMPACT_SECONDS: float = 3600.0
+    RATE_SKETCH_SYNC_SECONDS: float = 30.0
+    RATE_SKETCH_MIN_SAMPLES: int = 20  # fewer observations fall back to market data
+    
+    # Rate cube (bid history rollups by skill x level x location)
+    RATE_CUBE_PATH: str = "./data/rate_cube"
+    RATE_CUBE_REFRESH_SECONDS: float = 60.0
+    RATE_CUBE_LATE_ARRIVAL_HOURS: float = 24.0  # outcomes stored this late behind the watermark are still picked up
+    
+    # Win tables (precomputed win curves per job segment)
+    WIN_TABLE_PATH: str = "./data/win_tables"
+    WIN_TABLE_RELOAD_SECONDS: float = 60.0
+    WIN_TABLE_POINTS: int = 46  # grid points per ratio axis
+    WIN_TABLE_RATIO_MIN: float = 0.25
+    WIN_TABLE_RATIO_MAX: float = 2.5
+    WIN_TABLE_WINDOW_DAYS: int = 90  # job postings the reference jobs are drawn from
+    WIN_TABLE_MIN_JOBS: int = 20  # smaller segments are served by the live model
     
     # Recommendation settings
     DEFAULT_RECOMMENDATIONS_LIMIT: int = 10
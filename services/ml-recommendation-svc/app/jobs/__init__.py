@@ -6,10 +6,20 @@ Sprint M7: AI Work Assistant
 from .proposal_outcome_collector import ProposalOutcomeCollector
 from .model_retraining import ModelRetrainingJob, ModelType
 from .feedback_processor import FeedbackProcessor
+from .content_catalog_builder import ContentCatalogBuilder
+from .market_demand_refresher import MarketDemandRefresher
+from .forecast_grid_builder import ForecastGridBuilder
+from .rate_cube_builder import RateCubeBuilder
+from .win_table_builder import WinTableBuilder
 
 __all__ = [
     "ProposalOutcomeCollector",
     "ModelRetrainingJob",
     "ModelType",
     "FeedbackProcessor",
+    "ContentCatalogBuilder",
+    "MarketDemandRefresher",
+    "ForecastGridBuilder",
+    "RateCubeBuilder",
+    "WinTableBuilder",
 ]
@@ -0,0 +1,121 @@
+"""
+Content Catalog Builder
+Scheduled job that embeds the learning content catalog and rebuilds
+the on-disk ANN index served by ModelService
+"""
+
+from typing import List
+from pydantic import BaseModel
+from datetime import datetime
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.content_catalog import build_catalog
+
+logger = structlog.get_logger()
+
+
+# =============================================================================
+# TYPES
+# =============================================================================
+
+class CatalogBuildResult(BaseModel):
+    """Outcome of a catalog rebuild"""
+    version: str
+    items: int
+    started_at: datetime
+    completed_at: datetime
+
+
+# =============================================================================
+# CONTENT CATALOG BUILDER
+# =============================================================================
+
+class ContentCatalogBuilder:
+    """
+    Rebuilds the content catalog from the learning content table.
+
+    Steps:
+    1. Page through active content records
+    2. Embed title + description in batches
+    3. Write a new catalog version (embeddings, items, IVF index)
+
+    Serving workers hot-reload the new version on their next check.
+    """
+
+    def __init__(self, db, model_service, metrics):
+        self.db = db
+        self.model_service = model_service
+        self.metrics = metrics
+        self.page_size = 1000
+        self.embed_batch_size = 256
+
+    async def run(self) -> CatalogBuildResult:
+        """Rebuild the catalog and publish it as the current version."""
+        started_at = datetime.utcnow()
+        logger.info("Starting content catalog rebuild")
+
+        items = await self._collect_items()
+        embeddings = await self._embed_items(items)
+        version = build_catalog(items, embeddings)
+
+        self.metrics.gauge("content_catalog_items", len(items))
+
+        return CatalogBuildResult(
+            version=version,
+            items=len(items),
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+        )
+
+    async def _collect_items(self) -> List[dict]:
+        """Page through active learning content."""
+        items = []
+        offset = 0
+
+        while True:
+            batch = await self.db.query(
+                "learning_content",
+                {"status": "PUBLISHED"},
+                limit=self.page_size,
+                offset=offset,
+            )
+
+            if not batch:
+                break
+
+            for row in batch:
+                items.append({
+                    "content_id": row["id"],
+                    "content_type": row["content_type"],
+                    "title": row["title"],
+                    "description": row.get("description"),
+                    "provider": row.get("provider"),
+                    "url": row.get("url"),
+                    "skill_ids": row.get("skill_ids", []),
+                    "duration_minutes": row.get("duration_minutes"),
+                    "difficulty": row.get("difficulty"),
+                })
+
+            offset += len(batch)
+
+        return items
+
+    async def _embed_items(self, items: List[dict]) -> np.ndarray:
+        """Embed item text in fixed-size batches."""
+        texts = [
+            f"{item['title']}. {item.get('description') or ''}".strip()
+            for item in items
+        ]
+
+        if not texts:
+            return np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+
+        return np.vstack([
+            np.asarray(
+                await self.model_service.get_embeddings(texts[i:i + self.embed_batch_size]),
+                dtype=np.float32,
+            )
+            for i in range(0, len(texts), self.embed_batch_size)
+        ])
@@ -0,0 +1,85 @@
+"""
+Forecast Grid Builder
+Nightly job that precomputes trend forecasts for every known skill into
+the memory-mapped grid served by the trend endpoints
+"""
+
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+import structlog
+
+from app.core.config import settings
+from app.services.forecast_grid import build_forecast_grid
+from app.services.market_demand import MarketDemandTable
+
+logger = structlog.get_logger()
+
+
+# =============================================================================
+# TYPES
+# =============================================================================
+
+class ForecastGridBuildResult(BaseModel):
+    """Outcome of a forecast grid rebuild"""
+    version: Optional[str] = None
+    skills: int
+    horizon: int
+    started_at: datetime
+    completed_at: datetime
+
+
+# =============================================================================
+# FORECAST GRID BUILDER
+# =============================================================================
+
+class ForecastGridBuilder:
+    """
+    Rebuilds the forecast grid from the latest market demand snapshot.
+
+    Steps:
+    1. Load the snapshot published by MarketDemandRefresher
+    2. Fit and project every skill's history in one vectorized pass
+    3. Write a new grid version (forecasts, summary, skill index)
+
+    Schedule it after the demand refresh; serving workers hot-reload the
+    new version on their next check.
+    """
+
+    def __init__(self, metrics, demand_table: Optional[MarketDemandTable] = None):
+        self.metrics = metrics
+        self.demand_table = demand_table if demand_table is not None else MarketDemandTable()
+
+    async def run(self) -> ForecastGridBuildResult:
+        """Forecast every known skill and publish the grid."""
+        started_at = datetime.utcnow()
+        logger.info("Starting forecast grid rebuild")
+
+        self.demand_table.load()
+        series = self.demand_table.series()
+        if series is None:
+            logger.warning("No market demand snapshot, skipping forecast grid rebuild")
+            return ForecastGridBuildResult(
+                skills=0,
+                horizon=0,
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+            )
+
+        index, history, scores = series
+        version = build_forecast_grid(
+            index,
+            history,
+            scores,
+            source_version=self.demand_table.version,
+        )
+
+        self.metrics.gauge("forecast_grid_skills", len(scores))
+
+        return ForecastGridBuildResult(
+            version=version,
+            skills=len(scores),
+            horizon=settings.FORECAST_GRID_HORIZON,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+        )
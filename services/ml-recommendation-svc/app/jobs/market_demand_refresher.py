@@ -0,0 +1,115 @@
+"""
+Market Demand Refresher
+Scheduled job that aggregates job postings per skill and publishes the
+demand snapshot served by MarketDemandTable
+"""
+
+from typing import Dict, List
+from pydantic import BaseModel
+from datetime import datetime, timedelta
+from collections import defaultdict
+import structlog
+
+from app.core.config import settings
+from app.services.market_demand import write_demand_snapshot
+
+logger = structlog.get_logger()
+
+
+# =============================================================================
+# TYPES
+# =============================================================================
+
+class DemandRefreshResult(BaseModel):
+    """Outcome of a demand snapshot refresh"""
+    skills: int
+    postings_scanned: int
+    started_at: datetime
+    completed_at: datetime
+
+
+# =============================================================================
+# MARKET DEMAND REFRESHER
+# =============================================================================
+
+class MarketDemandRefresher:
+    """
+    Rebuilds the market demand snapshot from recent job postings.
+
+    Steps:
+    1. Page through postings from the last MARKET_DEMAND_HISTORY_MONTHS
+    2. Count postings per skill per 30-day month, and recent applications
+    3. Score the skills and publish a new snapshot with the monthly history
+
+    Serving workers swap in the new snapshot on their next refresh tick.
+    """
+
+    def __init__(self, db, metrics):
+        self.db = db
+        self.metrics = metrics
+        self.page_size = 1000
+        self.window = timedelta(days=30)
+
+    async def run(self) -> DemandRefreshResult:
+        """Aggregate postings and publish the demand snapshot."""
+        started_at = datetime.utcnow()
+        logger.info("Starting market demand refresh")
+
+        rows, scanned = await self._aggregate(started_at)
+        skills = write_demand_snapshot(rows)
+
+        self.metrics.gauge("market_demand_skills", skills)
+
+        return DemandRefreshResult(
+            skills=skills,
+            postings_scanned=scanned,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+        )
+
+    async def _aggregate(self, now: datetime) -> tuple:
+        """Per-skill monthly posting counts, and applications in the last 30 days."""
+        months = max(settings.MARKET_DEMAND_HISTORY_MONTHS, 2)
+        history_start = now - self.window * months
+
+        # Month buckets oldest first; the last one is the current 30 days
+        aggregates: Dict[str, Dict] = defaultdict(lambda: {
+            "skill_name": None,
+            "history": [0] * months,
+            "applications_30d": 0,
+        })
+        offset = 0
+
+        while True:
+            batch = await self.db.query(
+                "job_postings",
+                {"posted_at": {"$gte": history_start}},
+                limit=self.page_size,
+                offset=offset,
+            )
+
+            if not batch:
+                break
+
+            for posting in batch:
+                age = (now - posting["posted_at"]) // self.window
+                bucket = months - 1 - min(max(age, 0), months - 1)
+                for skill in posting.get("skills", []):
+                    entry = aggregates[skill["id"]]
+                    entry["skill_name"] = entry["skill_name"] or skill.get("name") or skill["id"]
+                    entry["history"][bucket] += 1
+                    if bucket == months - 1:
+                        entry["applications_30d"] += posting.get("application_count", 0)
+
+            offset += len(batch)
+
+        rows: List[Dict] = [
+            {
+                "skill_id": skill_id,
+                "postings_30d": entry["history"][-1],
+                "postings_prev_30d": entry["history"][-2],
+                **entry,
+            }
+            for skill_id, entry in aggregates.items()
+        ]
+        return rows, offset
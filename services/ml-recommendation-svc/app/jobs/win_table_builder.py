@@ -0,0 +1,150 @@
+"""
+Win Table Builder
+Nightly job that precomputes win curves per job segment into the tables
+the rate model serves from
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+import asyncio
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.models.rate_model import RateSuccessModel, get_rate_model
+from app.services.win_tables import job_segment, ratio_axis, write_win_tables
+
+logger = structlog.get_logger()
+
+
+# =============================================================================
+# TYPES
+# =============================================================================
+
+class WinTableBuildResult(BaseModel):
+    """Outcome of a win table rebuild"""
+    version: Optional[str] = None
+    segments: int
+    postings_scanned: int
+    model_version: str
+    started_at: datetime
+    completed_at: datetime
+
+
+# =============================================================================
+# WIN TABLE BUILDER
+# =============================================================================
+
+class WinTableBuilder:
+    """
+    Rebuilds the per-segment win tables from recent job postings.
+
+    Steps:
+    1. Group postings from the last WIN_TABLE_WINDOW_DAYS by segment
+       (primary skill, complexity, competition level)
+    2. Take each segment's typical job: median budget and duration
+    3. Evaluate the rate model over the ratio grid for every segment with
+       at least WIN_TABLE_MIN_JOBS postings, and publish the tables
+
+    Rebuild after retraining the rate model: tables built with another
+    model version are not served. Without a trained model there is
+    nothing to build.
+    """
+
+    def __init__(self, db, metrics, model: Optional[RateSuccessModel] = None):
+        self.db = db
+        self.metrics = metrics
+        self.model = model or get_rate_model()
+        self.page_size = 1000
+
+    async def run(self) -> WinTableBuildResult:
+        """Build and publish the win tables."""
+        started_at = datetime.utcnow()
+        logger.info("Starting win table rebuild")
+
+        if self.model.model is None:
+            # The heuristic is closed-form; it is cheaper to evaluate than to look up
+            logger.warning("No trained rate model loaded, skipping win table rebuild")
+            return WinTableBuildResult(
+                segments=0,
+                postings_scanned=0,
+                model_version=self.model.version,
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+            )
+
+        segments, scanned = await self._collect_segments(started_at)
+        keys = [
+            key for key, jobs in segments.items()
+            if len(jobs["budget_min"]) >= settings.WIN_TABLE_MIN_JOBS
+        ]
+
+        version = None
+        if keys:
+            axis = ratio_axis()
+            tables = await asyncio.to_thread(
+                self.model.build_win_tables,
+                [self._reference_job(key, segments[key]) for key in keys],
+                axis,
+                axis,
+            )
+            version = write_win_tables(keys, tables, axis, axis, self.model.version)
+        else:
+            logger.warning("No segment has enough postings, skipping win table rebuild")
+
+        self.metrics.gauge("win_table_segments", len(keys))
+
+        return WinTableBuildResult(
+            version=version,
+            segments=len(keys),
+            postings_scanned=scanned,
+            model_version=self.model.version,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+        )
+
+    async def _collect_segments(self, now: datetime) -> tuple:
+        """Budget and duration of every recent posting, grouped by segment."""
+        since = now - timedelta(days=settings.WIN_TABLE_WINDOW_DAYS)
+        segments: Dict[str, Dict[str, List]] = defaultdict(lambda: {
+            "budget_min": [],
+            "budget_max": [],
+            "duration_days": [],
+        })
+        scanned = 0
+        offset = 0
+
+        while True:
+            batch = await self.db.query(
+                "job_postings",
+                {"posted_at": {"$gte": since}},
+                limit=self.page_size,
+                offset=offset,
+            )
+
+            if not batch:
+                break
+
+            for posting in batch:
+                jobs = segments[job_segment(posting)]
+                for field, values in jobs.items():
+                    value = posting.get(field)
+                    values.append(np.nan if value is None else value)
+
+            scanned += len(batch)
+            offset += len(batch)
+
+        return segments, scanned
+
+    @staticmethod
+    def _reference_job(key: str, jobs: Dict[str, List]) -> dict:
+        """Typical job of a segment; missing fields stay missing."""
+        _, complexity, competition = key.rsplit("|", 2)
+        reference = {"complexity": complexity, "competition_level": competition}
+        for field, values in jobs.items():
+            values = np.asarray(values, dtype=np.float64)
+            known = values[~np.isnan(values)]
+            reference[field] = float(np.median(known)) if len(known) else None
+        return reference
@@ -27,7 +27,12 @@ from app.api.routes.market_routes import router as market_router
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.middleware.service_auth import ServiceAuthMiddleware
+from app.middleware.feature_scope import FeatureScopeMiddleware
 from app.services.model_service import ModelService
+from app.services.batch_recommendations import get_batch_runner
+from app.services.market_demand import get_market_demand_table
+from app.services.rate_sketches import get_rate_sketch_store
+from app.services.rate_cube import get_rate_cube
 
 # Setup logging
 setup_logging()
@@ -46,10 +51,22 @@ async def lifespan(app: FastAPI):
 
     logger.info("ML models loaded successfully")
 
+    # Keep the shared market demand table in step with new snapshots
+    get_market_demand_table().start()
+
+    # Load every shard's rate sketches and keep publishing this worker's;
+    # the rate cube follows the snapshots published by RateCubeBuilder
+    await get_rate_sketch_store().start()
+    get_rate_cube().start()
+
     yield
 
     # Cleanup
     logger.info("Shutting down ML Recommendation Service")
+    await get_market_demand_table().stop()
+    await get_rate_sketch_store().stop()
+    await get_rate_cube().stop()
+    await get_batch_runner().shutdown()
     await model_service.cleanup()
 
 
@@ -65,6 +82,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Request-scoped feature lookups for the rate, proposal and career models
+    app.add_middleware(FeatureScopeMiddleware)
+
     # Service-to-service auth middleware (must be added before CORS)
     app.add_middleware(ServiceAuthMiddleware)
 
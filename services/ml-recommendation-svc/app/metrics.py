@@ -0,0 +1,31 @@
+"""
+Metrics - Counters and gauges reported by services and jobs.
+
+No metrics backend is wired into this service yet. ``NullMetrics``
+accepts the calls services and jobs make and drops them, so a real
+client (StatsD, Prometheus) can be dropped in behind ``get_metrics``
+without touching the callers.
+"""
+
+from typing import Dict, Optional
+
+
+class NullMetrics:
+    """Metrics client that records nothing."""
+
+    def increment(self, name: str, value: float = 1, tags: Optional[Dict[str, str]] = None) -> None:
+        pass
+
+    def gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        pass
+
+
+_metrics: Optional[NullMetrics] = None
+
+
+def get_metrics() -> NullMetrics:
+    """Get the process-wide metrics client."""
+    global _metrics
+    if _metrics is None:
+        _metrics = NullMetrics()
+    return _metrics
@@ -0,0 +1,24 @@
+"""
+Feature Scope Middleware
+Gives every HTTP request its own feature-store memo, so models handling
+the same request share job, freelancer and market lookups.
+"""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.feature_store import request_scope
+
+
+class FeatureScopeMiddleware:
+    """Pure ASGI middleware: the memo context covers the whole request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with request_scope():
+            await self.app(scope, receive, send)
@@ -0,0 +1,144 @@
+"""
+Model Features
+Compact internal feature representations for the win models
+Sprint M7: AI Work Assistant
+
+``RateFeatures`` / ``ProposalFeatures`` (pydantic) remain the validated
+form at the API and training-data boundary. Inside the service, feature
+extraction builds a ``__slots__`` record with no validation, and batches
+are a ``FeatureBatch``: one float64 NumPy column per feature, which the
+heuristics and the trained model consume a whole column at a time.
+"""
+
+from typing import Dict, Iterable, Sequence
+import numpy as np
+
+# Ordinal codes for low / medium / high features
+LEVEL_CODES = {"low": 0.0, "medium": 1.0, "high": 2.0}
+
+RATE_FEATURE_COLUMNS = (
+    "experience_years",
+    "skill_match_score",
+    "rating",
+    "completion_rate",
+    "historical_win_rate",
+    "average_rate",
+    "budget_min",
+    "budget_max",
+    "job_complexity",
+    "duration_days",
+    "competition_level",
+    "proposed_rate",
+    "rate_vs_budget",
+    "rate_vs_market",
+    "rate_vs_average",
+    "days_since_posted",
+    "month",
+    "day_of_week",
+)
+
+PROPOSAL_FEATURE_COLUMNS = (
+    "proposal_length",
+    "word_count",
+    "sentence_count",
+    "avg_sentence_length",
+    "keyword_match_score",
+    "personalization_score",
+    "question_count",
+    "has_call_to_action",
+    "skill_match_score",
+    "portfolio_relevance_score",
+    "experience_years_match",
+    "rate_vs_budget",
+    "rate_vs_market",
+    "response_time_hours",
+    "freelancer_win_rate",
+    "freelancer_completion_rate",
+    "freelancer_rating",
+)
+
+
+def _encode(value) -> float:
+    """Numeric value of a feature: levels as ordinal codes, None as NaN"""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        return LEVEL_CODES.get(value, np.nan)
+    return float(value)
+
+
+# =============================================================================
+# RECORDS
+# =============================================================================
+
+class FeatureRecord:
+    """Unvalidated feature values for one prediction"""
+    __slots__ = ()
+    columns: tuple = ()
+
+    def __init__(self, **values):
+        for column in self.columns:
+            setattr(self, column, values[column])
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{c}={getattr(self, c)!r}" for c in self.columns)
+        return f"{type(self).__name__}({values})"
+
+
+class RateFeatureRecord(FeatureRecord):
+    __slots__ = RATE_FEATURE_COLUMNS
+    columns = RATE_FEATURE_COLUMNS
+
+
+class ProposalFeatureRecord(FeatureRecord):
+    __slots__ = PROPOSAL_FEATURE_COLUMNS
+    columns = PROPOSAL_FEATURE_COLUMNS
+
+
+# =============================================================================
+# BATCH
+# =============================================================================
+
+class FeatureBatch:
+    """
+    Struct-of-arrays features for many predictions
+
+    Columns are read as attributes (``batch.rating``), like on a record.
+    """
+    __slots__ = ("columns", "_data")
+
+    def __init__(self, columns: Sequence[str], data: Dict[str, np.ndarray]):
+        self.columns = tuple(columns)
+        self._data = data
+
+    @classmethod
+    def from_records(cls, records: Iterable, columns: Sequence[str]) -> "FeatureBatch":
+        """Encode records (slots records or pydantic models) column by column"""
+        records = list(records)
+        return cls(columns, {
+            column: np.fromiter(
+                (_encode(getattr(r, column)) for r in records),
+                dtype=np.float64,
+                count=len(records),
+            )
+            for column in columns
+        })
+
+    def __len__(self) -> int:
+        return len(self._data[self.columns[0]]) if self.columns else 0
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def take(self, rows) -> "FeatureBatch":
+        return FeatureBatch(self.columns, {c: v[rows] for c, v in self._data.items()})
+
+    def matrix(self) -> np.ndarray:
+        """Dense (items, columns) float32 matrix in column order"""
+        matrix = np.empty((len(self), len(self.columns)), dtype=np.float32)
+        for j, column in enumerate(self.columns):
+            matrix[:, j] = self._data[column]
+        return matrix
@@ -7,9 +7,20 @@ Sprint M7: AI Work Assistant
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import logging
 import numpy as np
 
+from app.config.ai_config import get_ai_settings
+from app.models.features import (
+    PROPOSAL_FEATURE_COLUMNS,
+    FeatureBatch,
+    ProposalFeatureRecord,
+)
+from app.models.win_probability import WinProbabilityModel, classification_metrics
+from app.services.feature_store import FeatureStore, get_feature_store
+from app.services.text_analysis import TextDocument, analyze_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,21 +93,31 @@ class ProposalSuccessModel:
     - Continuous learning from outcomes
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        feature_store: Optional[FeatureStore] = None
+    ):
         self.model_path = model_path
         self.model = None
         self.feature_extractor = None
         self.version = "1.0.0"
+        self.features = feature_store or get_feature_store()
         self._load_model()
     
     def _load_model(self):
-        """Load trained model from storage"""
+        """Load trained model from storage; the heuristic is used when there is none"""
         if self.model_path:
-            logger.info(f"Loading model from {self.model_path}")
-            # In production: Load model weights
+            try:
+                self.model = WinProbabilityModel.load(self.model_path, PROPOSAL_FEATURE_COLUMNS)
+            except Exception as e:
+                logger.error(f"Failed to load model from {self.model_path}: {e}")
+        
+        if self.model is not None:
+            self.version = self.model.version
+            logger.info(f"Loaded model from {self.model_path}")
         else:
             logger.info("Using default model")
-            # Use baseline model
     
     # -------------------------------------------------------------------------
     # PREDICTION
@@ -117,7 +138,7 @@ class ProposalSuccessModel:
         features = await self._extract_features(proposal_text, job_id, user_id)
         
         # Run prediction
-        prediction = self._predict(features)
+        prediction = self._predict_one(features)
         
         logger.info(f"Win probability: {prediction:.3f}")
         return prediction
@@ -134,7 +155,7 @@ class ProposalSuccessModel:
         Returns prediction with key factors and suggestions
         """
         features = await self._extract_features(proposal_text, job_id, user_id)
-        probability = self._predict(features)
+        probability = self._predict_one(features)
         confidence = self._calculate_confidence(features)
         
         # Identify key factors
@@ -150,9 +171,22 @@ class ProposalSuccessModel:
             improvement_suggestions=suggestions
         )
     
-    def _predict(self, features: ProposalFeatures) -> float:
-        """Run model prediction"""
-        # Baseline heuristic model (replace with trained ML model)
+    def _predict_one(self, features: ProposalFeatureRecord) -> float:
+        """Run model prediction for a single proposal"""
+        return float(self._predict(FeatureBatch.from_records([features], PROPOSAL_FEATURE_COLUMNS))[0])
+    
+    def _predict(self, features: FeatureBatch) -> np.ndarray:
+        """Win probabilities for a batch of proposals in one model call"""
+        if self.model is not None and len(features):
+            try:
+                return self.model.predict(features.matrix())
+            except Exception as e:
+                logger.error(f"Model prediction failed, using heuristic: {e}")
+        
+        return self._heuristic(features)
+    
+    def _heuristic(self, features: FeatureBatch) -> np.ndarray:
+        """Baseline heuristic model, used when no trained model is loaded"""
         score = 0.5  # Start at 50%
         
         # Keyword matching (important factor)
@@ -163,37 +197,36 @@ class ProposalSuccessModel:
         
         # Length optimization (too short or too long is bad)
         optimal_length = 300
-        length_score = 1 - abs(features.word_count - optimal_length) / optimal_length
+        length_score = 1 - np.abs(features.word_count - optimal_length) / optimal_length
         score += length_score * 0.1
         
         # Questions show engagement
-        if 1 <= features.question_count <= 3:
-            score += 0.05
+        questions = features.question_count
+        score += np.where((questions >= 1) & (questions <= 3), 0.05, 0)
         
         # Has CTA
-        if features.has_call_to_action:
-            score += 0.05
+        score += np.where(features.has_call_to_action > 0, 0.05, 0)
         
         # Response time (faster is better, but not too fast)
-        if 1 <= features.response_time_hours <= 4:
-            score += 0.1
-        elif features.response_time_hours <= 24:
-            score += 0.05
+        response = features.response_time_hours
+        score += np.select([(response >= 1) & (response <= 4), response <= 24], [0.1, 0.05], 0)
         
         # Freelancer history
         score += (features.freelancer_win_rate - 0.3) * 0.15
         score += (features.freelancer_rating - 4.0) * 0.05
         
         # Rate positioning (slight discount wins more)
-        if 0.85 <= features.rate_vs_budget <= 1.0:
-            score += 0.05
-        elif features.rate_vs_budget > 1.2:
-            score -= 0.1
+        rate_vs_budget = features.rate_vs_budget
+        score += np.select(
+            [(rate_vs_budget >= 0.85) & (rate_vs_budget <= 1.0), rate_vs_budget > 1.2],
+            [0.05, -0.1],
+            0
+        )
         
         # Clamp to valid range
-        return max(0.1, min(0.9, score))
+        return np.clip(score, 0.1, 0.9)
     
-    def _calculate_confidence(self, features: ProposalFeatures) -> float:
+    def _calculate_confidence(self, features: ProposalFeatureRecord) -> float:
         """Calculate prediction confidence"""
         # Higher confidence when we have more data
         confidence = 0.5
@@ -214,7 +247,7 @@ class ProposalSuccessModel:
     
     def _identify_key_factors(
         self,
-        features: ProposalFeatures,
+        features: ProposalFeatureRecord,
         probability: float
     ) -> list[dict]:
         """Identify factors most influencing prediction"""
@@ -275,7 +308,7 @@ class ProposalSuccessModel:
     
     def _generate_suggestions(
         self,
-        features: ProposalFeatures,
+        features: ProposalFeatureRecord,
         probability: float
     ) -> list[str]:
         """Generate improvement suggestions"""
@@ -327,34 +360,32 @@ class ProposalSuccessModel:
         proposal_text: str,
         job_id: str,
         user_id: Optional[str]
-    ) -> ProposalFeatures:
-        """Extract features from proposal for prediction"""
+    ) -> ProposalFeatureRecord:
+        """Extract features from proposal for prediction (unvalidated record)"""
         # Text analysis
-        words = proposal_text.split()
-        sentences = proposal_text.split('.')
+        proposal = analyze_text(proposal_text)
         
         # Get job details for comparison
         job_details = await self._get_job_details(job_id)
-        job_keywords = self._extract_keywords(job_details.get('description', ''))
-        proposal_keywords = self._extract_keywords(proposal_text)
+        job_description = analyze_text(job_details.get('description', ''))
         
         # Keyword matching
         keyword_match = len(
-            set(job_keywords) & set(proposal_keywords)
-        ) / max(len(job_keywords), 1)
+            job_description.keyword_set & proposal.keyword_set
+        ) / max(job_description.keyword_count, 1)
         
         # Get freelancer history
         freelancer = await self._get_freelancer_stats(user_id) if user_id else {}
         
-        return ProposalFeatures(
+        return ProposalFeatureRecord(
             proposal_length=len(proposal_text),
-            word_count=len(words),
-            sentence_count=len(sentences),
-            avg_sentence_length=len(words) / max(len(sentences), 1),
+            word_count=proposal.word_count,
+            sentence_count=proposal.sentence_count,
+            avg_sentence_length=proposal.word_count / max(proposal.sentence_count, 1),
             keyword_match_score=keyword_match,
-            personalization_score=self._calculate_personalization(proposal_text, job_details),
-            question_count=proposal_text.count('?'),
-            has_call_to_action=self._has_cta(proposal_text),
+            personalization_score=self._calculate_personalization(proposal, job_details),
+            question_count=proposal.question_count,
+            has_call_to_action=self._has_cta(proposal),
             skill_match_score=0.7,  # Calculate from job/user skills
             portfolio_relevance_score=0.6,
             experience_years_match=0.8,
@@ -366,58 +397,42 @@ class ProposalSuccessModel:
             freelancer_rating=freelancer.get('rating', 4.5)
         )
     
-    def _extract_keywords(self, text: str) -> list[str]:
-        """Extract important keywords from text"""
-        # Simple keyword extraction (replace with NLP in production)
-        import re
-        words = re.findall(r'\b\w+\b', text.lower())
-        # Filter common words
-        stopwords = {'the', 'a', 'an', 'is', 'are', 'we', 'you', 'for', 'to', 'of', 'and', 'or', 'in', 'on', 'with'}
-        return [w for w in words if w not in stopwords and len(w) > 3]
-    
-    def _calculate_personalization(self, proposal: str, job: dict) -> float:
+    def _calculate_personalization(self, proposal: TextDocument, job: dict) -> float:
         """Calculate how personalized the proposal is"""
         score = 0.5
         
         # Check for job title mention
-        if job.get('title', '').lower() in proposal.lower():
+        if job.get('title', '').lower() in proposal.lower:
             score += 0.1
         
         # Check for company name mention
-        if job.get('company', '').lower() in proposal.lower():
+        if job.get('company', '').lower() in proposal.lower:
             score += 0.15
         
         # Check for specific requirement mentions
         requirements = job.get('requirements', [])
-        mentioned = sum(1 for r in requirements if r.lower() in proposal.lower())
+        mentioned = sum(1 for r in requirements if r.lower() in proposal.lower)
         if requirements:
             score += (mentioned / len(requirements)) * 0.25
         
         return min(score, 1.0)
     
-    def _has_cta(self, proposal: str) -> bool:
+    def _has_cta(self, proposal: TextDocument) -> bool:
         """Check if proposal has a call-to-action"""
         cta_phrases = [
             'let\'s discuss', 'schedule a call', 'happy to chat',
             'looking forward', 'let me know', 'available to start',
             'reach out', 'get in touch', 'would love to'
         ]
-        proposal_lower = proposal.lower()
-        return any(phrase in proposal_lower for phrase in cta_phrases)
+        return any(phrase in proposal.lower for phrase in cta_phrases)
     
     async def _get_job_details(self, job_id: str) -> dict:
         """Get job details for feature extraction"""
-        # In production: Query job database
-        return {}
+        return await self.features.job(job_id)
     
     async def _get_freelancer_stats(self, user_id: str) -> dict:
         """Get freelancer statistics for features"""
-        # In production: Query user database
-        return {
-            'win_rate': 0.35,
-            'completion_rate': 0.95,
-            'rating': 4.7
-        }
+        return await self.features.freelancer(user_id)
     
     # -------------------------------------------------------------------------
     # TRAINING
@@ -429,39 +444,37 @@ class ProposalSuccessModel:
         # In production: Store to training dataset
     
     async def retrain(self, training_data: list[TrainingDataPoint]) -> dict:
-        """Retrain model with new data"""
+        """Retrain the gradient-boosted model and swap it in"""
         logger.info(f"Retraining with {len(training_data)} samples")
         
-        # In production:
-        # 1. Prepare feature matrix
-        # 2. Split train/validation
-        # 3. Train model (XGBoost, neural net, etc.)
-        # 4. Evaluate on validation set
-        # 5. Return metrics
+        matrix = FeatureBatch.from_records(
+            [d.features for d in training_data], PROPOSAL_FEATURE_COLUMNS
+        ).matrix()
+        labels = np.array([d.outcome == 'won' for d in training_data])
+        model, metrics = await asyncio.to_thread(
+            WinProbabilityModel.train,
+            matrix,
+            labels,
+            PROPOSAL_FEATURE_COLUMNS,
+            self.model_path or get_ai_settings().PROPOSAL_AI.prediction_model_path
+        )
         
+        self.model = model
+        self.version = model.version
         return {
+            **metrics,
             "samples": len(training_data),
-            "accuracy": 0.72,
-            "auc": 0.78,
-            "model_version": "1.0.1"
+            "model_version": model.version
         }
     
     async def evaluate(self, test_data: list[TrainingDataPoint]) -> dict:
         """Evaluate model on test data"""
-        correct = 0
-        total = len(test_data)
-        
-        for data in test_data:
-            prediction = self._predict(data.features)
-            predicted_win = prediction > 0.5
-            actual_win = data.outcome == 'won'
-            if predicted_win == actual_win:
-                correct += 1
-        
-        return {
-            "accuracy": correct / total if total > 0 else 0,
-            "samples": total
-        }
+        probabilities = self._predict(
+            FeatureBatch.from_records([d.features for d in test_data], PROPOSAL_FEATURE_COLUMNS)
+        )
+        return classification_metrics(
+            probabilities, np.array([d.outcome == 'won' for d in test_data])
+        )
 
 
 # =============================================================================
@@ -474,5 +487,7 @@ def get_proposal_model() -> ProposalSuccessModel:
     """Get ProposalSuccessModel singleton"""
     global _model
     if _model is None:
-        _model = ProposalSuccessModel()
+        _model = ProposalSuccessModel(
+            model_path=get_ai_settings().PROPOSAL_AI.prediction_model_path
+        )
     return _model
@@ -7,10 +7,47 @@ Sprint M7: AI Work Assistant
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
+import asyncio
 import logging
+import numpy as np
+
+from app.config.ai_config import get_ai_settings
+from app.models.features import (
+    LEVEL_CODES,
+    RATE_FEATURE_COLUMNS,
+    FeatureBatch,
+    RateFeatureRecord,
+)
+from app.models.win_probability import (
+    PREDICT_BATCH_ROWS,
+    WinProbabilityModel,
+    classification_metrics,
+)
+from app.services.feature_store import FeatureStore, get_feature_store
+from app.services.win_tables import WinTables, get_win_tables, job_segment
 
 logger = logging.getLogger(__name__)
 
+# Dense rate grid searched by the optimal-rate solver
+OPTIMAL_RATE_MIN = 20.0
+OPTIMAL_RATE_MAX = 200.0
+OPTIMAL_RATE_STEP = 0.25
+
+# Rate-dependent columns of the win model's feature matrix
+_PROPOSED_RATE = RATE_FEATURE_COLUMNS.index("proposed_rate")
+_RATE_VS_BUDGET = RATE_FEATURE_COLUMNS.index("rate_vs_budget")
+_RATE_VS_MARKET = RATE_FEATURE_COLUMNS.index("rate_vs_market")
+_RATE_VS_AVERAGE = RATE_FEATURE_COLUMNS.index("rate_vs_average")
+
+# Freelancer the win tables are built for (the feature extraction defaults)
+REFERENCE_FREELANCER = {
+    "experience_years": 3,
+    "skill_match_score": 0.7,
+    "rating": 4.5,
+    "completion_rate": 0.95,
+    "historical_win_rate": 0.3,
+}
+
 
 # =============================================================================
 # TYPES
@@ -47,6 +84,24 @@ class RateFeatures(BaseModel):
     day_of_week: int
 
 
+class RateFrontierPoint(BaseModel):
+    """A rate no other rate beats on both price and win probability"""
+    rate: float
+    win_probability: float
+    expected_value: float
+
+
+class OptimalRate(BaseModel):
+    """Solver result for one (job, freelancer) pair"""
+    job_id: str
+    user_id: str
+    rate: float
+    win_probability: float
+    expected_value: float  # rate * win_probability
+    meets_floor: bool  # False: no rate reaches the floor, best win chance returned
+    frontier: list[RateFrontierPoint]
+
+
 class TrainingData(BaseModel):
     """Training data point"""
     job_id: str
@@ -73,16 +128,31 @@ class RateSuccessModel:
     - Market conditions
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        feature_store: Optional[FeatureStore] = None,
+        win_tables: Optional[WinTables] = None
+    ):
         self.model_path = model_path
         self.model = None
         self.version = "1.0.0"
+        self.features = feature_store or get_feature_store()
+        # Precomputed win curves per job segment, built for this model version
+        self.win_tables = win_tables or get_win_tables()
         self._load_model()
     
     def _load_model(self):
-        """Load trained model"""
+        """Load trained model; the heuristic is used when there is none"""
         if self.model_path:
-            logger.info(f"Loading model from {self.model_path}")
+            try:
+                self.model = WinProbabilityModel.load(self.model_path, RATE_FEATURE_COLUMNS)
+            except Exception as e:
+                logger.error(f"Failed to load model from {self.model_path}: {e}")
+        
+        if self.model is not None:
+            self.version = self.model.version
+            logger.info(f"Loaded model from {self.model_path}")
         else:
             logger.info("Using baseline heuristic model")
     
@@ -101,13 +171,68 @@ class RateSuccessModel:
         
         Returns: 0-1 probability
         """
-        # Get features
-        features = await self._extract_features(rate, job_id, user_id)
+        curve = await self.predict_win_curve(np.array([rate]), job_id, user_id)
+        return float(curve[0])
+    
+    async def predict_win_curve(
+        self,
+        rates: np.ndarray,
+        job_id: str,
+        user_id: str
+    ) -> np.ndarray:
+        """
+        Predict win probability at every rate in ``rates``
         
-        # Run prediction
-        probability = self._predict(features)
+        Job and freelancer features are extracted once; the curve is read
+        from the job segment's win table, or evaluated over the rate grid
+        as one vectorized expression when the segment has no table.
         
-        return probability
+        Returns: array of 0-1 probabilities, same shape as ``rates``
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        features, job = await asyncio.gather(
+            self._extract_features(float(rates.flat[0]) if rates.size else 0.0, job_id, user_id),
+            self._get_job(job_id)
+        )
+        return self._predict_tabled(
+            [features], [job_segment(job)], rates.reshape(1, -1)
+        ).reshape(rates.shape)
+    
+    async def predict_win_curves(
+        self,
+        rates: np.ndarray,
+        job_ids: list[str],
+        user_id: str
+    ) -> tuple[np.ndarray, dict[int, Exception]]:
+        """
+        Predict win curves for one freelancer across many jobs
+        
+        ``rates`` holds one rate grid per job, shaped (jobs, points). Curves
+        come from the win tables where the job's segment has one; the rest
+        are evaluated in one vectorized pass. Jobs whose features could not
+        be extracted get a NaN row and an entry, by row index, in the
+        returned errors.
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        extracted = await asyncio.gather(
+            *(
+                self._extract_features(float(rates[i, 0]), job_id, user_id)
+                for i, job_id in enumerate(job_ids)
+            ),
+            return_exceptions=True
+        )
+        
+        errors = {i: e for i, e in enumerate(extracted) if isinstance(e, Exception)}
+        rows = [i for i in range(len(job_ids)) if i not in errors]
+        
+        probabilities = np.full(rates.shape, np.nan)
+        if rows:
+            # Memoized: _extract_features already loaded these jobs
+            jobs = await asyncio.gather(*(self._get_job(job_ids[i]) for i in rows))
+            probabilities[rows] = self._predict_tabled(
+                [extracted[i] for i in rows], [job_segment(job) for job in jobs], rates[rows]
+            )
+        return probabilities, errors
     
     async def predict_optimal_rate(
         self,
@@ -116,51 +241,239 @@ class RateSuccessModel:
         target_win_prob: float = 0.5
     ) -> float:
         """
-        Find rate that achieves target win probability
+        Find the rate with the best expected value that still achieves
+        the target win probability
+        """
+        solutions = await self.solve_optimal_rates(
+            [(job_id, user_id)], min_win_prob=target_win_prob
+        )
+        return solutions[0].rate
+    
+    async def solve_optimal_rates(
+        self,
+        pairs: list[tuple[str, str]],
+        min_win_prob: float = 0.0,
+        rates: Optional[np.ndarray] = None
+    ) -> list[OptimalRate]:
+        """
+        Solve optimal rates for many (job_id, user_id) pairs at once
         
-        Uses binary search to find optimal rate
+        Every pair's win probability is evaluated over the same dense rate
+        grid as one (pairs, rates) matrix. The chosen rate maximizes
+        expected value (rate x P(win)) among rates with P(win) of at least
+        ``min_win_prob``; no monotonicity of the win function is assumed.
+        Each result also carries the rate / win-probability Pareto frontier.
         """
-        # Get base features
-        base_features = await self._extract_features(50.0, job_id, user_id)
-        
-        # Binary search for rate
-        low, high = 20.0, 200.0
-        
-        for _ in range(20):  # Max iterations
-            mid = (low + high) / 2
-            base_features.proposed_rate = mid
-            prob = self._predict(base_features)
-            
-            if abs(prob - target_win_prob) < 0.05:
-                return mid
-            elif prob > target_win_prob:
-                low = mid
-            else:
-                high = mid
-        
-        return mid
-    
-    def _predict(self, features: RateFeatures) -> float:
-        """Run model prediction"""
-        # Baseline heuristic model
-        # In production: Use trained XGBoost/neural net
+        if rates is None:
+            rates = np.arange(OPTIMAL_RATE_MIN, OPTIMAL_RATE_MAX + OPTIMAL_RATE_STEP, OPTIMAL_RATE_STEP)
+        rates = np.asarray(rates, dtype=np.float64)
         
-        base_prob = 0.5
+        features = await asyncio.gather(*(
+            self._extract_features(float(rates[0]), job_id, user_id)
+            for job_id, user_id in pairs
+        ))
+        probabilities = self._predict_grid(features, rates)
+        expected_values = rates * probabilities
         
-        # Rate vs budget effect (biggest factor)
-        if features.rate_vs_budget <= 0:
-            rate_effect = 0
-        elif features.rate_vs_budget < 0.8:
-            rate_effect = 0.2  # Below budget = higher chance
-        elif features.rate_vs_budget <= 1.0:
-            rate_effect = 0.1  # At budget
-        elif features.rate_vs_budget <= 1.2:
-            rate_effect = -0.1  # Slightly above
-        else:
-            rate_effect = -0.25  # Way above budget
+        # Best expected value among rates meeting the floor; pairs where no
+        # rate does fall back to their highest win probability
+        feasible = probabilities >= min_win_prob
+        best = np.where(feasible, expected_values, -np.inf).argmax(axis=1)
+        meets_floor = feasible.any(axis=1)
+        choice = np.where(meets_floor, best, probabilities.argmax(axis=1))
+        
+        # On the frontier when every higher rate has a strictly lower P(win)
+        higher_max = np.maximum.accumulate(probabilities[:, ::-1], axis=1)[:, ::-1]
+        higher_max = np.concatenate(
+            [higher_max[:, 1:], np.full((len(pairs), 1), -np.inf)], axis=1
+        )
+        on_frontier = probabilities > higher_max
+        
+        solutions = []
+        for i, (job_id, user_id) in enumerate(pairs):
+            points = np.flatnonzero(on_frontier[i])
+            solutions.append(OptimalRate(
+                job_id=job_id,
+                user_id=user_id,
+                rate=float(rates[choice[i]]),
+                win_probability=float(probabilities[i, choice[i]]),
+                expected_value=round(float(expected_values[i, choice[i]]), 2),
+                meets_floor=bool(meets_floor[i]),
+                frontier=[
+                    RateFrontierPoint(
+                        rate=rate,
+                        win_probability=win_probability,
+                        expected_value=round(expected_value, 2)
+                    )
+                    for rate, win_probability, expected_value in zip(
+                        rates[points].tolist(),
+                        probabilities[i, points].tolist(),
+                        expected_values[i, points].tolist()
+                    )
+                ]
+            ))
+        
+        return solutions
+    
+    def _predict(self, features: FeatureBatch) -> np.ndarray:
+        """Win probability of each row, as its features stand"""
+        if self.model is not None and len(features):
+            try:
+                return self.model.predict(features.matrix())
+            except Exception as e:
+                logger.error(f"Model prediction failed, using heuristic: {e}")
+        
+        return self._predict_rate_effects(features, features.rate_vs_budget[:, None])[:, 0]
+    
+    def _predict_grid(self, features, rates: np.ndarray) -> np.ndarray:
+        """
+        Win probabilities for each feature set (rows) at each rate (columns)
+        
+        ``features`` is a FeatureBatch, or feature records to batch up.
+        """
+        if not isinstance(features, FeatureBatch):
+            features = FeatureBatch.from_records(features, RATE_FEATURE_COLUMNS)
+        
+        if self.model is not None:
+            try:
+                return self._predict_grid_model(features, rates)
+            except Exception as e:
+                logger.error(f"Model prediction failed, using heuristic: {e}")
+        
+        rate_vs_budget, _ = self._rate_ratios(features, rates)
+        return self._predict_rate_effects(features, rate_vs_budget)
+    
+    def _predict_grid_model(self, features: FeatureBatch, rates: np.ndarray) -> np.ndarray:
+        """
+        Trained-model win probabilities for each feature set at each rate
+        
+        Each feature row is repeated once per rate with the rate columns
+        replaced, and the (feature sets x rates) rows are scored in chunks
+        of at most PREDICT_BATCH_ROWS.
+        """
+        base = features.matrix()
+        rates = np.broadcast_to(rates, (len(features), np.shape(rates)[-1]))
+        rate_vs_budget, scale = self._rate_ratios(features, rates)
+        
+        columns = base.shape[1]
+        points = rates.shape[1]
+        probabilities = np.empty(rates.shape)
+        step = max(PREDICT_BATCH_ROWS // max(points, 1), 1)
+        for start in range(0, len(features), step):
+            rows = slice(start, start + step)
+            matrix = np.repeat(base[rows, None, :], points, axis=1)
+            matrix[..., _PROPOSED_RATE] = rates[rows]
+            matrix[..., _RATE_VS_BUDGET] = rate_vs_budget[rows]
+            matrix[..., _RATE_VS_MARKET] = base[rows, _RATE_VS_MARKET, None] * scale[rows]
+            matrix[..., _RATE_VS_AVERAGE] = base[rows, _RATE_VS_AVERAGE, None] * scale[rows]
+            probabilities[rows] = self.model.predict(
+                matrix.reshape(-1, columns)
+            ).reshape(-1, points)
+        return probabilities
+    
+    def _predict_tabled(
+        self,
+        features: list[RateFeatureRecord],
+        segments: list[str],
+        rates: np.ndarray
+    ) -> np.ndarray:
+        """
+        Win curves for (feature sets, rates) read from the segment win tables
+        
+        A table holds P(win) for a reference freelancer on the segment's
+        typical job. It is shifted, in log-odds, by the difference between
+        the live prediction for this freelancer and job at the middle of
+        their rate grid and the table value there, so the curve keeps the
+        segment's shape through the freelancer's own P(win): one model row
+        per curve instead of one per rate. Segments without a table, and
+        the closed-form heuristic, are evaluated live.
+        """
+        batch = FeatureBatch.from_records(features, RATE_FEATURE_COLUMNS)
+        if self.model is None:
+            return self._predict_grid(batch, rates)
+        
+        self.win_tables.maybe_reload()
+        rate_vs_budget, scale = self._rate_ratios(batch, rates)
+        found, tabled = self.win_tables.lookup(
+            segments,
+            self.version,
+            rate_vs_budget,
+            batch.rate_vs_market[:, None] * scale
+        )
+        
+        probabilities = np.empty(rates.shape)
+        if tabled is not None:
+            anchor = rates.shape[1] // 2
+            live = self._predict_grid(batch.take(found), rates[found, anchor:anchor + 1])[:, 0]
+            shift = self._log_odds(live) - self._log_odds(tabled[:, anchor])
+            probabilities[found] = 1 / (1 + np.exp(-(self._log_odds(tabled) + shift[:, None])))
+        if not found.all():
+            probabilities[~found] = self._predict_grid(batch.take(~found), rates[~found])
+        return probabilities
+    
+    @staticmethod
+    def _log_odds(probabilities: np.ndarray) -> np.ndarray:
+        probabilities = np.clip(probabilities, 1e-6, 1 - 1e-6)
+        return np.log(probabilities / (1 - probabilities))
+    
+    def _rate_ratios(self, features: FeatureBatch, rates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Rate vs budget midpoint of each feature set at each rate, and each
+        rate relative to the one its features were extracted at
+        
+        The other rate ratios scale with the rate:
+        rate / x = (proposed / x) * (rate / proposed).
+        """
+        budget_mid = self._budget_midpoint(features)[:, None]
+        # 1.0 where there is no usable budget / proposed rate
+        positive = budget_mid > 0
+        rate_vs_budget = np.where(positive, rates / np.where(positive, budget_mid, 1.0), 1.0)
+        proposed = features.proposed_rate[:, None]
+        scale = np.where(proposed > 0, rates / np.where(proposed > 0, proposed, 1.0), 1.0)
+        return rate_vs_budget, scale
+    
+    def _predict_rate_effects(
+        self,
+        features: FeatureBatch,
+        rate_vs_budget: np.ndarray
+    ) -> np.ndarray:
+        """Baseline heuristic model; rate_vs_budget has one row per feature set"""
+        # Fallback when no trained model is loaded
+        probability = self._base_effect(features)[:, None] + self._rate_effect(rate_vs_budget)
+        
+        # Clamp to valid range
+        return np.clip(probability, 0.05, 0.85)
+    
+    @staticmethod
+    def _budget_midpoint(features: FeatureBatch) -> np.ndarray:
+        # Missing (or zero) bounds default to 0 - 100
+        budget_min = np.nan_to_num(features.budget_min, nan=0.0)
+        budget_max = np.where(
+            np.isnan(features.budget_max) | (features.budget_max == 0), 100.0, features.budget_max
+        )
+        return (budget_min + budget_max) / 2
+    
+    @staticmethod
+    def _rate_effect(rate_vs_budget: np.ndarray) -> np.ndarray:
+        """Rate vs budget effect (biggest factor)"""
+        return np.select(
+            [
+                rate_vs_budget <= 0,
+                rate_vs_budget < 0.8,  # Below budget = higher chance
+                rate_vs_budget <= 1.0,  # At budget
+                rate_vs_budget <= 1.2,  # Slightly above
+            ],
+            [0, 0.2, 0.1, -0.1],
+            default=-0.25  # Way above budget
+        )
+    
+    @staticmethod
+    def _base_effect(features: FeatureBatch) -> np.ndarray:
+        """Everything in the heuristic that does not depend on the rate"""
+        base_prob = 0.5
         
         # Experience effect
-        exp_effect = min(features.experience_years * 0.02, 0.15)
+        exp_effect = np.minimum(features.experience_years * 0.02, 0.15)
         
         # Rating effect
         rating_effect = (features.rating - 4.0) * 0.05
@@ -171,23 +484,82 @@ class RateSuccessModel:
         # Historical win rate effect
         history_effect = (features.historical_win_rate - 0.3) * 0.15
         
-        # Competition effect
-        competition_effects = {
-            'low': 0.15,
-            'medium': 0,
-            'high': -0.15
-        }
-        comp_effect = competition_effects.get(features.competition_level, 0)
+        # Competition effect (medium or unknown: none)
+        comp_effect = np.select(
+            [
+                features.competition_level == LEVEL_CODES['low'],
+                features.competition_level == LEVEL_CODES['high'],
+            ],
+            [0.15, -0.15],
+            default=0
+        )
         
         # Timing effect (fresher jobs = higher chance)
-        timing_effect = max(-0.1, -features.days_since_posted * 0.01)
+        timing_effect = np.maximum(-0.1, -features.days_since_posted * 0.01)
         
-        # Combine effects
-        probability = base_prob + rate_effect + exp_effect + rating_effect + \
-                     skill_effect + history_effect + comp_effect + timing_effect
+        return base_prob + exp_effect + rating_effect + skill_effect + \
+            history_effect + comp_effect + timing_effect
+    
+    # -------------------------------------------------------------------------
+    # WIN TABLES
+    # -------------------------------------------------------------------------
+    
+    def build_win_tables(
+        self,
+        reference_jobs: list[dict],
+        budget_axis: np.ndarray,
+        market_axis: np.ndarray
+    ) -> np.ndarray:
+        """
+        P(win) of the reference freelancer on each reference job over the
+        (rate vs budget, rate vs market) grid
         
-        # Clamp to valid range
-        return max(0.05, min(0.85, probability))
+        Reference jobs carry the job features of a segment (budget_min,
+        budget_max, complexity, competition_level, duration_days). Returns
+        a (jobs, budget points, market points) array.
+        """
+        rvb, rvm = (a.ravel() for a in np.meshgrid(budget_axis, market_axis, indexing="ij"))
+        points = len(rvb)
+        now = datetime.utcnow()
+        
+        records = [
+            RateFeatureRecord(
+                **REFERENCE_FREELANCER,
+                average_rate=None,
+                budget_min=job.get('budget_min'),
+                budget_max=job.get('budget_max'),
+                job_complexity=job.get('complexity', 'medium'),
+                duration_days=job.get('duration_days'),
+                competition_level=job.get('competition_level', 'medium'),
+                proposed_rate=None,
+                rate_vs_budget=None,
+                rate_vs_market=None,
+                rate_vs_average=None,
+                days_since_posted=0,
+                month=now.month,
+                day_of_week=now.weekday()
+            )
+            for job in reference_jobs
+        ]
+        jobs = FeatureBatch.from_records(records, RATE_FEATURE_COLUMNS)
+        
+        # Reference freelancer's average rate is the job's budget midpoint
+        budget_mid = self._budget_midpoint(jobs)
+        tables = np.empty((len(reference_jobs), points))
+        step = max(PREDICT_BATCH_ROWS // points, 1)
+        for start in range(0, len(reference_jobs), step):
+            rows = np.arange(start, min(start + step, len(reference_jobs)))
+            grid = jobs.take(np.repeat(rows, points))
+            mid = np.repeat(budget_mid[rows], points)
+            ratio = np.tile(rvb, len(rows))
+            grid.proposed_rate[:] = mid * ratio
+            grid.average_rate[:] = mid
+            grid.rate_vs_budget[:] = ratio
+            grid.rate_vs_average[:] = ratio
+            grid.rate_vs_market[:] = np.tile(rvm, len(rows))
+            tables[rows] = self._predict(grid).reshape(len(rows), points)
+        
+        return tables.reshape(len(reference_jobs), len(budget_axis), len(market_axis))
     
     # -------------------------------------------------------------------------
     # FEATURE EXTRACTION
@@ -198,8 +570,8 @@ class RateSuccessModel:
         rate: float,
         job_id: str,
         user_id: str
-    ) -> RateFeatures:
-        """Extract features for prediction"""
+    ) -> RateFeatureRecord:
+        """Extract features for prediction (unvalidated record)"""
         # Get job details
         job = await self._get_job(job_id)
         
@@ -223,7 +595,7 @@ class RateSuccessModel:
         else:
             days_since = 0
         
-        return RateFeatures(
+        return RateFeatureRecord(
             experience_years=freelancer.get('experience_years', 3),
             skill_match_score=self._calculate_skill_match(
                 freelancer.get('skills', []),
@@ -264,31 +636,15 @@ class RateSuccessModel:
     
     async def _get_job(self, job_id: str) -> dict:
         """Get job details"""
-        # In production: Query database
-        return {
-            'budget_min': 30,
-            'budget_max': 80,
-            'skills': ['python', 'django'],
-            'complexity': 'medium',
-            'competition_level': 'medium'
-        }
+        return await self.features.job(job_id)
     
     async def _get_freelancer(self, user_id: str) -> dict:
         """Get freelancer details"""
-        # In production: Query database
-        return {
-            'experience_years': 5,
-            'skills': ['python', 'django', 'javascript'],
-            'rating': 4.7,
-            'completion_rate': 0.96,
-            'win_rate': 0.35,
-            'average_rate': 55.0
-        }
+        return await self.features.freelancer(user_id)
     
     async def _get_market_median(self, skills: list[str]) -> float:
         """Get market median rate for skills"""
-        # In production: Query market data
-        return 50.0
+        return await self.features.market_median(skills)
     
     # -------------------------------------------------------------------------
     # TRAINING
@@ -300,30 +656,36 @@ class RateSuccessModel:
         # In production: Store to training dataset
     
     async def retrain(self, training_data: list[TrainingData]) -> dict:
-        """Retrain model with new data"""
+        """Retrain the gradient-boosted model and swap it in"""
         logger.info(f"Retraining with {len(training_data)} samples")
         
-        # In production:
-        # 1. Prepare feature matrix
-        # 2. Split train/validation
-        # 3. Train model
-        # 4. Evaluate
-        # 5. Return metrics
+        matrix = FeatureBatch.from_records(
+            [d.features for d in training_data], RATE_FEATURE_COLUMNS
+        ).matrix()
+        labels = np.array([d.outcome == 'won' for d in training_data])
+        model, metrics = await asyncio.to_thread(
+            WinProbabilityModel.train,
+            matrix,
+            labels,
+            RATE_FEATURE_COLUMNS,
+            self.model_path or get_ai_settings().RATE_OPTIMIZER.prediction_model_path
+        )
         
+        self.model = model
+        self.version = model.version
         return {
+            **metrics,
             "samples": len(training_data),
-            "accuracy": 0.70,
-            "auc": 0.75,
-            "mae_rate": 8.5,  # Mean absolute error in rate
-            "model_version": "1.0.1"
+            "model_version": model.version
         }
     
     async def evaluate(self, test_data: list[TrainingData]) -> dict:
         """Evaluate model performance"""
-        return {
-            "accuracy": 0.68,
-            "samples": len(test_data)
-        }
+        features = FeatureBatch.from_records([d.features for d in test_data], RATE_FEATURE_COLUMNS)
+        probabilities = self._predict(features) if test_data else np.empty(0)
+        return classification_metrics(
+            probabilities, np.array([d.outcome == 'won' for d in test_data])
+        )
 
 
 # =============================================================================
@@ -336,5 +698,7 @@ def get_rate_model() -> RateSuccessModel:
     """Get RateSuccessModel singleton"""
     global _model
     if _model is None:
-        _model = RateSuccessModel()
+        _model = RateSuccessModel(
+            model_path=get_ai_settings().RATE_OPTIMIZER.prediction_model_path
+        )
     return _model
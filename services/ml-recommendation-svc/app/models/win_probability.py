@@ -0,0 +1,185 @@
+"""
+Win Probability Model
+Gradient-boosted (LightGBM) win classifier shared by the rate and
+proposal models
+Sprint M7: AI Work Assistant
+
+Features arrive as a dense float32 matrix (``FeatureBatch.matrix``), one
+row per prediction, in the model's column order. Categorical levels are
+ordinal codes and missing values are NaN, which LightGBM routes natively.
+A whole batch (every rate of every win curve, every proposal in a feed)
+is scored in one ``predict`` call.
+"""
+
+from pathlib import Path
+from typing import Optional, Sequence
+from datetime import datetime
+import logging
+import numpy as np
+
+from app.services.model_artifacts import load_artifact
+
+logger = logging.getLogger(__name__)
+
+# Rows scored per predict call; bounds the matrix built for large grids
+PREDICT_BATCH_ROWS = 65536
+
+# Smallest training set that leaves every split and a validation set non-empty
+MIN_TRAINING_SAMPLES = 50
+
+DEFAULT_TRAINING_PARAMS = {
+    "objective": "binary",
+    "learning_rate": 0.05,
+    "num_leaves": 31,
+    "min_data_in_leaf": 20,
+    "feature_fraction": 0.9,
+    "bagging_fraction": 0.8,
+    "bagging_freq": 1,
+    "verbose": -1,
+}
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def classification_metrics(probabilities: np.ndarray, labels: np.ndarray) -> dict:
+    """Accuracy, ROC AUC and log loss of win probabilities."""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    labels = np.asarray(labels, dtype=bool)
+    if not len(labels):
+        return {"accuracy": 0, "samples": 0}
+
+    clipped = np.clip(probabilities, 1e-7, 1 - 1e-7)
+    metrics = {
+        "accuracy": float(np.mean((probabilities > 0.5) == labels)),
+        "log_loss": float(-np.mean(np.where(labels, np.log(clipped), np.log(1 - clipped)))),
+        "samples": int(len(labels)),
+    }
+
+    # Rank-based AUC (Mann-Whitney U), average ranks for ties
+    positives = labels.sum()
+    negatives = len(labels) - positives
+    if positives and negatives:
+        order = np.argsort(probabilities, kind="mergesort")
+        ranks = np.empty(len(order))
+        ranks[order] = np.arange(1, len(order) + 1)
+        _, inverse, counts = np.unique(probabilities, return_inverse=True, return_counts=True)
+        ranks = (np.bincount(inverse, weights=ranks) / counts)[inverse]
+        metrics["auc"] = float(
+            (ranks[labels].sum() - positives * (positives + 1) / 2) / (positives * negatives)
+        )
+    return metrics
+
+
+# =============================================================================
+# MODEL
+# =============================================================================
+
+def model_version(path: Path) -> str:
+    """
+    Version of a saved booster, from its file's modification time.
+
+    Both loading and training name models this way, so a model keeps its
+    version across restarts and version-keyed artifacts (win tables) stay valid.
+    """
+    return f"lgbm-{datetime.utcfromtimestamp(path.stat().st_mtime):%Y%m%d%H%M%S}"
+
+
+class WinProbabilityModel:
+    """Trained LightGBM booster scoring feature matrices in batches"""
+
+    def __init__(self, booster, columns: Sequence[str], version: str):
+        self.booster = booster
+        self.columns = tuple(columns)
+        self.version = version
+
+    @classmethod
+    def load(cls, path: str, columns: Sequence[str]) -> Optional["WinProbabilityModel"]:
+        """
+        Load a booster saved as LightGBM text (``.txt``) or a joblib pickle
+        of a Booster or LGBMClassifier. Returns None when there is no file
+        or LightGBM is not installed.
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        try:
+            import lightgbm
+        except ImportError:
+            logger.warning("lightgbm not installed, cannot load win model")
+            return None
+
+        if path.suffix == ".txt":
+            booster = lightgbm.Booster(model_file=str(path))
+        else:
+            booster = load_artifact(path)
+            # sklearn wrapper: score with the underlying booster
+            booster = getattr(booster, "booster_", booster)
+
+        if booster.num_feature() != len(columns):
+            raise ValueError(
+                f"Win model {path} expects {booster.num_feature()} features, "
+                f"got {len(columns)}"
+            )
+
+        return cls(booster, columns, model_version(path))
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        """P(win) for each row of a (rows, columns) feature matrix"""
+        return np.asarray(self.booster.predict(matrix), dtype=np.float64)
+
+    @classmethod
+    def train(
+        cls,
+        matrix: np.ndarray,
+        labels: np.ndarray,
+        columns: Sequence[str],
+        path: str,
+        params: Optional[dict] = None,
+        num_boost_round: int = 500,
+    ) -> tuple["WinProbabilityModel", dict]:
+        """
+        Train on an 80/20 split with early stopping and save the booster
+
+        Returns the model and its validation metrics. Raises ValueError
+        with fewer than MIN_TRAINING_SAMPLES samples or a single outcome.
+        """
+        labels = np.asarray(labels, dtype=np.float32)
+        if len(labels) < MIN_TRAINING_SAMPLES:
+            raise ValueError(
+                f"Need at least {MIN_TRAINING_SAMPLES} training samples, got {len(labels)}"
+            )
+        if labels.min() == labels.max():
+            raise ValueError("Training data needs both won and lost outcomes")
+
+        import lightgbm
+
+        order = np.random.default_rng(0).permutation(len(labels))
+        split = int(len(order) * 0.8)
+        train_rows, valid_rows = order[:split], order[split:]
+
+        train_set = lightgbm.Dataset(
+            matrix[train_rows], labels[train_rows], feature_name=list(columns)
+        )
+        valid_set = lightgbm.Dataset(matrix[valid_rows], labels[valid_rows], reference=train_set)
+        booster = lightgbm.train(
+            {**DEFAULT_TRAINING_PARAMS, **(params or {})},
+            train_set,
+            num_boost_round=num_boost_round,
+            valid_sets=[valid_set],
+            callbacks=[lightgbm.early_stopping(50, verbose=False)],
+        )
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".txt":
+            booster.save_model(str(path))
+        else:
+            import joblib
+            joblib.dump(booster, path)
+
+        model = cls(booster, columns, model_version(path))
+        metrics = classification_metrics(model.predict(matrix[valid_rows]), labels[valid_rows] > 0)
+        return model, {**metrics, "best_iteration": booster.best_iteration}
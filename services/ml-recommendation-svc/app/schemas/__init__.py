@@ -5,17 +5,23 @@ from app.schemas.recommendation import (
     ContentType,
     TrendDirection,
     GapPriority,
+    BatchOutputFormat,
+    BatchJobState,
     UserContext,
     SkillProfile,
     MarketSignal,
     GenerateRecommendationsRequest,
     GenerateRecommendationsResponse,
+    BatchRecommendationsRequest,
+    BatchJobStatus,
     RecommendationItem,
     AnalyzeSkillGapsRequest,
     AnalyzeSkillGapsResponse,
     SkillGapItem,
     ForecastTrendRequest,
     ForecastTrendResponse,
+    ForecastTrendBatchRequest,
+    ForecastTrendBatchResponse,
     TrendForecast,
     HealthResponse,
 )
@@ -25,17 +31,23 @@ __all__ = [
     "ContentType",
     "TrendDirection",
     "GapPriority",
+    "BatchOutputFormat",
+    "BatchJobState",
     "UserContext",
     "SkillProfile",
     "MarketSignal",
     "GenerateRecommendationsRequest",
     "GenerateRecommendationsResponse",
+    "BatchRecommendationsRequest",
+    "BatchJobStatus",
     "RecommendationItem",
     "AnalyzeSkillGapsRequest",
     "AnalyzeSkillGapsResponse",
     "SkillGapItem",
     "ForecastTrendRequest",
     "ForecastTrendResponse",
+    "ForecastTrendBatchRequest",
+    "ForecastTrendBatchResponse",
     "TrendForecast",
     "HealthResponse",
 ]
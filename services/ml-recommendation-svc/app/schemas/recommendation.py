@@ -51,6 +51,18 @@ class GapPriority(str, Enum):
     LOW = "LOW"
 
 
+class BatchOutputFormat(str, Enum):
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+class BatchJobState(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
 # =============================================================================
 # REQUEST SCHEMAS
 # =============================================================================
@@ -77,6 +89,7 @@ class UserContext(BaseModel):
 
 class MarketSignal(BaseModel):
     """Market activity signal for recommendation context."""
+    signal_id: Optional[str] = None
     signal_type: str
     skill_ids: List[str] = []
     job_id: Optional[str] = None
@@ -96,6 +109,17 @@ class GenerateRecommendationsRequest(BaseModel):
     min_confidence: float = Field(default=0.3, ge=0.0, le=1.0)
 
 
+class BatchRecommendationsRequest(BaseModel):
+    """Request to generate recommendations for many users."""
+    # Inline user list, or an NDJSON file under BATCH_INPUT_PATH with one
+    # GenerateRecommendationsRequest per line
+    requests: List[GenerateRecommendationsRequest] = []
+    input_path: Optional[str] = None
+    cursor: int = Field(default=0, ge=0)  # first input line to process
+    output_format: BatchOutputFormat = BatchOutputFormat.NDJSON
+    stream: bool = False  # stream NDJSON in the response instead of writing a job
+
+
 class AnalyzeSkillGapsRequest(BaseModel):
     """Request to analyze skill gaps."""
     user_context: UserContext
@@ -111,6 +135,13 @@ class ForecastTrendRequest(BaseModel):
     include_confidence_intervals: bool = True
 
 
+class ForecastTrendBatchRequest(BaseModel):
+    """Request for trend forecasts of many skills at once."""
+    skill_ids: List[str] = Field(min_length=1, max_length=500)
+    periods_ahead: int = Field(default=12, ge=1, le=52)
+    include_confidence_intervals: bool = True
+
+
 # =============================================================================
 # RESPONSE SCHEMAS
 # =============================================================================
@@ -151,6 +182,22 @@ class GenerateRecommendationsResponse(BaseModel):
     user_id: str
 
 
+class BatchJobStatus(BaseModel):
+    """Progress of a batch recommendation job."""
+    job_id: str
+    state: BatchJobState
+    output_format: BatchOutputFormat
+    output_path: str
+    total_users: Optional[int] = None
+    processed_users: int = 0
+    failed_users: int = 0
+    shards_completed: int = 0
+    users_per_second: float = 0.0
+    started_at: datetime
+    updated_at: datetime
+    error: Optional[str] = None
+
+
 class SkillGapItem(BaseModel):
     """Analyzed skill gap."""
     skill_id: str
@@ -191,9 +238,18 @@ class ForecastTrendResponse(BaseModel):
     processing_time_ms: int
 
 
+class ForecastTrendBatchResponse(BaseModel):
+    """Response with trend forecasts, in request order."""
+    forecasts: List[TrendForecast]
+    model_version: str
+    processing_time_ms: int
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     version: str
     models_loaded: bool
     uptime_seconds: int
+    runtime: Optional[Dict[str, Any]] = None
+    startup: Optional[Dict[str, Any]] = None
@@ -0,0 +1,609 @@
+"""
+Batch Recommendations - Sharded, resumable recommendation generation.
+
+Users are cut into fixed-size shards and fanned out over a spawned
+process pool. Every worker builds its own ModelService once, in the pool
+initializer, and serves shards for the rest of its life. Each shard
+produces one output partition, written atomically::
+
+    <BATCH_OUTPUT_PATH>/<job_id>/
+        manifest.json           # job state + completed shards (checkpoint)
+        lease.json              # owner + heartbeat of the process running it
+        input.ndjson            # inline requests, persisted for resume
+        part-00000.ndjson       # one user per line (or .parquet)
+        part-00001.ndjson
+
+The manifest is rewritten after every finished shard, so a job resumed
+after a crash skips every partition that already landed on disk and
+only redoes shards that were in flight.
+
+Jobs are run by whichever API process started or resumed them. That
+process holds the job's lease and renews its heartbeat while running; a
+resume from any other process is refused until the heartbeat goes stale,
+so a job is never run twice concurrently. Shards still in flight when a
+lease is lost write to temp files of their own and only move them into
+place while their process still holds the lease.
+"""
+
+import asyncio
+import importlib.util
+import json
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+from app.schemas import (
+    BatchJobState,
+    BatchJobStatus,
+    BatchOutputFormat,
+    BatchRecommendationsRequest,
+    GenerateRecommendationsRequest,
+    RecommendationItem,
+)
+from app.services.inference_executor import InferenceExecutor, limit_torch_threads
+from app.services.model_service import ModelService
+
+logger = structlog.get_logger()
+
+MANIFEST_FILE = "manifest.json"
+LEASE_FILE = "lease.json"
+INPUT_FILE = "input.ndjson"
+
+
+class LeaseLostError(RuntimeError):
+    """A shard finished after its job's lease passed to another process."""
+
+
+# Per-process state of a batch worker
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_service: Optional[ModelService] = None
+
+
+def apply_request_filters(
+    recommendations: List[RecommendationItem],
+    body: GenerateRecommendationsRequest,
+) -> List[RecommendationItem]:
+    """Apply the request's content type and minimum confidence filters."""
+    if body.filter_content_types:
+        recommendations = [
+            r for r in recommendations
+            if r.content_type in body.filter_content_types
+        ]
+
+    return [
+        r for r in recommendations
+        if r.confidence_score >= body.min_confidence
+    ]
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+def _init_batch_worker(torch_threads: int) -> None:
+    """Pool initializer: load this worker's models once."""
+    global _worker_loop, _worker_service
+
+    limit_torch_threads(torch_threads)
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+
+    # Nested process pools are not allowed; inference stays in this process
+    _worker_service = ModelService(
+        executor=InferenceExecutor(mode="thread", max_workers=1, torch_threads=torch_threads)
+    )
+    _worker_loop.run_until_complete(_worker_service.initialize())
+
+
+async def _generate_user(line: str) -> Dict[str, Any]:
+    """Generate recommendations for one input line."""
+    try:
+        body = GenerateRecommendationsRequest.model_validate_json(line)
+    except ValueError as e:
+        return {"user_id": None, "tenant_id": None, "recommendations": [], "error": str(e)}
+
+    user = body.user_context
+    try:
+        recommendations = await _worker_service.generate_recommendations(
+            user_context=user,
+            skill_gaps=body.skill_gaps,
+            market_signals=body.recent_signals,
+            max_recommendations=body.max_recommendations,
+        )
+    except Exception as e:
+        return {"user_id": user.user_id, "tenant_id": user.tenant_id, "recommendations": [], "error": str(e)}
+
+    return {
+        "user_id": user.user_id,
+        "tenant_id": user.tenant_id,
+        "recommendations": [
+            r.model_dump(mode="json") for r in apply_request_filters(recommendations, body)
+        ],
+        "error": None,
+    }
+
+
+async def _generate_rows(lines: List[str], concurrency: int) -> List[Dict[str, Any]]:
+    """Run users concurrently so their embedding calls share batches."""
+    rows = []
+    for start in range(0, len(lines), concurrency):
+        chunk = lines[start:start + concurrency]
+        rows.extend(await asyncio.gather(*(_generate_user(line) for line in chunk)))
+    return rows
+
+
+def _to_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def _write_parquet(rows: List[Dict[str, Any]], path: Path) -> None:
+    """Write one row per (user, recommendation); failed users are skipped."""
+    import pandas as pd
+
+    records = [
+        {
+            "user_id": row["user_id"],
+            "tenant_id": row["tenant_id"],
+            "rank": rank,
+            "content_id": item["content_id"],
+            "content_type": item["content_type"],
+            "title": item["title"],
+            "recommendation_type": item["recommendation_type"],
+            "overall_score": item["overall_score"],
+            "relevance_score": item["relevance_score"],
+            "urgency_score": item["urgency_score"],
+            "impact_score": item["impact_score"],
+            "confidence_score": item["confidence_score"],
+            "target_skill_ids": item["target_skill_ids"],
+            "reasoning": item["reasoning"],
+        }
+        for row in rows
+        for rank, item in enumerate(row["recommendations"], start=1)
+    ]
+    pd.DataFrame.from_records(records).to_parquet(path, index=False)
+
+
+def _write_partition(rows: List[Dict[str, Any]], path: Path, output_format: str, owner: str) -> None:
+    """
+    Atomically write a job's output partition on behalf of its lease ``owner``.
+
+    The temp file is unique to this write, so a shard left running after
+    its job was taken over never touches the new owner's files; it is
+    dropped instead of moved into place.
+    """
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        if output_format == BatchOutputFormat.PARQUET.value:
+            _write_parquet(rows, tmp)
+        else:
+            tmp.write_bytes(_to_ndjson(rows))
+
+        lease = _lease_state(path.parent / LEASE_FILE)
+        if lease is None or lease["owner"] != owner:
+            raise LeaseLostError(f"Lease on {path.parent.name} is no longer held by {owner}")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _run_shard(
+    lines: List[str],
+    output_file: Optional[str],
+    output_format: str,
+    concurrency: int,
+    owner: Optional[str],
+) -> Tuple[int, int, Optional[bytes]]:
+    """
+    Process one shard in a pool worker.
+
+    Writes the partition to ``output_file`` when given, otherwise returns
+    the NDJSON payload. Returns (processed, failed, payload).
+    """
+    rows = _worker_loop.run_until_complete(_generate_rows(lines, concurrency))
+    failed = sum(1 for row in rows if row["error"])
+
+    if output_file is None:
+        return len(rows), failed, _to_ndjson(rows)
+
+    _write_partition(rows, Path(output_file), output_format, owner)
+    return len(rows), failed, None
+
+
+# =============================================================================
+# INPUT / MANIFEST HELPERS
+# =============================================================================
+
+def _iter_shards(path: Path, cursor: int, shard_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """Yield (shard_index, lines) from an NDJSON file, starting at ``cursor``."""
+    shard: List[str] = []
+    index = 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line_no < cursor or not line.strip():
+                continue
+            shard.append(line)
+            if len(shard) == shard_size:
+                yield index, shard
+                index += 1
+                shard = []
+
+    if shard:
+        yield index, shard
+
+
+def _count_users(path: Path, cursor: int) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line_no, line in enumerate(f) if line_no >= cursor and line.strip())
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(payload, default=str))
+    os.replace(tmp, path)
+
+
+def _lease_state(path: Path) -> Optional[Dict[str, Any]]:
+    """Owner and heartbeat of a lease file; None if it is gone."""
+    try:
+        mtime = path.stat().st_mtime
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        # Created but not written yet: its owner is still claiming it
+        return {"owner": None, "heartbeat": mtime}
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+class BatchRecommendationRunner:
+    """Owns the batch worker pool and the jobs running on it."""
+
+    def __init__(
+        self,
+        output_path: Optional[str] = None,
+        input_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        shard_size: Optional[int] = None,
+        user_concurrency: Optional[int] = None,
+    ):
+        self.output_path = Path(output_path or settings.BATCH_OUTPUT_PATH)
+        self.input_path = Path(input_path or settings.BATCH_INPUT_PATH)
+        self.workers = workers or settings.BATCH_WORKERS
+        self.shard_size = shard_size or settings.BATCH_SHARD_SIZE
+        self.user_concurrency = user_concurrency or settings.BATCH_USER_CONCURRENCY
+        self.lease_seconds = settings.BATCH_LEASE_SECONDS
+        # Unique per runner, so a restarted process never inherits a lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Spawn the worker pool on first use."""
+        if self._pool is None:
+            torch_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker,
+                initargs=(torch_threads,),
+            )
+            logger.info("Batch worker pool started", workers=self.workers)
+        return self._pool
+
+    def resolve_input(self, input_path: str) -> Path:
+        """Resolve a caller-supplied input file, confined to BATCH_INPUT_PATH."""
+        root = self.input_path.resolve()
+        path = (root / input_path).resolve()
+        if root not in path.parents or not path.is_file():
+            raise ValueError(f"Input file not found: {input_path}")
+        return path
+
+    async def _execute(
+        self,
+        shards: Iterator[Tuple[int, List[str]]],
+        output_dir: Optional[Path],
+        output_format: BatchOutputFormat,
+        owner: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, Tuple[int, int, Optional[bytes]]]]:
+        """
+        Submit shards with bounded look-ahead and yield results as they finish.
+
+        Keeping at most two shards per worker in flight bounds memory no
+        matter how large the input is. Partitions written to ``output_dir``
+        are only moved into place while ``owner`` holds the job's lease.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        pending: Dict[asyncio.Future, int] = {}
+        suffix = "parquet" if output_format == BatchOutputFormat.PARQUET else "ndjson"
+
+        async def drain():
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+        for index, lines in shards:
+            output_file = (
+                str(output_dir / f"part-{index:05d}.{suffix}") if output_dir else None
+            )
+            future = loop.run_in_executor(
+                pool, _run_shard, lines, output_file, output_format.value, self.user_concurrency, owner
+            )
+            pending[future] = index
+
+            if len(pending) >= self.workers * 2:
+                async for result in drain():
+                    yield result
+
+        while pending:
+            async for result in drain():
+                yield result
+
+    # -------------------------------------------------------------------------
+    # STREAMING
+    # -------------------------------------------------------------------------
+
+    async def stream(self, body: BatchRecommendationsRequest) -> AsyncIterator[bytes]:
+        """Yield NDJSON lines shard by shard, in completion order."""
+        if body.input_path:
+            shards = _iter_shards(self.resolve_input(body.input_path), body.cursor, self.shard_size)
+        else:
+            lines = [r.model_dump_json() for r in body.requests[body.cursor:]]
+            shards = (
+                (i // self.shard_size, lines[i:i + self.shard_size])
+                for i in range(0, len(lines), self.shard_size)
+            )
+
+        async for _, (_, _, payload) in self._execute(shards, None, BatchOutputFormat.NDJSON):
+            yield payload
+
+    # -------------------------------------------------------------------------
+    # JOBS
+    # -------------------------------------------------------------------------
+
+    def submit(self, body: BatchRecommendationsRequest) -> BatchJobStatus:
+        """Create a job directory, persist its input and start it."""
+        if body.output_format == BatchOutputFormat.PARQUET:
+            # Fail the request, not the job's first partition
+            if importlib.util.find_spec("pyarrow") is None:
+                raise ValueError("Parquet output requires pyarrow")
+
+        job_id = uuid.uuid4().hex
+        job_dir = self.output_path / job_id
+        job_dir.mkdir(parents=True)
+
+        if body.input_path:
+            input_file = self.resolve_input(body.input_path)
+        else:
+            input_file = job_dir / INPUT_FILE
+            with open(input_file, "w", encoding="utf-8") as f:
+                for r in body.requests:
+                    f.write(r.model_dump_json() + "\n")
+
+        now = datetime.utcnow()
+        manifest = {
+            "job_id": job_id,
+            "state": BatchJobState.PENDING.value,
+            "input_file": str(input_file),
+            "cursor": body.cursor,
+            "shard_size": self.shard_size,
+            "output_format": body.output_format.value,
+            "total_users": None,
+            "processed_users": 0,
+            "failed_users": 0,
+            "completed_shards": [],
+            "elapsed_seconds": 0.0,
+            "started_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+            "error": None,
+        }
+        _write_json_atomic(job_dir / MANIFEST_FILE, manifest)
+
+        self._start(job_id)
+        return self._to_status(manifest)
+
+    def resume(self, job_id: str) -> Optional[BatchJobStatus]:
+        """Restart an interrupted or failed job from its last checkpoint."""
+        manifest = self._load_manifest(job_id)
+        if manifest is None:
+            return None
+
+        if manifest["state"] != BatchJobState.COMPLETED.value and not self._is_running(job_id):
+            if not self._start(job_id):
+                logger.info("Batch job is running in another process", job_id=job_id)
+
+        return self._to_status(manifest)
+
+    def status(self, job_id: str) -> Optional[BatchJobStatus]:
+        manifest = self._load_manifest(job_id)
+        return self._to_status(manifest) if manifest else None
+
+    def _is_running(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    def _start(self, job_id: str) -> bool:
+        """Run a job here if its lease can be claimed. Returns False if held elsewhere."""
+        if not self._claim_lease(self.output_path / job_id):
+            return False
+        task = asyncio.get_running_loop().create_task(self._run_job(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return True
+
+    # -------------------------------------------------------------------------
+    # LEASES
+    # -------------------------------------------------------------------------
+
+    def _write_lease(self, job_dir: Path) -> None:
+        _write_json_atomic(job_dir / LEASE_FILE, {"owner": self.owner, "heartbeat": time.time()})
+
+    def _claim_lease(self, job_dir: Path) -> bool:
+        """
+        Take a job's lease unless another process holds it with a fresh heartbeat.
+
+        A free lease is created exclusively. A stale one is first moved
+        aside; the process whose rename moved exactly the stale lease it
+        inspected takes it over, any other puts back what it moved.
+        """
+        path = job_dir / LEASE_FILE
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            lease = _lease_state(path)
+            if lease is None:
+                return self._claim_lease(job_dir)
+            if lease["owner"] != self.owner and time.time() - lease["heartbeat"] < self.lease_seconds:
+                return False
+
+            aside = job_dir / f".{LEASE_FILE}.{self.owner}.stale"
+            try:
+                os.rename(path, aside)
+            except FileNotFoundError:
+                return self._claim_lease(job_dir)
+            if _lease_state(aside) != lease:
+                # Moved a lease claimed since we looked; hand it back
+                os.replace(aside, path)
+                return False
+            os.remove(aside)
+            if lease["owner"] != self.owner:
+                logger.warning("Took over stale batch job lease", job_dir=str(job_dir), owner=lease["owner"])
+            return self._claim_lease(job_dir)
+
+        self._write_lease(job_dir)
+        return True
+
+    def _release_lease(self, job_dir: Path) -> None:
+        lease = _lease_state(job_dir / LEASE_FILE)
+        if lease is not None and lease["owner"] == self.owner:
+            (job_dir / LEASE_FILE).unlink(missing_ok=True)
+
+    async def _heartbeat(self, job_dir: Path, job: asyncio.Task) -> None:
+        """Renew the lease while the job runs; stop the job if it was taken over."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            lease = _lease_state(job_dir / LEASE_FILE)
+            if lease is None or lease["owner"] != self.owner:
+                logger.error("Batch job lease lost, stopping job", job_dir=str(job_dir))
+                job.cancel()
+                return
+            self._write_lease(job_dir)
+
+    async def _run_job(self, job_id: str) -> None:
+        """Process every shard not yet checkpointed in the manifest."""
+        job_dir = self.output_path / job_id
+        manifest = self._load_manifest(job_id)
+        input_file = Path(manifest["input_file"])
+        output_format = BatchOutputFormat(manifest["output_format"])
+        completed = set(manifest["completed_shards"])
+
+        run_started = time.monotonic()
+        elapsed_before = manifest["elapsed_seconds"]
+        heartbeat = asyncio.create_task(self._heartbeat(job_dir, asyncio.current_task()))
+
+        def checkpoint(**changes: Any) -> None:
+            manifest.update(changes)
+            manifest["elapsed_seconds"] = elapsed_before + time.monotonic() - run_started
+            manifest["updated_at"] = datetime.utcnow().isoformat()
+            _write_json_atomic(job_dir / MANIFEST_FILE, manifest)
+
+        try:
+            total = await asyncio.to_thread(_count_users, input_file, manifest["cursor"])
+            checkpoint(state=BatchJobState.RUNNING.value, total_users=total, error=None)
+            logger.info("Batch job started", job_id=job_id, total_users=total, resumed_shards=len(completed))
+
+            shards = (
+                (index, lines)
+                for index, lines in _iter_shards(input_file, manifest["cursor"], manifest["shard_size"])
+                if index not in completed
+            )
+            async for index, (processed, failed, _) in self._execute(
+                shards, job_dir, output_format, self.owner
+            ):
+                completed.add(index)
+                checkpoint(
+                    processed_users=manifest["processed_users"] + processed,
+                    failed_users=manifest["failed_users"] + failed,
+                    completed_shards=sorted(completed),
+                )
+
+            checkpoint(state=BatchJobState.COMPLETED.value)
+            logger.info(
+                "Batch job completed",
+                job_id=job_id,
+                processed_users=manifest["processed_users"],
+                failed_users=manifest["failed_users"],
+                users_per_second=self._to_status(manifest).users_per_second,
+            )
+
+        except LeaseLostError as e:
+            # The manifest belongs to the new owner now; leave it alone
+            logger.error("Batch job lease lost, stopping job", job_id=job_id, error=str(e))
+
+        except Exception as e:
+            logger.error("Batch job failed", job_id=job_id, error=str(e))
+            checkpoint(state=BatchJobState.FAILED.value, error=str(e))
+
+        finally:
+            heartbeat.cancel()
+            self._release_lease(job_dir)
+
+    def _load_manifest(self, job_id: str) -> Optional[Dict[str, Any]]:
+        # Job ids are generated hex strings; anything else is not ours
+        if not job_id.isalnum():
+            return None
+        path = self.output_path / job_id / MANIFEST_FILE
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text())
+
+    def _to_status(self, manifest: Dict[str, Any]) -> BatchJobStatus:
+        elapsed = manifest["elapsed_seconds"]
+        return BatchJobStatus(
+            job_id=manifest["job_id"],
+            state=manifest["state"],
+            output_format=manifest["output_format"],
+            output_path=str(self.output_path / manifest["job_id"]),
+            total_users=manifest["total_users"],
+            processed_users=manifest["processed_users"],
+            failed_users=manifest["failed_users"],
+            shards_completed=len(manifest["completed_shards"]),
+            users_per_second=round(manifest["processed_users"] / elapsed, 2) if elapsed else 0.0,
+            started_at=manifest["started_at"],
+            updated_at=manifest["updated_at"],
+            error=manifest["error"],
+        )
+
+    async def shutdown(self) -> None:
+        """Stop running jobs (they stay resumable) and the worker pool."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_batch_runner: Optional[BatchRecommendationRunner] = None
+
+
+def get_batch_runner() -> BatchRecommendationRunner:
+    """Get the process-wide batch runner."""
+    global _batch_runner
+    if _batch_runner is None:
+        _batch_runner = BatchRecommendationRunner()
+    return _batch_runner
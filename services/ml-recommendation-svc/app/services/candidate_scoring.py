@@ -0,0 +1,183 @@
+"""
+Candidate Scoring - Batched, vectorized scoring of recommendation candidates.
+
+Candidates, skill gaps and indexed market signals are encoded once into
+dense NumPy arrays over a shared skill vocabulary, so relevance, urgency,
+impact and overall scores for the whole candidate set are computed as
+a handful of matrix operations instead of one coroutine per candidate.
+
+Catalog candidates also carry the cosine ``similarity`` of their ANN
+search against the user's gap and goal queries. It counts as relevance
+on its own, so content that matches a gap semantically but not by skill
+id still ranks as relevant.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from app.services.signal_index import SignalIndex
+
+
+# Score weights for the overall blend
+RELEVANCE_WEIGHT = 0.35
+URGENCY_WEIGHT = 0.25
+IMPACT_WEIGHT = 0.25
+CONFIDENCE_WEIGHT = 0.15
+
+# Base scores applied when nothing matches
+BASE_RELEVANCE = 0.5
+BASE_URGENCY = 0.3
+BASE_IMPACT = 0.4
+GOAL_IMPACT = 0.8
+
+# Urgency contributed by each market signal type
+SIGNAL_URGENCY = {
+    "JOB_REJECTION": 0.9,
+    "JOB_APPLICATION": 0.7,
+}
+
+
+@dataclass
+class ScoredCandidates:
+    """Scores for the candidates that survived filtering, best first."""
+    indices: np.ndarray
+    relevance: np.ndarray
+    urgency: np.ndarray
+    impact: np.ndarray
+    confidence: np.ndarray
+    overall: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def scores_at(self, position: int) -> Dict[str, float]:
+        """Return the score dict for the survivor at ``position``."""
+        return {
+            "relevance": float(self.relevance[position]),
+            "urgency": float(self.urgency[position]),
+            "impact": float(self.impact[position]),
+            "confidence": float(self.confidence[position]),
+            "overall": float(self.overall[position]),
+        }
+
+
+class CandidateScorer:
+    """Scores a batch of candidates against a user's gaps, signals and goals."""
+
+    def __init__(self, confidence: float):
+        self.confidence = confidence
+
+    def score(
+        self,
+        candidates: List[Dict[str, Any]],
+        skill_gaps: List[Dict[str, Any]],
+        signal_index: SignalIndex,
+        career_goals: Optional[List[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Compute per-candidate score arrays for every candidate."""
+        n = len(candidates)
+        vocab: Dict[str, int] = {}
+
+        def term(key: Any) -> int:
+            return vocab.setdefault(key, len(vocab))
+
+        # Gap membership: (vocab, gaps). A gap matches on skill_name or skill_id.
+        gap_rows, gap_cols = [], []
+        gap_scores = np.empty(len(skill_gaps), dtype=np.float64)
+        for j, gap in enumerate(skill_gaps):
+            gap_scores[j] = gap.get("gap_score", 50) / 100
+            for key in {gap.get("skill_name"), gap.get("skill_id")}:
+                gap_rows.append(term(key))
+                gap_cols.append(j)
+
+        # Highest recent-signal urgency per skill, from the signal index
+        skill_urgency = signal_index.recent_urgency(SIGNAL_URGENCY, BASE_URGENCY)
+        urgency_terms = [term(skill) for skill in skill_urgency]
+
+        # Candidate membership: (candidates, vocab). Skills outside the
+        # gap/signal vocabulary can never match, so they are dropped here.
+        cand_rows, cand_cols = [], []
+        for i, candidate in enumerate(candidates):
+            for skill in candidate.get("skill_ids", []):
+                col = vocab.get(skill)
+                if col is not None:
+                    cand_rows.append(i)
+                    cand_cols.append(col)
+
+        width = len(vocab)
+        cand_matrix = np.zeros((n, width), dtype=np.float32)
+        cand_matrix[cand_rows, cand_cols] = 1.0
+
+        gap_matrix = np.zeros((width, len(skill_gaps)), dtype=np.float32)
+        gap_matrix[gap_rows, gap_cols] = 1.0
+        gap_hits = (cand_matrix @ gap_matrix) > 0
+        relevance = np.maximum(
+            BASE_RELEVANCE,
+            np.where(gap_hits, gap_scores, BASE_RELEVANCE).max(axis=1, initial=BASE_RELEVANCE),
+        )
+
+        # Semantic match from the catalog search; template candidates have none
+        similarity = np.array([c.get("similarity", np.nan) for c in candidates], dtype=np.float64)
+        relevance = np.fmax(relevance, np.clip(similarity, 0.0, 1.0))
+
+        term_urgency = np.zeros(width, dtype=np.float64)
+        term_urgency[urgency_terms] = list(skill_urgency.values())
+        urgency = np.maximum(
+            BASE_URGENCY,
+            (cand_matrix * term_urgency).max(axis=1, initial=BASE_URGENCY),
+        )
+
+        impact = np.full(n, BASE_IMPACT, dtype=np.float64)
+        if career_goals and n:
+            titles = np.array([c.get("title", "").lower() for c in candidates])
+            goal_hit = np.zeros(n, dtype=bool)
+            for goal in career_goals:
+                goal_hit |= np.char.find(titles, goal.lower()) >= 0
+            impact[goal_hit] = GOAL_IMPACT
+
+        confidence = np.full(n, self.confidence, dtype=np.float64)
+
+        overall = (
+            relevance * RELEVANCE_WEIGHT +
+            urgency * URGENCY_WEIGHT +
+            impact * IMPACT_WEIGHT +
+            confidence * CONFIDENCE_WEIGHT
+        )
+
+        return {
+            "relevance": relevance,
+            "urgency": urgency,
+            "impact": impact,
+            "confidence": confidence,
+            "overall": overall,
+        }
+
+    def top_k(
+        self,
+        scores: Dict[str, np.ndarray],
+        k: int,
+        min_score: float,
+    ) -> ScoredCandidates:
+        """Select the best ``k`` candidates scoring at least ``min_score``."""
+        overall = scores["overall"]
+        eligible = np.flatnonzero(overall >= min_score)
+
+        if k < len(eligible):
+            part = np.argpartition(-overall[eligible], k - 1)[:k]
+            eligible = eligible[part]
+
+        # Best first; ties keep catalog order, matching the previous stable sort
+        ranked = np.round(overall[eligible], 3)
+        order = np.lexsort((eligible, -ranked))
+        indices = eligible[order]
+
+        return ScoredCandidates(
+            indices=indices,
+            relevance=scores["relevance"][indices],
+            urgency=scores["urgency"][indices],
+            impact=scores["impact"][indices],
+            confidence=scores["confidence"][indices],
+            overall=overall[indices],
+        )
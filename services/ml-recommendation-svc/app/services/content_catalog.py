@@ -0,0 +1,264 @@
+"""
+Content Catalog - Precomputed content embeddings with approximate
+nearest-neighbour retrieval.
+
+On-disk layout (one directory per built version)::
+
+    <CONTENT_CATALOG_PATH>/
+        CURRENT                 # {"version": "..."} - swapped atomically
+        <version>/
+            manifest.json       # dimension, item count, IVF list count
+            embeddings.npy      # (items, dim) float32, L2-normalized
+            items.jsonl         # one content record per line
+            item_offsets.npy    # (items + 1,) byte offsets into items.jsonl
+            ivf_centroids.npy   # (lists, dim) float32
+            ivf_offsets.npy     # (lists + 1,) offsets into ivf_ids.npy
+            ivf_ids.npy         # item ids grouped by list
+
+Embeddings, item records and inverted lists are all memory-mapped, so a
+worker only pages in the rows it actually scores. Retrieval is an
+IVF-style search: the query is compared against the list centroids, the
+closest ``CATALOG_IVF_PROBES`` lists are scanned exactly, and the best
+items are returned.
+"""
+
+import json
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.versioned_snapshots import VersionedSnapshotReader, create_version, publish_version
+
+logger = structlog.get_logger()
+
+# Catalogs smaller than this are searched exhaustively
+MIN_ITEMS_FOR_IVF = 4096
+KMEANS_ITERATIONS = 12
+KMEANS_SAMPLE_PER_LIST = 64
+ASSIGN_CHUNK_ROWS = 16384
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving zero rows untouched."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Assign each row to its most similar centroid, in chunks."""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK_ROWS], dtype=np.float32)
+        assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignment
+
+
+def _train_centroids(
+    vectors: np.ndarray,
+    n_lists: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Spherical k-means over a sample of the catalog."""
+    n = len(vectors)
+    sample_size = min(n, n_lists * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(
+        vectors[np.sort(rng.choice(n, sample_size, replace=False))],
+        dtype=np.float32,
+    )
+    centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = _nearest_centroid(sample, centroids)
+        order = np.argsort(assignment, kind="stable")
+        counts = np.bincount(assignment, minlength=n_lists)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+        # Empty lists keep their previous centroid
+        centroids[filled] = _normalize(sums)
+
+    return centroids
+
+
+def build_catalog(
+    items: List[Dict[str, Any]],
+    embeddings: np.ndarray,
+    path: Optional[str] = None,
+    n_lists: Optional[int] = None,
+    seed: int = 0,
+) -> str:
+    """
+    Write a new catalog version to disk and make it current.
+
+    Returns the new version name.
+    """
+    root = Path(path or settings.CONTENT_CATALOG_PATH)
+    vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+
+    if len(items) != len(vectors):
+        raise ValueError(
+            f"Catalog has {len(items)} items but {len(vectors)} embeddings"
+        )
+    if vectors.ndim != 2 or vectors.shape[1] != settings.EMBEDDING_DIMENSION:
+        raise ValueError(
+            f"Expected embeddings of dimension {settings.EMBEDDING_DIMENSION}, "
+            f"got shape {vectors.shape}"
+        )
+
+    version, target = create_version(root)
+    n = len(vectors)
+
+    np.save(target / "embeddings.npy", vectors)
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    with open(target / "items.jsonl", "wb") as f:
+        for i, item in enumerate(items):
+            line = json.dumps(item, default=str).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets[i + 1] = offsets[i] + len(line)
+    np.save(target / "item_offsets.npy", offsets)
+
+    if n_lists is None:
+        n_lists = int(4 * np.sqrt(n)) if n >= MIN_ITEMS_FOR_IVF else 0
+    n_lists = min(n_lists, n)
+
+    if n_lists > 0:
+        centroids = _train_centroids(vectors, n_lists, np.random.default_rng(seed))
+        assignment = _nearest_centroid(vectors, centroids)
+        list_ids = np.argsort(assignment, kind="stable").astype(np.int64)
+        list_offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(assignment, minlength=n_lists)))
+        ).astype(np.int64)
+        np.save(target / "ivf_centroids.npy", centroids)
+        np.save(target / "ivf_offsets.npy", list_offsets)
+        np.save(target / "ivf_ids.npy", list_ids)
+
+    publish_version(root, version, {
+        "dimension": int(vectors.shape[1]),
+        "items": n,
+        "ivf_lists": n_lists,
+    })
+    logger.info("Content catalog built", version=version, items=n, ivf_lists=n_lists)
+    return version
+
+
+@dataclass
+class _CatalogSnapshot:
+    """One immutable, memory-mapped catalog version."""
+    version: str
+    embeddings: np.ndarray
+    item_offsets: np.ndarray
+    items_map: Optional[mmap.mmap]
+    centroids: Optional[np.ndarray]
+    list_offsets: Optional[np.ndarray]
+    list_ids: Optional[np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return len(self.embeddings)
+
+    @classmethod
+    def open(cls, directory: Path) -> "_CatalogSnapshot":
+        manifest = json.loads((directory / "manifest.json").read_text())
+        embeddings = np.load(directory / "embeddings.npy", mmap_mode="r")
+        item_offsets = np.load(directory / "item_offsets.npy", mmap_mode="r")
+
+        items_map = None
+        if len(embeddings):
+            with open(directory / "items.jsonl", "rb") as f:
+                items_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        centroids = list_offsets = list_ids = None
+        if manifest.get("ivf_lists", 0) > 0:
+            centroids = np.load(directory / "ivf_centroids.npy")
+            list_offsets = np.load(directory / "ivf_offsets.npy")
+            list_ids = np.load(directory / "ivf_ids.npy", mmap_mode="r")
+
+        return cls(
+            version=manifest["version"],
+            embeddings=embeddings,
+            item_offsets=item_offsets,
+            items_map=items_map,
+            centroids=centroids,
+            list_offsets=list_offsets,
+            list_ids=list_ids,
+        )
+
+    def item(self, index: int) -> Dict[str, Any]:
+        start, end = self.item_offsets[index], self.item_offsets[index + 1]
+        return json.loads(self.items_map[start:end])
+
+    def candidate_ids(self, queries: np.ndarray, n_probes: int) -> np.ndarray:
+        """Item ids in the inverted lists closest to any of the queries."""
+        if self.centroids is None:
+            return np.arange(self.size)
+
+        n_probes = min(n_probes, len(self.centroids))
+        centroid_scores = queries @ self.centroids.T
+        probes = np.argpartition(-centroid_scores, n_probes - 1, axis=1)[:, :n_probes]
+
+        ids = [
+            self.list_ids[self.list_offsets[p]:self.list_offsets[p + 1]]
+            for p in np.unique(probes)
+        ]
+        # Sorted ids keep memory-mapped row reads sequential
+        return np.unique(np.concatenate(ids))
+
+
+class ContentCatalog(VersionedSnapshotReader[_CatalogSnapshot]):
+    """Read side of the content catalog with hot reload."""
+
+    name = "Content catalog"
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(Path(path or settings.CONTENT_CATALOG_PATH))
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None and self._snapshot.size > 0
+
+    def __len__(self) -> int:
+        return self._snapshot.size if self._snapshot else 0
+
+    def _open(self, directory: Path) -> _CatalogSnapshot:
+        return _CatalogSnapshot.open(directory)
+
+    def _reload_interval(self) -> float:
+        return settings.CATALOG_RELOAD_INTERVAL_SECONDS
+
+    def _describe(self, snapshot: _CatalogSnapshot) -> Dict[str, Any]:
+        return {"items": snapshot.size}
+
+    def search(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        n_probes: Optional[int] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Return up to ``top_k`` items most similar to any of the query vectors.
+
+        Each item is scored by its best cosine similarity across the queries.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.size == 0 or top_k <= 0:
+            return []
+
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        ids = snapshot.candidate_ids(queries, n_probes or settings.CATALOG_IVF_PROBES)
+        if len(ids) == 0:
+            return []
+
+        similarity = (snapshot.embeddings[ids] @ queries.T).max(axis=1)
+
+        k = min(top_k, len(ids))
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top], kind="stable")]
+
+        return [(snapshot.item(int(ids[i])), float(similarity[i])) for i in top]
@@ -0,0 +1,303 @@
+"""
+Embedding Backends - Interchangeable encoders for the embedding model.
+
+``EMBEDDING_BACKEND`` selects how text is encoded:
+
+- ``torch``: the sentence-transformers model (the reference output)
+- ``onnx``: the same network exported to an ONNX Runtime graph
+- ``onnx-int8``: that graph with dynamically quantized int8 weights
+
+The ONNX backends need only ``onnxruntime`` and ``tokenizers`` at
+serving time, with no torch. Export runs once at build time and also
+writes ``validation.json``: the cosine agreement of each graph with the
+torch model and the encode throughput of all three, side by side. A
+graph that drifts beyond ``EMBEDDING_COSINE_TOLERANCE`` refuses to load.
+
+    python -m app.services.embedding_backends --output ./models/embedding_onnx
+"""
+
+import importlib.util
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+ONNX_FILES = {
+    "onnx": "model.onnx",
+    "onnx-int8": "model.int8.onnx",
+}
+TOKENIZER_FILE = "tokenizer.json"
+VALIDATION_FILE = "validation.json"
+
+# Mixed-length sample used to check agreement and measure throughput
+VALIDATION_TEXTS = [
+    "Python",
+    "Machine learning engineer",
+    "React and TypeScript front-end development",
+    "Kubernetes cluster administration and Helm charts",
+    "Advanced SQL query optimization for analytics workloads",
+    "Introduction to data visualization with D3.js",
+    "Senior full-stack developer with cloud architecture experience",
+    "Build a REST API with FastAPI, PostgreSQL and Docker, then deploy it "
+    "to a managed container service with continuous delivery",
+    "UX research",
+    "Negotiating freelance rates with enterprise clients",
+    "Deep learning for computer vision: convolutional networks in practice",
+    "AWS Solutions Architect certification preparation",
+]
+
+
+class TorchEmbeddingBackend:
+    """Reference backend: the sentence-transformers model."""
+
+    name = "torch"
+
+    def __init__(self, model_name: str, device: str = "cpu"):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device=device)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+
+
+class OnnxEmbeddingBackend:
+    """
+    Exported transformer run on ONNX Runtime, with mean pooling and L2
+    normalization done in numpy (matching all-MiniLM-L6-v2's modules).
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        variant: str = "onnx-int8",
+        max_seq_length: int = 256,
+        threads: int = 0,
+        require_validation: bool = True,
+    ):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        root = Path(model_dir)
+        self.name = variant
+        self.validation = _read_validation(root).get(variant)
+        if require_validation:
+            _check_validation(variant, self.validation)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(root / ONNX_FILES[variant]),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(str(root / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(
+            None, {k: v for k, v in feeds.items() if k in self.input_names}
+        )[0]
+
+        # Mean over real tokens, then unit length
+        weights = mask[:, :, None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+
+def load_embedding_backend(
+    backend: str,
+    model_name: str,
+    device: str = "cpu",
+    threads: int = 0,
+) -> Any:
+    """Build the configured backend (module-level so workers can unpickle it)."""
+    if backend == "torch":
+        return TorchEmbeddingBackend(model_name, device=device)
+    if backend in ONNX_FILES:
+        return OnnxEmbeddingBackend(
+            settings.EMBEDDING_ONNX_PATH,
+            variant=backend,
+            max_seq_length=settings.EMBEDDING_MAX_SEQ_LENGTH,
+            threads=threads,
+        )
+    raise ValueError(f"Unsupported embedding backend: {backend}")
+
+
+def backend_module(backend: str) -> Optional[str]:
+    """
+    Module the backend imports, or None when this deployment cannot run
+    it (package missing, or no exported graph on disk).
+    """
+    if backend == "torch":
+        module, needs = "sentence_transformers", ["sentence_transformers"]
+    elif backend in ONNX_FILES:
+        module, needs = "onnxruntime", ["onnxruntime", "tokenizers"]
+        if not (Path(settings.EMBEDDING_ONNX_PATH) / ONNX_FILES[backend]).exists():
+            return None
+    else:
+        raise ValueError(f"Unsupported embedding backend: {backend}")
+
+    if any(importlib.util.find_spec(name) is None for name in needs):
+        return None
+    return module
+
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def _read_validation(root: Path) -> Dict[str, Any]:
+    path = root / VALIDATION_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _check_validation(variant: str, report: Optional[Dict[str, Any]]) -> None:
+    if report is None:
+        raise RuntimeError(f"No validation report for {variant}; re-run the export")
+    if 1 - report["min_cosine"] > settings.EMBEDDING_COSINE_TOLERANCE:
+        raise RuntimeError(
+            f"{variant} embeddings drift from torch (min cosine {report['min_cosine']:.4f})"
+        )
+
+
+def _throughput(backend: Any, texts: List[str], rounds: int) -> float:
+    backend.encode(texts)  # warm-up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        backend.encode(texts)
+    return round(rounds * len(texts) / (time.perf_counter() - started), 1)
+
+
+def compare_backends(
+    reference: Any,
+    candidate: Any,
+    texts: Optional[List[str]] = None,
+    batch_size: int = 64,
+    rounds: int = 5,
+) -> Dict[str, Any]:
+    """Cosine agreement and side-by-side throughput of two backends."""
+    texts = texts or VALIDATION_TEXTS
+    expected = np.asarray(reference.encode(texts), dtype=np.float32)
+    actual = np.asarray(candidate.encode(texts), dtype=np.float32)
+
+    cosine = np.sum(expected * actual, axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    )
+
+    batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+    reference_tps = _throughput(reference, batch, rounds)
+    candidate_tps = _throughput(candidate, batch, rounds)
+
+    return {
+        "min_cosine": round(float(cosine.min()), 6),
+        "mean_cosine": round(float(cosine.mean()), 6),
+        "passed": bool(1 - cosine.min() <= settings.EMBEDDING_COSINE_TOLERANCE),
+        "reference_texts_per_second": reference_tps,
+        "texts_per_second": candidate_tps,
+        "speedup": round(candidate_tps / reference_tps, 2) if reference_tps else None,
+        "batch_size": batch_size,
+    }
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def export_onnx(model_name: str, output_dir: str, opset: int = 14) -> Dict[str, Any]:
+    """
+    Export the transformer to ONNX, quantize it to int8 and validate both
+    graphs against the torch model. Needs torch at build time only.
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+
+    reference = TorchEmbeddingBackend(model_name, device="cpu")
+    transformer = reference.model[0].auto_model.eval()
+    tokenizer = reference.model.tokenizer
+    tokenizer.backend_tokenizer.save(str(root / TOKENIZER_FILE))
+
+    class _HiddenStates(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids,
+                return_dict=False,
+            )[0]
+
+    sample = tokenizer(VALIDATION_TEXTS[:2], padding=True, return_tensors="pt")
+    inputs = ("input_ids", "attention_mask", "token_type_ids")
+    fp32_path = root / ONNX_FILES["onnx"]
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(transformer),
+            tuple(sample[name] for name in inputs),
+            str(fp32_path),
+            input_names=list(inputs),
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                name: {0: "batch", 1: "sequence"}
+                for name in (*inputs, "last_hidden_state")
+            },
+            opset_version=opset,
+        )
+
+    quantize_dynamic(
+        str(fp32_path),
+        str(root / ONNX_FILES["onnx-int8"]),
+        weight_type=QuantType.QInt8,
+    )
+
+    report = {
+        variant: compare_backends(
+            reference,
+            OnnxEmbeddingBackend(
+                str(root),
+                variant=variant,
+                max_seq_length=reference.model.max_seq_length,
+                require_validation=False,
+            ),
+        )
+        for variant in ONNX_FILES
+    }
+    (root / VALIDATION_FILE).write_text(json.dumps(report, indent=2))
+
+    logger.info("Exported ONNX embedding backends", path=str(root), report=report)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_PATH)
+    args = parser.parse_args()
+
+    print(json.dumps(export_onnx(args.model, args.output), indent=2))
@@ -0,0 +1,123 @@
+"""
+Embedding Batcher - Dynamic micro-batching for text embeddings.
+
+Concurrent ``embed`` calls are collected for up to ``max_wait_ms`` (or
+until ``max_batch_size`` texts are pending) and encoded with a single
+model call off the event loop. Each caller's future is resolved with
+its own row of the batch result.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Set, Tuple, Dict, Any
+
+import numpy as np
+import structlog
+
+from app.services.inference_executor import InferenceExecutor
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class BatcherStats:
+    """Running counters for the embedding batcher."""
+    batches: int = 0
+    texts: int = 0
+    unique_texts: int = 0
+    encode_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "unique_texts": self.unique_texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "avg_encode_ms": round(self.encode_seconds * 1000 / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into batched encode calls."""
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 3.0,
+        executor: Optional[InferenceExecutor] = None,
+    ):
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = executor or InferenceExecutor(mode="thread", max_workers=1)
+        self._owns_executor = executor is None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self.stats = BatcherStats()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed one text, sharing a model call with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts; they join the same batching window."""
+        return np.vstack(await asyncio.gather(*(self.embed(t) for t in texts)))
+
+    def _flush(self) -> None:
+        """Dispatch everything pending as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Encode a batch off the event loop and resolve its futures."""
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        start = time.perf_counter()
+
+        try:
+            vectors = await self._executor.run(self._encode, texts)
+        except Exception as e:
+            logger.error("Embedding batch failed", batch_size=len(texts), error=str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.texts += len(batch)
+        self.stats.unique_texts += len(texts)
+        self.stats.encode_seconds += time.perf_counter() - start
+
+        rows = {text: i for i, text in enumerate(texts)}
+        for text, future in batch:
+            # Callers that were cancelled while waiting are skipped
+            if not future.done():
+                future.set_result(vectors[rows[text]])
+
+    async def close(self) -> None:
+        """Flush pending requests, wait for in-flight batches and stop."""
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._owns_executor:
+            self._executor.shutdown()
@@ -0,0 +1,206 @@
+"""
+Embedding Cache - Two-tier, content-hash keyed cache for text embeddings.
+
+Tier 1 is an in-process LRU bounded by a byte budget; tier 2 is Redis.
+Both tiers hold the same quantized payload: int8 with a per-vector
+scale factor (4x smaller than float32) or float16 (2x smaller). Keys
+are a hash of the embedding model name and the text, so switching
+models never serves stale vectors.
+"""
+
+import hashlib
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any
+
+import numpy as np
+
+from app.services.redis_client import LazyRedis
+
+# Payload header: storage format tag + dequantization scale
+_HEADER = struct.Struct("<Bf")
+_INT8 = 1
+_FLOAT16 = 2
+
+# Rough per-entry bookkeeping cost on top of key and payload bytes
+_ENTRY_OVERHEAD_BYTES = 120
+
+
+def quantize(vector: np.ndarray, dtype: str = "int8") -> bytes:
+    """Pack a vector into the cache payload format."""
+    values = np.asarray(vector, dtype=np.float32).ravel()
+
+    if dtype == "int8":
+        scale = float(np.abs(values).max()) / 127 if values.size else 0.0
+        scale = scale or 1.0
+        packed = np.round(values / scale).astype(np.int8)
+        return _HEADER.pack(_INT8, scale) + packed.tobytes()
+
+    if dtype == "float16":
+        return _HEADER.pack(_FLOAT16, 1.0) + values.astype(np.float16).tobytes()
+
+    raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+
+
+def dequantize(payload: bytes) -> np.ndarray:
+    """Unpack a cache payload back into a float32 vector."""
+    tag, scale = _HEADER.unpack_from(payload)
+    body = memoryview(payload)[_HEADER.size:]
+
+    if tag == _INT8:
+        return np.frombuffer(body, dtype=np.int8).astype(np.float32) * np.float32(scale)
+    if tag == _FLOAT16:
+        return np.frombuffer(body, dtype=np.float16).astype(np.float32)
+
+    raise ValueError(f"Unknown embedding payload format: {tag}")
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for the embedding cache."""
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def snapshot(self, size_bytes: int, entries: int, redis_errors: int) -> Dict[str, Any]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "redis_errors": redis_errors,
+            "entries": entries,
+            "size_bytes": size_bytes,
+        }
+
+
+class EmbeddingCache:
+    """In-process LRU backed by Redis, storing quantized embeddings."""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_bytes: int,
+        dtype: str = "int8",
+        redis_url: Optional[str] = None,
+        ttl_seconds: int = 3600,
+        key_prefix: str = "emb:",
+    ):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size_bytes = 0
+        self._redis = LazyRedis(redis_url, "embedding_cache")
+        self.stats = CacheStats()
+
+    def key(self, text: str) -> str:
+        """Content-hash key for a text under this cache's model namespace."""
+        digest = hashlib.blake2b(
+            f"{self.namespace}\0{text}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return f"{self.key_prefix}{digest}"
+
+    # -------------------------------------------------------------------------
+    # LOOKUP / STORE
+    # -------------------------------------------------------------------------
+
+    async def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up texts in both tiers; misses come back as None."""
+        keys = [self.key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        remote = []
+
+        for i, key in enumerate(keys):
+            payload = self._entries.get(key)
+            if payload is None:
+                remote.append(i)
+                continue
+            self._entries.move_to_end(key)
+            results[i] = dequantize(payload)
+            self.stats.local_hits += 1
+
+        if remote:
+            payloads = await self._redis_get_many([keys[i] for i in remote])
+            for i, payload in zip(remote, payloads):
+                if payload is None:
+                    self.stats.misses += 1
+                    continue
+                self._remember(keys[i], payload)
+                results[i] = dequantize(payload)
+                self.stats.redis_hits += 1
+
+        return results
+
+    async def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Store freshly encoded vectors in both tiers."""
+        items = {
+            self.key(text): quantize(vector, self.dtype)
+            for text, vector in zip(texts, vectors)
+        }
+        for key, payload in items.items():
+            self._remember(key, payload)
+        await self._redis_set_many(items)
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        """Insert into the local LRU, evicting down to the byte budget."""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= self._cost(key, previous)
+
+        self._entries[key] = payload
+        self._size_bytes += self._cost(key, payload)
+
+        while self._size_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_payload = self._entries.popitem(last=False)
+            self._size_bytes -= self._cost(old_key, old_payload)
+            self.stats.evictions += 1
+
+    @staticmethod
+    def _cost(key: str, payload: bytes) -> int:
+        return len(key) + len(payload) + _ENTRY_OVERHEAD_BYTES
+
+    # -------------------------------------------------------------------------
+    # REDIS TIER
+    # -------------------------------------------------------------------------
+
+    async def _redis_get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        client = self._redis.client()
+        if client is None:
+            return [None] * len(keys)
+        try:
+            return await client.mget(keys)
+        except Exception as e:
+            self._redis.failed(e)
+            return [None] * len(keys)
+
+    async def _redis_set_many(self, items: Dict[str, bytes]) -> None:
+        client = self._redis.client()
+        if client is None or not items:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, payload in items.items():
+                    pipe.set(key, payload, ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            self._redis.failed(e)
+
+    # -------------------------------------------------------------------------
+    # LIFECYCLE
+    # -------------------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current hit/miss metrics and local tier occupancy."""
+        return self.stats.snapshot(self._size_bytes, len(self._entries), self._redis.errors)
+
+    async def close(self) -> None:
+        await self._redis.close()
+        self._entries.clear()
+        self._size_bytes = 0
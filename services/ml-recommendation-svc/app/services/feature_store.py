@@ -0,0 +1,285 @@
+"""
+Feature Store - Shared, batched access to job, freelancer and market features.
+
+The rate, proposal and career models all need the same few entities. Each
+lookup goes through an ``EntityLoader``, which adds three layers in front
+of the backend:
+
+- request memo: within one request (``request_scope``), an entity is
+  fetched at most once, however many models ask for it
+- shared TTL cache: recently loaded entities are reused across requests
+- DataLoader batching with single-flight: keys requested during the same
+  event-loop tick are coalesced into one backend query, and concurrent
+  requests for a key already being loaded wait on that load
+
+Loaded records are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# (loader name, key) -> future, for the current request only
+_request_memo: ContextVar[Optional[Dict[Tuple[str, Hashable], asyncio.Future]]] = ContextVar(
+    "feature_store_request_memo", default=None
+)
+
+
+@contextlib.contextmanager
+def request_scope() -> Iterator[None]:
+    """Memoize feature lookups for the duration of the block."""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+class EntityLoader:
+    """Memoized, cached, batched loader for one entity type."""
+
+    def __init__(
+        self,
+        name: str,
+        batch_load: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        ttl_seconds: float,
+        max_entries: int,
+        max_batch_size: int,
+    ):
+        self.name = name
+        self._batch_load = batch_load
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_batch_size = max_batch_size
+
+        self._cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Hashable] = []
+        self._dispatch_scheduled = False
+
+        self.requests = 0
+        self.memo_hits = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.backend_keys = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """Load one entity; raises KeyError if the backend has no record."""
+        self.requests += 1
+        memo = _request_memo.get()
+        if memo is not None:
+            future = memo.get((self.name, key))
+            if future is not None:
+                self.memo_hits += 1
+                return await asyncio.shield(future)
+
+        future = self._future(key)
+        if memo is not None:
+            memo[(self.name, key)] = future
+        # Shielded so one cancelled caller does not cancel the shared load
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key (or everything) from the shared cache."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _future(self, key: Hashable) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+                future = loop.create_future()
+                future.set_result(entry[1])
+                return future
+            del self._cache[key]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        self._pending.append(key)
+        if not self._dispatch_scheduled:
+            # Run after every coroutine already scheduled this tick has queued its keys
+            self._dispatch_scheduled = True
+            loop.call_soon(self._dispatch)
+        return future
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        self._dispatch_scheduled = False
+        for start in range(0, len(keys), self.max_batch_size):
+            asyncio.ensure_future(self._load_batch(keys[start:start + self.max_batch_size]))
+
+    async def _load_batch(self, keys: List[Hashable]) -> None:
+        self.batches += 1
+        self.backend_keys += len(keys)
+        try:
+            values = await self._batch_load(keys)
+        except Exception as e:
+            logger.warning("Feature batch load failed", entity=self.name, keys=len(keys), error=str(e))
+            for key in keys:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        expires = time.monotonic() + self.ttl_seconds
+        for key in keys:
+            future = self._inflight.pop(key)
+            if key not in values:
+                future.set_exception(KeyError(f"{self.name} {key!r} not found"))
+                continue
+            if self.ttl_seconds > 0:
+                self._cache[key] = (expires, values[key])
+                self._cache.move_to_end(key)
+            future.set_result(values[key])
+
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "memo_hits": self.memo_hits,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "backend_keys": self.backend_keys,
+            "cached": len(self._cache),
+        }
+
+
+class FeatureBackend:
+    """
+    Batched entity queries: each method receives every key of a batch
+    and returns the records found, keyed the same way.
+    """
+
+    async def get_jobs(self, job_ids: List[str]) -> Dict[str, dict]:
+        # In production: one query, WHERE id = ANY(job_ids)
+        return {
+            job_id: {
+                'budget_min': 30,
+                'budget_max': 80,
+                'skills': ['python', 'django'],
+                'complexity': 'medium',
+                'competition_level': 'medium'
+            }
+            for job_id in job_ids
+        }
+
+    async def get_freelancers(self, user_ids: List[str]) -> Dict[str, dict]:
+        # In production: one query against the user and stats tables
+        return {
+            user_id: {
+                'experience_years': 5,
+                'skills': ['python', 'django', 'javascript'],
+                'rating': 4.7,
+                'completion_rate': 0.96,
+                'win_rate': 0.35,
+                'average_rate': 55.0
+            }
+            for user_id in user_ids
+        }
+
+    async def get_career_states(self, user_ids: List[str]) -> Dict[str, dict]:
+        # In production: one query over earnings and contract aggregates
+        return {
+            user_id: {
+                'current_monthly_earnings': 5000,
+                'average_hourly_rate': 75,
+                'active_clients': 3,
+                'total_projects': 45,
+                'completion_rate': 0.96,
+                'rating': 4.8,
+                'top_skills': ["python", "django", "react"],
+                'experience_years': 5,
+                'specialization': "Web Development"
+            }
+            for user_id in user_ids
+        }
+
+    async def get_market_medians(
+        self,
+        skill_sets: List[Tuple[str, ...]],
+    ) -> Dict[Tuple[str, ...], float]:
+        # In production: one aggregate over market rate data per skill set
+        return {skills: 50.0 for skills in skill_sets}
+
+
+class FeatureStore:
+    """Entity loaders shared by the rate, proposal and career models."""
+
+    def __init__(
+        self,
+        backend: Optional[FeatureBackend] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        self.backend = backend or FeatureBackend()
+        options = {
+            "ttl_seconds": settings.FEATURE_STORE_TTL_SECONDS if ttl_seconds is None else ttl_seconds,
+            "max_entries": max_entries or settings.FEATURE_STORE_MAX_ENTRIES,
+            "max_batch_size": max_batch_size or settings.FEATURE_STORE_BATCH_SIZE,
+        }
+        self.jobs = EntityLoader("job", self.backend.get_jobs, **options)
+        self.freelancers = EntityLoader("freelancer", self.backend.get_freelancers, **options)
+        self.career_states = EntityLoader("career_state", self.backend.get_career_states, **options)
+        self.market_medians = EntityLoader("market_median", self.backend.get_market_medians, **options)
+
+    async def job(self, job_id: str) -> dict:
+        return await self.jobs.load(job_id)
+
+    async def freelancer(self, user_id: str) -> dict:
+        return await self.freelancers.load(user_id)
+
+    async def career_state(self, user_id: str) -> dict:
+        return await self.career_states.load(user_id)
+
+    async def market_median(self, skills: List[str]) -> float:
+        """Median market rate for a skill set (order and case insensitive)."""
+        return await self.market_medians.load(tuple(sorted({s.lower() for s in skills})))
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            loader.name: loader.snapshot()
+            for loader in (self.jobs, self.freelancers, self.career_states, self.market_medians)
+        }
+
+
+# =============================================================================
+# FACTORY
+# =============================================================================
+
+_feature_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Get the process-wide feature store."""
+    global _feature_store
+    if _feature_store is None:
+        _feature_store = FeatureStore()
+    return _feature_store
@@ -0,0 +1,158 @@
+"""
+Forecast Grid - Precomputed trend forecasts for every known skill.
+
+Forecasts only change when new demand history is published, so the
+``ForecastGridBuilder`` job computes them for every skill in the market
+demand snapshot, out to ``FORECAST_GRID_HORIZON`` periods. Damped-trend
+projections for a shorter horizon are a prefix of a longer one, so one
+grid serves every ``periods_ahead``.
+
+On-disk layout (one directory per built version)::
+
+    <FORECAST_GRID_PATH>/
+        CURRENT             # {"version": "..."} - swapped atomically
+        <version>/
+            manifest.json   # skills, horizon, demand snapshot it was built from
+            forecasts.npy   # (skills, horizon, 3) float32: mean, lower, upper
+            summary.npy     # (skills, 2) float32: current score, confidence
+            keys.npy        # interned skill ids / names
+            key_rows.npy    # row of each key
+
+The forecast array is memory-mapped; serving a skill is a dict probe and
+a slice read.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.market_demand import skill_key
+from app.services.trend_forecasting import DemandForecast, forecast_demand
+from app.services.versioned_snapshots import VersionedSnapshotReader, create_version, publish_version
+
+logger = structlog.get_logger()
+
+
+def build_forecast_grid(
+    index: Dict[str, int],
+    history: np.ndarray,
+    current: np.ndarray,
+    horizon: Optional[int] = None,
+    path: Optional[str] = None,
+    source_version: Optional[str] = None,
+) -> str:
+    """
+    Forecast every history row and publish the grid as the current version.
+
+    ``index`` maps interned skill keys to rows of ``history``/``current``.
+    Returns the new version name.
+    """
+    root = Path(path or settings.FORECAST_GRID_PATH)
+    horizon = horizon or settings.FORECAST_GRID_HORIZON
+    forecast = forecast_demand(history, current, horizon)
+
+    version, target = create_version(root)
+
+    grid = np.stack([forecast.point, forecast.lower, forecast.upper], axis=-1)
+    np.save(target / "forecasts.npy", grid.astype(np.float32))
+    np.save(
+        target / "summary.npy",
+        np.stack([forecast.current, forecast.confidence], axis=-1).astype(np.float32),
+    )
+    np.save(target / "keys.npy", np.array(list(index), dtype=str))
+    np.save(target / "key_rows.npy", np.array(list(index.values()), dtype=np.int32))
+
+    publish_version(root, version, {
+        "skills": len(grid),
+        "horizon": horizon,
+        "source_version": source_version,
+    })
+    logger.info("Forecast grid built", version=version, skills=len(grid), horizon=horizon)
+    return version
+
+
+@dataclass
+class _GridSnapshot:
+    """One immutable, memory-mapped grid version."""
+    version: str
+    index: Dict[str, int]
+    forecasts: np.ndarray
+    summary: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return self.forecasts.shape[1]
+
+    @classmethod
+    def open(cls, directory: Path) -> "_GridSnapshot":
+        manifest = json.loads((directory / "manifest.json").read_text())
+        keys = np.load(directory / "keys.npy")
+        key_rows = np.load(directory / "key_rows.npy")
+        return cls(
+            version=manifest["version"],
+            index=dict(zip(keys.tolist(), key_rows.tolist())),
+            forecasts=np.load(directory / "forecasts.npy", mmap_mode="r"),
+            summary=np.load(directory / "summary.npy"),
+        )
+
+
+class ForecastGrid(VersionedSnapshotReader[_GridSnapshot]):
+    """Read side of the forecast grid with hot reload."""
+
+    name = "Forecast grid"
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(Path(path or settings.FORECAST_GRID_PATH))
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def _open(self, directory: Path) -> _GridSnapshot:
+        return _GridSnapshot.open(directory)
+
+    def _reload_interval(self) -> float:
+        return settings.FORECAST_GRID_RELOAD_SECONDS
+
+    def _describe(self, snapshot: _GridSnapshot) -> Dict[str, Any]:
+        return {"skills": len(snapshot.summary)}
+
+    def lookup(
+        self,
+        skill_ids: List[str],
+        horizon: int,
+    ) -> Tuple[np.ndarray, Optional[DemandForecast]]:
+        """
+        Precomputed forecasts for the skills in the grid.
+
+        Returns a mask of the skills found and their forecasts (in mask
+        order), or an all-False mask when the grid is missing or shorter
+        than ``horizon``.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or horizon > snapshot.horizon:
+            return np.zeros(len(skill_ids), dtype=bool), None
+
+        rows = np.array(
+            [snapshot.index.get(skill_key(skill), -1) for skill in skill_ids],
+            dtype=np.intp,
+        )
+        found = rows >= 0
+        if not found.any():
+            return found, None
+
+        rows = rows[found]
+        grid = snapshot.forecasts[rows, :horizon]
+        summary = snapshot.summary[rows]
+        return found, DemandForecast(
+            point=grid[..., 0],
+            lower=grid[..., 1],
+            upper=grid[..., 2],
+            current=summary[:, 0],
+            confidence=summary[:, 1],
+        )
@@ -0,0 +1,95 @@
+"""
+Hashing Embedder - Deterministic, model-free text embeddings.
+
+Word unigrams/bigrams and character n-grams of each word are hashed
+straight into ``EMBEDDING_DIMENSION`` signed buckets (the hashing trick)
+and the result is L2-normalized. There is no vocabulary and nothing to
+load. The same text always maps to the same vector, in every process,
+so the output can be cached. Cosine similarity then reflects shared
+words and sub-word spellings ("postgres" / "postgresql") rather than
+meaning.
+
+It is the fallback when no embedding model is available, and a
+low-latency tier for callers that do not need semantic quality.
+"""
+
+import functools
+import re
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"\w+")
+
+# Relative weight of each feature family
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.7
+CHAR_WEIGHT = 0.5
+
+
+class HashingEmbedder:
+    """Signed feature hashing of word and character n-grams."""
+
+    def __init__(self, dimension: int, char_ngrams: Tuple[int, int] = (3, 5)):
+        self.dimension = dimension
+        self.char_ngrams = char_ngrams
+        # Words repeat heavily across texts; hash each one's features once
+        self._word_features = functools.lru_cache(maxsize=65536)(self._hash_word)
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        """Bucket and sign of a feature (crc32 is stable across processes)."""
+        h = zlib.crc32(feature.encode("utf-8"))
+        # Low bits pick the bucket, the top bit picks the sign
+        return h % self.dimension, -1.0 if h >> 31 else 1.0
+
+    def _hash_word(self, word: str) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+        """Buckets and signed weights for a word and its character n-grams."""
+        features = [(f"w:{word}", WORD_WEIGHT)]
+
+        padded = f"<{word}>"
+        low, high = self.char_ngrams
+        for n in range(low, min(high, len(padded)) + 1):
+            features.extend(
+                (f"c:{padded[i:i + n]}", CHAR_WEIGHT)
+                for i in range(len(padded) - n + 1)
+            )
+
+        buckets, values = [], []
+        for feature, weight in features:
+            bucket, sign = self._hash(feature)
+            buckets.append(bucket)
+            values.append(sign * weight)
+        return tuple(buckets), tuple(values)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts as unit-length float32 rows."""
+        rows: List[int] = []
+        buckets: List[int] = []
+        values: List[float] = []
+
+        for row, text in enumerate(texts):
+            words = _WORD_RE.findall(text.lower())
+            start = len(buckets)
+
+            for word in words:
+                word_buckets, word_values = self._word_features(word)
+                buckets.extend(word_buckets)
+                values.extend(word_values)
+
+            for a, b in zip(words, words[1:]):
+                bucket, sign = self._hash(f"b:{a} {b}")
+                buckets.append(bucket)
+                values.append(sign * BIGRAM_WEIGHT)
+
+            rows.extend([row] * (len(buckets) - start))
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        np.add.at(
+            vectors,
+            (np.asarray(rows, dtype=np.intp), np.asarray(buckets, dtype=np.intp)),
+            np.asarray(values, dtype=np.float32),
+        )
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
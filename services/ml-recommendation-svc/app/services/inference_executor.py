@@ -0,0 +1,242 @@
+"""
+Inference Executor - Runs CPU-bound model work off the event loop.
+
+Work is submitted as a picklable callable and executed either on a
+thread pool (models shared with the serving process) or on a spawned
+process pool where every worker loads its own copy of the models at
+start-up. Callables reach models through ``worker_model(name)``, which
+resolves against the registry of whichever process runs them, so the
+same call works in both modes. Models registered with only a loader are
+loaded in each process the first time a callable asks for them.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Models available to callables in the current process, and loaders for
+# the ones that have not been needed yet
+_models: Dict[str, Any] = {}
+_loaders: Dict[str, Callable[[], Any]] = {}
+_load_lock = threading.Lock()
+
+
+def register_model(name: str, model: Any) -> None:
+    """Make a model available to callables run in this process."""
+    _models[name] = model
+
+
+def register_loader(name: str, loader: Callable[[], Any]) -> None:
+    """Load a model in this process on first use."""
+    _loaders[name] = loader
+
+
+def loaded_model(name: str) -> Optional[Any]:
+    """A model already loaded in this process, if any."""
+    return _models.get(name)
+
+
+def unregister_models() -> None:
+    _models.clear()
+    _loaders.clear()
+
+
+def worker_model(name: str) -> Any:
+    """Resolve a model by name in the process running the callable."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _load_lock:
+        if name not in _models:
+            loader = _loaders.get(name)
+            if loader is None:
+                raise RuntimeError(f"Model '{name}' is not loaded in this worker")
+            _models[name] = loader()
+        return _models[name]
+
+
+def limit_torch_threads(threads: int) -> None:
+    """Cap BLAS/OpenMP and torch intra-op threads for this process."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+
+    # Only adjust torch if something already imported it
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _init_worker(
+    loaders: Dict[str, Callable[[], Any]],
+    eager: Tuple[str, ...],
+    torch_threads: int,
+) -> None:
+    """Process-pool initializer: cap threads, then load this worker's eager models."""
+    limit_torch_threads(torch_threads)
+    for name, loader in loaders.items():
+        register_loader(name, loader)
+    for name in eager:
+        worker_model(name)
+
+
+def _timed_call(fn: Callable[[], Any], submitted_at: float) -> Tuple[Any, float, float]:
+    """Run ``fn`` and report queue wait and run time alongside its result."""
+    started_at = time.monotonic()
+    result = fn()
+    return result, started_at - submitted_at, time.monotonic() - started_at
+
+
+def _noop() -> None:
+    return None
+
+
+class WorkerModelHandle:
+    """Stands in for a model that only exists inside pool workers."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"WorkerModelHandle({self.name!r})"
+
+
+@dataclass
+class ExecutorStats:
+    """Queue and latency counters for the inference executor."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+
+
+class InferenceExecutor:
+    """Small async facade over a thread or process pool for model work."""
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 2,
+        torch_threads: int = 0,
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported inference executor mode: {mode}")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // max_workers)
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._eager: Tuple[str, ...] = ()
+        self._pool: Optional[Executor] = None
+        self.stats = ExecutorStats()
+
+    def add_worker_model(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        eager: bool = True,
+    ) -> WorkerModelHandle:
+        """
+        Register a picklable loader for every process-pool worker.
+
+        Eager models load when a worker starts; the rest load in each
+        worker the first time a call needs them.
+        """
+        if self._pool is not None:
+            raise RuntimeError("Worker models must be added before the executor starts")
+        self._loaders[name] = loader
+        if eager:
+            self._eager += (name,)
+        return WorkerModelHandle(name)
+
+    def start(self) -> None:
+        """Create the pool. Process workers load their models on start-up."""
+        if self._pool is not None:
+            return
+
+        if self.mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self._loaders, self._eager, self.torch_threads),
+            )
+            # Spawn every worker now so model loading happens at boot
+            for _ in range(self.max_workers):
+                self._pool.submit(_noop)
+        else:
+            limit_torch_threads(self.torch_threads)
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+
+        logger.info(
+            "Inference executor started",
+            mode=self.mode,
+            workers=self.max_workers,
+            torch_threads=self.torch_threads,
+        )
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        self.start()
+        call = functools.partial(fn, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        self.stats.submitted += 1
+        self.stats.in_flight += 1
+        try:
+            result, waited, elapsed = await loop.run_in_executor(
+                self._pool, _timed_call, call, time.monotonic()
+            )
+        except Exception:
+            self.stats.failed += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+
+        self.stats.completed += 1
+        self.stats.wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        self.stats.run_seconds += elapsed
+        return result
+
+    @property
+    def queue_depth(self) -> int:
+        """Submitted calls not yet picked up by a worker (approximate)."""
+        return max(0, self.stats.in_flight - self.max_workers)
+
+    def snapshot(self) -> Dict[str, Any]:
+        completed = self.stats.completed
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "torch_threads": self.torch_threads,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.stats.in_flight,
+            "submitted": self.stats.submitted,
+            "completed": completed,
+            "failed": self.stats.failed,
+            "avg_wait_ms": round(self.stats.wait_seconds * 1000 / completed, 3) if completed else 0.0,
+            "max_wait_ms": round(self.stats.max_wait_seconds * 1000, 3),
+            "avg_run_ms": round(self.stats.run_seconds * 1000 / completed, 3) if completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,265 @@
+"""
+Market Demand - Shared in-memory demand scores per skill.
+
+Demand scores come from job-posting aggregates, computed by the
+``MarketDemandRefresher`` job and published as a snapshot file under
+``MARKET_DEMAND_PATH``. Every worker keeps the snapshot in memory:
+
+- skill ids and skill names are interned once into a dict of row numbers
+- demand scores (0-100) and 30-day posting growth sit in float32 arrays
+- monthly posting counts form a skills x months history matrix, the
+  input to the trend forecaster
+
+A lookup is one dict probe and one array read. A background task picks
+up newer snapshots and swaps in the whole table with a single attribute
+assignment, so readers always see a consistent version and never wait.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+SNAPSHOT_FILE = "market_demand.npz"
+
+# Weights of the demand score components
+POSTINGS_WEIGHT = 0.7
+PER_APPLICANT_WEIGHT = 0.3
+
+# Score reported for skills missing from the snapshot
+NEUTRAL_DEMAND_SCORE = 50.0
+
+
+def skill_key(skill: str) -> str:
+    """Normalize a skill id or name for interning."""
+    return skill.strip().lower()
+
+
+def _percentile_rank(values: np.ndarray) -> np.ndarray:
+    """Rank of each value in [0, 1]; ties share the average rank."""
+    if len(values) < 2:
+        return np.ones(len(values), dtype=np.float64)
+    order = values.argsort(kind="stable")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values))
+    # Average the ranks of tied values
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return (sums / counts)[inverse] / (len(values) - 1)
+
+
+def write_demand_snapshot(rows: List[Dict], path: Optional[str] = None) -> int:
+    """
+    Score aggregate rows and publish them as the current snapshot.
+
+    Each row needs ``skill_id`` and ``skill_name``, plus posting counts
+    for the last and previous 30 days and applications in the last 30.
+    An optional ``history`` lists monthly posting counts, oldest first;
+    shorter histories are left-padded with NaN.
+    The score blends the skill's percentile in posting volume with its
+    percentile in postings per applicant (how contested the work is).
+    Returns the number of skills written.
+    """
+    root = Path(path or settings.MARKET_DEMAND_PATH)
+    root.mkdir(parents=True, exist_ok=True)
+
+    postings = np.array([r.get("postings_30d", 0) for r in rows], dtype=np.float64)
+    previous = np.array([r.get("postings_prev_30d", 0) for r in rows], dtype=np.float64)
+    applications = np.array([r.get("applications_30d", 0) for r in rows], dtype=np.float64)
+
+    per_applicant = postings / np.maximum(applications, 1.0)
+    scores = 100 * (
+        POSTINGS_WEIGHT * _percentile_rank(postings) +
+        PER_APPLICANT_WEIGHT * _percentile_rank(per_applicant)
+    )
+    growth = (postings - previous) / np.maximum(previous, 1.0)
+
+    months = max((len(r.get("history") or []) for r in rows), default=0)
+    history = np.full((len(rows), months), np.nan, dtype=np.float32)
+    for i, row in enumerate(rows):
+        series = row.get("history") or []
+        if series:
+            history[i, months - len(series):] = series
+
+    keys, key_rows = [], []
+    for i, row in enumerate(rows):
+        for key in {skill_key(row["skill_id"]), skill_key(row["skill_name"])}:
+            keys.append(key)
+            key_rows.append(i)
+
+    tmp = root / f".{SNAPSHOT_FILE}.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            keys=np.array(keys, dtype=str),
+            key_rows=np.array(key_rows, dtype=np.int32),
+            scores=scores.astype(np.float32),
+            growth=growth.astype(np.float32),
+            history=history,
+        )
+    os.replace(tmp, root / SNAPSHOT_FILE)
+
+    return len(rows)
+
+
+@dataclass(frozen=True)
+class _DemandSnapshot:
+    index: Dict[str, int]
+    scores: np.ndarray
+    growth: np.ndarray
+    history: np.ndarray
+    mtime: float
+
+
+class MarketDemandTable:
+    """O(1) demand lookups against the latest published snapshot."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.MARKET_DEMAND_PATH) / SNAPSHOT_FILE
+        self._snapshot: Optional[_DemandSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> Optional[str]:
+        """Publication time of the loaded snapshot."""
+        snapshot = self._snapshot
+        return datetime.utcfromtimestamp(snapshot.mtime).isoformat() if snapshot else None
+
+    def __len__(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.scores) if snapshot else 0
+
+    # -------------------------------------------------------------------------
+    # LOOKUPS
+    # -------------------------------------------------------------------------
+
+    def score(self, skill: str) -> Optional[float]:
+        """Demand score (0-100) for a skill id or name, if known."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        row = snapshot.index.get(skill_key(skill))
+        return None if row is None else float(snapshot.scores[row])
+
+    def growth(self, skill: str) -> Optional[float]:
+        """Relative change in postings over the last 30 days, if known."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        row = snapshot.index.get(skill_key(skill))
+        return None if row is None else float(snapshot.growth[row])
+
+    def history(self, skills: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Monthly posting history for ``skills`` as a (skills, months) matrix,
+        plus the current demand score of each; unknown skills get NaN.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            nan = np.full(len(skills), np.nan, dtype=np.float32)
+            return np.empty((len(skills), 0), dtype=np.float32), nan
+
+        rows = np.array(
+            [snapshot.index.get(skill_key(skill), -1) for skill in skills],
+            dtype=np.intp,
+        )
+        known = rows >= 0
+        history = np.full((len(skills), snapshot.history.shape[1]), np.nan, dtype=np.float32)
+        history[known] = snapshot.history[rows[known]]
+        scores = np.full(len(skills), np.nan, dtype=np.float32)
+        scores[known] = snapshot.scores[rows[known]]
+        return history, scores
+
+    def series(self) -> Optional[Tuple[Dict[str, int], np.ndarray, np.ndarray]]:
+        """Key index, history matrix and scores of the loaded snapshot."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        return snapshot.index, snapshot.history, snapshot.scores
+
+    def mean_score(self, skills: Iterable[str]) -> Optional[float]:
+        """Average demand over the skills that are known."""
+        known = [s for s in (self.score(skill) for skill in skills) if s is not None]
+        return sum(known) / len(known) if known else None
+
+    def mean_growth(self, skills: Iterable[str]) -> Optional[float]:
+        known = [g for g in (self.growth(skill) for skill in skills) if g is not None]
+        return sum(known) / len(known) if known else None
+
+    # -------------------------------------------------------------------------
+    # REFRESH
+    # -------------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Swap in the snapshot on disk if it is newer. Returns True on swap."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+        current = self._snapshot
+        if current is not None and current.mtime >= mtime:
+            return False
+
+        with np.load(self.path) as data:
+            snapshot = _DemandSnapshot(
+                index=dict(zip(data["keys"].tolist(), data["key_rows"].tolist())),
+                scores=data["scores"],
+                growth=data["growth"],
+                history=(
+                    data["history"] if "history" in data.files
+                    else np.empty((len(data["scores"]), 0), dtype=np.float32)
+                ),
+                mtime=mtime,
+            )
+
+        # Single reference assignment: readers see the old or the new table
+        self._snapshot = snapshot
+        logger.info("Market demand table loaded", skills=len(snapshot.scores))
+        return True
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.load)
+            except Exception as e:
+                logger.error("Market demand refresh failed", error=str(e))
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Load now and keep refreshing in the background."""
+        self.load()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._refresh_loop(interval or settings.MARKET_DEMAND_REFRESH_SECONDS)
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_market_demand: Optional[MarketDemandTable] = None
+
+
+def get_market_demand_table() -> MarketDemandTable:
+    """Get the process-wide market demand table."""
+    global _market_demand
+    if _market_demand is None:
+        _market_demand = MarketDemandTable()
+    return _market_demand
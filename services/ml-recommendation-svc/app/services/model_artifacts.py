@@ -0,0 +1,62 @@
+"""
+Model Artifacts - Memory-mappable loading of joblib model files.
+
+Trained models are usually saved compressed, which forces every process
+to inflate its own private copy. With ``MODEL_MMAP`` enabled, each
+artifact is re-saved once as an uncompressed sidecar next to the
+original (``recommendation_ranker.pkl`` -> ``recommendation_ranker.mmap.pkl``)
+and loaded with ``mmap_mode="r"``. The numpy arrays inside it are then
+read-only views of the file, backed by the shared page cache. Every
+worker on the node maps the same physical pages, whether the workers
+were forked or spawned.
+
+Only arrays held directly by the model are shared. Estimators that copy
+their arrays while unpickling, such as sklearn tree nodes or LightGBM
+boosters, still get private copies. For those, preload in the master
+process and fork (see ``gunicorn.conf.py``).
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+MMAP_SUFFIX = ".mmap"
+
+
+def mmap_sidecar_path(path: Path) -> Path:
+    """Location of the uncompressed, mmap-friendly copy of an artifact."""
+    return path.with_name(f"{path.stem}{MMAP_SUFFIX}{path.suffix}")
+
+
+def ensure_mmap_artifact(path: Path) -> Path:
+    """Write the mmap sidecar if it is missing or older than the artifact."""
+    import joblib
+
+    sidecar = mmap_sidecar_path(path)
+    if sidecar.exists() and sidecar.stat().st_mtime >= path.stat().st_mtime:
+        return sidecar
+
+    # Concurrent workers may race here; each writes its own temp file and
+    # the atomic rename leaves one complete sidecar either way
+    tmp = sidecar.with_name(f".{sidecar.name}.{os.getpid()}")
+    joblib.dump(joblib.load(path), tmp, compress=0)
+    os.replace(tmp, sidecar)
+
+    logger.info("Wrote mmap model artifact", source=str(path), sidecar=str(sidecar))
+    return sidecar
+
+
+def load_artifact(path: Path) -> Any:
+    """Load a joblib artifact, memory-mapping its arrays when enabled."""
+    import joblib
+
+    if not settings.MODEL_MMAP:
+        return joblib.load(path)
+
+    return joblib.load(ensure_mmap_artifact(path), mmap_mode="r")
@@ -2,12 +2,38 @@
 Model Service - Manages ML models and inference.
 """
 
+import asyncio
+import functools
+import importlib
+import os
+import time
 import structlog
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import numpy as np
 from pathlib import Path
 
 from app.core.config import settings
+from app.services.candidate_scoring import CandidateScorer
+from app.services.content_catalog import ContentCatalog
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+from app.services.hashing_embedder import HashingEmbedder
+from app.services.signal_index import SignalIndex, SignalIndexStore
+from app.services.market_demand import NEUTRAL_DEMAND_SCORE, get_market_demand_table
+from app.services.feature_store import get_feature_store
+from app.services.forecast_grid import ForecastGrid
+from app.services.trend_forecasting import forecast_demand
+from app.services.embedding_backends import backend_module, load_embedding_backend
+from app.services.model_artifacts import load_artifact
+from app.services.inference_executor import (
+    InferenceExecutor,
+    limit_torch_threads,
+    loaded_model,
+    register_loader,
+    register_model,
+    unregister_models,
+    worker_model,
+)
 from app.schemas import (
     UserContext,
     MarketSignal,
@@ -23,98 +49,289 @@ from app.schemas import (
 logger = structlog.get_logger()
 
 
+# Trained artifacts under MODEL_PATH, by model name
+MODEL_ARTIFACTS = {
+    "recommendation": "recommendation_ranker.pkl",
+    "skill_gap": "skill_gap_analyzer.pkl",
+    "trend": "trend_forecaster.pkl",
+}
+
+# ModelService attribute holding each model
+MODEL_ATTRS = {
+    "embedding": "embedding_model",
+    "recommendation": "recommendation_model",
+    "skill_gap": "skill_gap_model",
+    "trend": "trend_model",
+}
+
+# Models loaded at startup for each deployment role; the rest load on
+# first use. Pods serving only /ai/* routes start without torch. Trend
+# forecasts are fitted from market demand history, so the trend artifact
+# is never needed up front.
+ROLE_EAGER_MODELS = {
+    "all": ["embedding", "recommendation", "skill_gap"],
+    "recommendations": ["embedding", "recommendation", "skill_gap"],
+    "ai": [],
+}
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _mb(n_bytes: int) -> float:
+    return round(n_bytes / (1024 * 1024), 1)
+
+
+def discover_model_loaders(threads: int = 0) -> Dict[str, Tuple[str, Callable[[], Any]]]:
+    """
+    Loaders for every model this deployment can serve.
+    
+    Maps model name to (module the loader imports, loader).
+    """
+    loaders = {}
+    
+    backend = settings.EMBEDDING_BACKEND
+    module = backend_module(backend)
+    if module is not None:
+        # Check if GPU should be used
+        device = "cuda" if settings.USE_GPU else "cpu"
+        loaders["embedding"] = (
+            module,
+            functools.partial(
+                load_embedding_backend, backend, settings.EMBEDDING_MODEL, device, threads
+            ),
+        )
+    else:
+        logger.warning("Embedding backend not available, using fallback", backend=backend)
+    
+    for name, filename in MODEL_ARTIFACTS.items():
+        model_path = Path(settings.MODEL_PATH) / filename
+        if model_path.exists():
+            loaders[name] = ("joblib", functools.partial(load_artifact, model_path))
+        else:
+            logger.info("No pre-trained model found, using rule-based", model=name)
+    
+    return loaders
+
+
+def eager_models() -> List[str]:
+    """Models to load at startup for this deployment."""
+    if settings.EAGER_MODELS is not None:
+        return settings.EAGER_MODELS
+    return ROLE_EAGER_MODELS.get(settings.SERVICE_ROLE, ROLE_EAGER_MODELS["all"])
+
+
+def preload_models() -> List[str]:
+    """
+    Load this deployment's eager models into this process before workers fork.
+    
+    Forked workers inherit the loaded models and share their pages
+    copy-on-write; ModelService picks them up instead of loading again.
+    Lazy models are left to load on first use in each worker.
+    """
+    eager = eager_models()
+    loaded = []
+    for name, (_, loader) in discover_model_loaders().items():
+        if name in eager:
+            register_model(name, loader())
+            loaded.append(name)
+    
+    logger.info("Preloaded models before fork", models=loaded, rss_mb=_mb(_rss_bytes()))
+    return loaded
+
+
+def _encode_texts(texts: List[str]) -> np.ndarray:
+    """Encode one micro-batch with this process's embedding model."""
+    return worker_model("embedding").encode(texts)
+
+
 class ModelService:
     """Service for managing and running ML models."""
     
-    def __init__(self):
+    def __init__(self, executor: Optional[InferenceExecutor] = None):
         self.recommendation_model = None
         self.skill_gap_model = None
         self.trend_model = None
         self.embedding_model = None
-        self.content_embeddings = {}
-        self.skill_embeddings = {}
+        self.embedding_batcher: Optional[EmbeddingBatcher] = None
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        self.content_catalog = ContentCatalog()
+        self.market_demand = get_market_demand_table()
+        self.forecast_grid = ForecastGrid()
+        self.hashing_embedder = HashingEmbedder(settings.EMBEDDING_DIMENSION)
+        self.signal_store = (
+            SignalIndexStore(settings.REDIS_URL, window_days=settings.SIGNAL_INDEX_WINDOW_DAYS)
+            if settings.SIGNAL_INDEX_PERSIST else None
+        )
+        self.executor = executor or InferenceExecutor(
+            mode=settings.INFERENCE_EXECUTOR,
+            max_workers=settings.INFERENCE_WORKERS,
+            torch_threads=settings.INFERENCE_TORCH_THREADS,
+        )
+        # name -> (module imported by the loader, loader)
+        self._loaders: Dict[str, Tuple[str, Callable[[], Any]]] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._load_semaphore = asyncio.Semaphore(settings.MODEL_LOAD_CONCURRENCY)
+        self._startup: Dict[str, Any] = {}
+        self._model_timings: Dict[str, Dict[str, Any]] = {}
         self._initialized = False
     
     async def initialize(self) -> None:
         """Initialize and load ML models."""
-        logger.info("Initializing ML models")
+        logger.info("Initializing ML models", role=settings.SERVICE_ROLE)
+        started = time.perf_counter()
+        rss_before = _rss_bytes()
+        
+        # Cap intra-op threads before torch is imported
+        limit_torch_threads(self.executor.torch_threads)
         
         try:
-            # Load embedding model
-            await self._load_embedding_model()
+            self._loaders = discover_model_loaders(self.executor.torch_threads)
+            eager = [name for name in eager_models() if name in self._loaders]
+            
+            if "embedding" in self._loaders:
+                self._create_embedding_pipeline()
+            
+            if self.executor.mode == "process":
+                # Workers load eager models when they start, lazy ones on first use
+                for name, (_, loader) in self._loaders.items():
+                    handle = self.executor.add_worker_model(name, loader, eager=name in eager)
+                    setattr(self, MODEL_ATTRS[name], handle)
+            else:
+                for name, (_, loader) in self._loaders.items():
+                    register_loader(name, loader)
+                # Load eager artifacts concurrently
+                await asyncio.gather(*(self.ensure_model(name) for name in eager))
             
-            # Load recommendation model
-            await self._load_recommendation_model()
+            # Open the precomputed content catalog
+            await self._load_content_catalog()
             
-            # Load skill gap analysis model
-            await self._load_skill_gap_model()
+            # Batch workers have no lifespan refresh loop; load the snapshot once
+            if not self.market_demand.is_loaded:
+                await asyncio.to_thread(self.market_demand.load)
+            await asyncio.to_thread(self.forecast_grid.load)
             
-            # Load trend forecasting model
-            await self._load_trend_model()
+            # Start inference workers (process workers load their models here)
+            executor_started = time.perf_counter()
+            self.executor.start()
+            
+            self._startup = {
+                "role": settings.SERVICE_ROLE,
+                "eager": eager,
+                "lazy": [name for name in self._loaders if name not in eager],
+                "executor_start_ms": round((time.perf_counter() - executor_started) * 1000, 1),
+                "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                "rss_before_mb": _mb(rss_before),
+                "rss_after_mb": _mb(_rss_bytes()),
+            }
             
             self._initialized = True
-            logger.info("All ML models initialized successfully")
+            logger.info("All ML models initialized successfully", **self._startup)
             
         except Exception as e:
             logger.error("Failed to initialize ML models", error=str(e))
             # Continue with rule-based fallback
             self._initialized = True
     
-    async def _load_embedding_model(self) -> None:
-        """Load sentence transformer for embeddings."""
-        try:
-            from sentence_transformers import SentenceTransformer
-            model_name = settings.EMBEDDING_MODEL
-            
-            # Check if GPU should be used
-            device = "cuda" if settings.USE_GPU else "cpu"
-            
-            self.embedding_model = SentenceTransformer(model_name, device=device)
-            logger.info("Embedding model loaded", model=model_name, device=device)
-            
-        except ImportError:
-            logger.warning("sentence-transformers not available, using fallback")
-            self.embedding_model = None
+    def _create_embedding_pipeline(self) -> None:
+        """Set up batching and caching in front of the embedding model."""
+        self.embedding_batcher = EmbeddingBatcher(
+            _encode_texts,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            executor=self.executor,
+        )
+        if settings.ENABLE_CACHING:
+            self.embedding_cache = EmbeddingCache(
+                # Quantized backends produce slightly different vectors
+                namespace=f"{settings.EMBEDDING_MODEL}:{settings.EMBEDDING_BACKEND}",
+                max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+                dtype=settings.EMBEDDING_CACHE_DTYPE,
+                redis_url=settings.REDIS_URL,
+                ttl_seconds=settings.CACHE_TTL_SECONDS,
+            )
     
-    async def _load_recommendation_model(self) -> None:
-        """Load recommendation ranking model."""
-        model_path = Path(settings.MODEL_PATH) / "recommendation_ranker.pkl"
-        
-        if model_path.exists():
-            import joblib
-            self.recommendation_model = joblib.load(model_path)
-            logger.info("Recommendation model loaded", path=str(model_path))
-        else:
-            logger.info("No pre-trained recommendation model found, using rule-based")
+    async def ensure_model(self, name: str) -> Any:
+        """Return a model, loading it on first use. None if it is not deployed."""
+        attr = MODEL_ATTRS[name]
+        if getattr(self, attr) is not None or name not in self._loaders:
+            return getattr(self, attr)
+        
+        lock = self._load_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if getattr(self, attr) is None and name in self._loaders:
+                try:
+                    async with self._load_semaphore:
+                        model = await asyncio.to_thread(self._load_model, name)
+                    setattr(self, attr, model)
+                except Exception as e:
+                    logger.error("Failed to load model, using fallback", model=name, error=str(e))
+                    self._loaders.pop(name, None)
+                    self._model_timings[name] = {"status": "failed", "error": str(e)}
+        
+        return getattr(self, attr)
     
-    async def _load_skill_gap_model(self) -> None:
-        """Load skill gap analysis model."""
-        model_path = Path(settings.MODEL_PATH) / "skill_gap_analyzer.pkl"
-        
-        if model_path.exists():
-            import joblib
-            self.skill_gap_model = joblib.load(model_path)
-            logger.info("Skill gap model loaded", path=str(model_path))
-        else:
-            logger.info("No pre-trained skill gap model found, using rule-based")
+    def _load_model(self, name: str) -> Any:
+        """Import and load one model, recording its timings."""
+        preloaded = loaded_model(name)
+        if preloaded is not None:
+            # Inherited from a master process that preloaded before fork
+            self._model_timings[name] = {"status": "preloaded", "lazy": self._initialized}
+            return preloaded
+        
+        module, loader = self._loaders[name]
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        
+        importlib.import_module(module)
+        imported = time.perf_counter()
+        model = loader()
+        loaded = time.perf_counter()
+        register_model(name, model)
+        
+        # RSS deltas overlap when several models load at once
+        self._model_timings[name] = {
+            "status": "loaded",
+            "lazy": self._initialized,
+            "import_ms": round((imported - started) * 1000, 1),
+            "load_ms": round((loaded - imported) * 1000, 1),
+            "rss_delta_mb": _mb(_rss_bytes() - rss_before),
+        }
+        logger.info("Model loaded", model=name, **self._model_timings[name])
+        return model
     
-    async def _load_trend_model(self) -> None:
-        """Load trend forecasting model."""
-        model_path = Path(settings.MODEL_PATH) / "trend_forecaster.pkl"
-        
-        if model_path.exists():
-            import joblib
-            self.trend_model = joblib.load(model_path)
-            logger.info("Trend model loaded", path=str(model_path))
+    async def _load_content_catalog(self) -> None:
+        """Open the memory-mapped content catalog, if one has been built."""
+        if self.content_catalog.load():
+            logger.info(
+                "Content catalog opened",
+                version=self.content_catalog.version,
+                items=len(self.content_catalog),
+            )
         else:
-            logger.info("No pre-trained trend model found, using rule-based")
+            logger.info("No content catalog found, using template candidates")
     
     async def cleanup(self) -> None:
         """Cleanup resources."""
-        self.recommendation_model = None
-        self.skill_gap_model = None
-        self.trend_model = None
-        self.embedding_model = None
+        if self.embedding_batcher is not None:
+            await self.embedding_batcher.close()
+            self.embedding_batcher = None
+        if self.embedding_cache is not None:
+            await self.embedding_cache.close()
+            self.embedding_cache = None
+        if self.signal_store is not None:
+            await self.signal_store.close()
+        for attr in MODEL_ATTRS.values():
+            setattr(self, attr, None)
+        self.executor.shutdown()
+        unregister_models()
         logger.info("ML models cleaned up")
     
     @property
@@ -122,20 +339,55 @@ class ModelService:
         """Check if models are initialized."""
         return self._initialized
     
-    def get_embedding(self, text: str) -> np.ndarray:
+    async def get_embedding(self, text: str, fast: bool = False) -> np.ndarray:
         """Get embedding for a text string."""
-        if self.embedding_model is None:
-            # Return random embedding as fallback
-            return np.random.rand(settings.EMBEDDING_DIMENSION)
-        
-        return self.embedding_model.encode(text, convert_to_numpy=True)
+        return (await self.get_embeddings([text], fast=fast))[0]
     
-    def get_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Get embeddings for multiple texts."""
-        if self.embedding_model is None:
-            return np.random.rand(len(texts), settings.EMBEDDING_DIMENSION)
+    async def get_embeddings(self, texts: List[str], fast: bool = False) -> np.ndarray:
+        """
+        Get embeddings for multiple texts, encoding only cache misses.
         
-        return self.embedding_model.encode(texts, convert_to_numpy=True)
+        ``fast`` skips the model for the hashed n-gram tier, which is also
+        the fallback when no embedding model is available.
+        """
+        if not texts:
+            return np.empty((0, settings.EMBEDDING_DIMENSION), dtype=np.float32)
+        
+        if fast or await self.ensure_model("embedding") is None:
+            return self.hashing_embedder.encode(texts)
+        
+        if self.embedding_cache is None:
+            return await self.embedding_batcher.embed_many(texts)
+        
+        vectors = await self.embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = await self.embedding_batcher.embed_many(missing_texts)
+            await self.embedding_cache.put_many(missing_texts, encoded)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+        
+        return np.vstack(vectors)
+    
+    def startup_report(self) -> Dict[str, Any]:
+        """Startup timings plus per-model import/load time and RSS delta."""
+        return {**self._startup, "models": dict(self._model_timings)}
+    
+    def runtime_stats(self) -> Dict[str, Any]:
+        """Executor, batching and cache metrics for health reporting."""
+        return {
+            "embedding_backend": settings.EMBEDDING_BACKEND,
+            "inference_executor": self.executor.snapshot(),
+            "embedding_batcher": (
+                self.embedding_batcher.stats.snapshot() if self.embedding_batcher else None
+            ),
+            "embedding_cache": (
+                self.embedding_cache.snapshot() if self.embedding_cache else None
+            ),
+            "feature_store": get_feature_store().snapshot(),
+        }
     
     async def generate_recommendations(
         self,
@@ -146,30 +398,36 @@ class ModelService:
     ) -> List[RecommendationItem]:
         """Generate personalized recommendations."""
         
-        recommendations = []
-        
         # Build user profile features
         user_features = self._extract_user_features(user_context)
         
         # Get candidate content (would normally come from content catalog)
         candidates = await self._get_candidate_content(user_context, skill_gaps)
         
-        # Score each candidate
-        for candidate in candidates[:max_recommendations * 2]:  # Get more than needed for filtering
-            scores = await self._score_candidate(
-                candidate, 
-                user_features, 
-                skill_gaps,
-                market_signals
-            )
-            
-            if scores["overall"] >= settings.MIN_CONFIDENCE_THRESHOLD:
-                recommendation = self._create_recommendation(candidate, scores)
-                recommendations.append(recommendation)
+        # Index the signals once; scoring only looks skills up
+        signal_index = await self._signal_index(user_context, market_signals)
+        
+        # Score the whole candidate set at once and keep the top-k survivors
+        recommendation_model = await self.ensure_model("recommendation")
+        scorer = CandidateScorer(confidence=0.7 if recommendation_model else 0.5)
+        scores = await self.executor.run(
+            scorer.score,
+            candidates,
+            skill_gaps,
+            signal_index,
+            career_goals=user_features.get("career_goals"),
+        )
+        survivors = scorer.top_k(
+            scores,
+            k=max_recommendations,
+            min_score=settings.MIN_CONFIDENCE_THRESHOLD,
+        )
         
-        # Sort by overall score and limit
-        recommendations.sort(key=lambda x: x.overall_score, reverse=True)
-        return recommendations[:max_recommendations]
+        # Only materialize recommendation items for the survivors
+        return [
+            self._create_recommendation(candidates[index], survivors.scores_at(position))
+            for position, index in enumerate(survivors.indices)
+        ]
     
     def _extract_user_features(self, user_context: UserContext) -> Dict[str, Any]:
         """Extract features from user context."""
@@ -193,9 +451,34 @@ class ModelService:
         skill_gaps: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Get candidate content for recommendations."""
-        # In production, this would query a content catalog
-        # For now, generate synthetic candidates based on skill gaps
+        self.content_catalog.maybe_reload()
+        
+        if not self.content_catalog.is_loaded or await self.ensure_model("embedding") is None:
+            return self._get_template_candidates(skill_gaps)
+        
+        queries = await self._build_query_embeddings(user_context, skill_gaps)
+        results = self.content_catalog.search(queries, settings.CATALOG_CANDIDATES)
         
+        return [{**item, "similarity": similarity} for item, similarity in results]
+    
+    async def _build_query_embeddings(
+        self,
+        user_context: UserContext,
+        skill_gaps: List[Dict[str, Any]],
+    ) -> np.ndarray:
+        """Embed the user's gap skills and goals as catalog search queries."""
+        texts = [gap.get("skill_name", "General") for gap in skill_gaps[:10]]
+        texts.extend(user_context.career_goals)
+        if user_context.target_role:
+            texts.append(user_context.target_role)
+        
+        return await self.get_embeddings(texts or ["General"])
+    
+    def _get_template_candidates(
+        self,
+        skill_gaps: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Generate synthetic candidates from templates when no catalog is built."""
         candidates = []
         gap_skills = [gap.get("skill_name", "General") for gap in skill_gaps[:5]]
         
@@ -223,62 +506,6 @@ class ModelService:
         
         return candidates
     
-    async def _score_candidate(
-        self,
-        candidate: Dict[str, Any],
-        user_features: Dict[str, Any],
-        skill_gaps: List[Dict[str, Any]],
-        market_signals: List[MarketSignal],
-    ) -> Dict[str, float]:
-        """Score a candidate recommendation."""
-        
-        # Relevance score - based on skill gap match
-        relevance = 0.5  # Base relevance
-        candidate_skills = candidate.get("skill_ids", [])
-        
-        for gap in skill_gaps:
-            if gap.get("skill_name") in candidate_skills or gap.get("skill_id") in candidate_skills:
-                gap_score = gap.get("gap_score", 50) / 100
-                relevance = max(relevance, gap_score)
-        
-        # Urgency score - based on market signals
-        urgency = 0.3  # Base urgency
-        for signal in market_signals[-5:]:  # Recent signals
-            if any(skill in signal.skill_ids for skill in candidate_skills):
-                if signal.signal_type == "JOB_REJECTION":
-                    urgency = max(urgency, 0.9)
-                elif signal.signal_type == "JOB_APPLICATION":
-                    urgency = max(urgency, 0.7)
-        
-        # Impact score - based on career goals alignment
-        impact = 0.4
-        if user_features.get("career_goals"):
-            # Simple keyword matching for demo
-            title_lower = candidate.get("title", "").lower()
-            for goal in user_features["career_goals"]:
-                if goal.lower() in title_lower:
-                    impact = 0.8
-                    break
-        
-        # Confidence score - model confidence or rule certainty
-        confidence = 0.7 if self.recommendation_model else 0.5
-        
-        # Overall weighted score
-        overall = (
-            relevance * 0.35 +
-            urgency * 0.25 +
-            impact * 0.25 +
-            confidence * 0.15
-        )
-        
-        return {
-            "relevance": relevance,
-            "urgency": urgency,
-            "impact": impact,
-            "confidence": confidence,
-            "overall": overall,
-        }
-    
     def _create_recommendation(
         self, 
         candidate: Dict[str, Any],
@@ -347,6 +574,7 @@ class ModelService:
         
         gaps = []
         user_skills = {s.skill_id: s.current_level for s in user_context.skills}
+        signal_index = await self._signal_index(user_context, market_signals)
         
         for target in target_skills:
             skill_id = target.get("skill_id", "")
@@ -359,7 +587,7 @@ class ModelService:
                 
                 # Determine priority based on gap and market signals
                 priority = self._calculate_gap_priority(
-                    gap_score, skill_id, market_signals
+                    gap_score, skill_id, signal_index
                 )
                 
                 gap_type = "MISSING" if current_level == 0 else "LEVEL_MISMATCH"
@@ -372,7 +600,7 @@ class ModelService:
                     current_level=current_level,
                     required_level=required_level,
                     gap_score=float(gap_score),
-                    market_demand_score=self._estimate_market_demand(skill_id),
+                    market_demand_score=self._estimate_market_demand(skill_id, skill_name),
                     career_impact=self._assess_career_impact(skill_name, gap_score),
                     recommended_actions=self._get_recommended_actions(gap_type, gap_score),
                 ))
@@ -383,19 +611,28 @@ class ModelService:
         
         return gaps
     
+    async def _signal_index(
+        self,
+        user_context: UserContext,
+        market_signals: List[MarketSignal],
+    ) -> SignalIndex:
+        """Index the request's signals, or fold them into the user's rolling index."""
+        if self.signal_store is None:
+            return SignalIndex.build(market_signals)
+        return await self.signal_store.update(
+            user_context.tenant_id, user_context.user_id, market_signals
+        )
+    
     def _calculate_gap_priority(
         self,
         gap_score: float,
         skill_id: str,
-        market_signals: List[MarketSignal],
+        signal_index: SignalIndex,
     ) -> GapPriority:
         """Calculate priority for a skill gap."""
         
         # Check if skill appears in recent rejections
-        rejection_mentions = sum(
-            1 for s in market_signals 
-            if s.signal_type == "JOB_REJECTION" and skill_id in s.skill_ids
-        )
+        rejection_mentions = signal_index.count(skill_id, "JOB_REJECTION")
         
         if rejection_mentions >= 2 or gap_score >= 70:
             return GapPriority.CRITICAL
@@ -405,10 +642,12 @@ class ModelService:
             return GapPriority.MEDIUM
         return GapPriority.LOW
     
-    def _estimate_market_demand(self, skill_id: str) -> float:
-        """Estimate market demand for a skill."""
-        # In production, this would query actual market data
-        return np.random.uniform(60, 95)
+    def _estimate_market_demand(self, skill_id: str, skill_name: str) -> float:
+        """Market demand for a skill from the shared demand table."""
+        score = self.market_demand.score(skill_id)
+        if score is None:
+            score = self.market_demand.score(skill_name)
+        return score if score is not None else NEUTRAL_DEMAND_SCORE
     
     def _assess_career_impact(self, skill_name: str, gap_score: float) -> str:
         """Assess career impact of filling the gap."""
@@ -440,44 +679,79 @@ class ModelService:
         periods_ahead: int = 12,
     ) -> TrendForecast:
         """Forecast skill demand trend."""
-        
-        # Generate synthetic forecast data for demo
-        current_demand = np.random.uniform(50, 90)
-        
-        # Simple linear trend with noise
-        trend_slope = np.random.uniform(-0.02, 0.05)  # Monthly change rate
-        forecasts = []
-        
-        for i in range(1, periods_ahead + 1):
-            predicted = current_demand * (1 + trend_slope * i)
-            predicted = max(0, min(100, predicted))  # Clamp to 0-100
+        forecasts = await self.forecast_trends([skill_id], periods_ahead)
+        return forecasts[0]
+    
+    async def forecast_trends(
+        self,
+        skill_ids: List[str],
+        periods_ahead: int = 12,
+    ) -> List[TrendForecast]:
+        """
+        Forecast demand for many skills in one pass.
+        
+        Skills in the nightly forecast grid are served from it directly.
+        The rest are fitted on demand, together, from the market demand
+        history (see ``forecast_demand``).
+        """
+        self.forecast_grid.maybe_reload()
+        found, cached = self.forecast_grid.lookup(skill_ids, periods_ahead)
+        
+        point = np.empty((len(skill_ids), periods_ahead))
+        lower, upper = np.empty_like(point), np.empty_like(point)
+        current, confidence = np.empty(len(skill_ids)), np.empty(len(skill_ids))
+        
+        parts = [(found, cached)]
+        if not found.all():
+            missing = [skill_id for skill_id, hit in zip(skill_ids, found) if not hit]
+            history, scores = self.market_demand.history(missing)
+            parts.append((~found, forecast_demand(history, scores, periods_ahead)))
+        
+        for mask, forecast in parts:
+            if forecast is None:
+                continue
+            point[mask] = forecast.point
+            lower[mask] = forecast.lower
+            upper[mask] = forecast.upper
+            current[mask] = forecast.current
+            confidence[mask] = forecast.confidence
+        
+        point, lower, upper = (np.round(a, 2).tolist() for a in (point, lower, upper))
+        results = []
+        
+        for i, skill_id in enumerate(skill_ids):
+            forecasts = [
+                {
+                    "period": period + 1,
+                    "predicted_demand": point[i][period],
+                    "lower_bound": lower[i][period],
+                    "upper_bound": upper[i][period],
+                }
+                for period in range(periods_ahead)
+            ]
             
-            forecasts.append({
-                "period": i,
-                "predicted_demand": round(predicted, 2),
-                "lower_bound": round(predicted * 0.85, 2),
-                "upper_bound": round(min(100, predicted * 1.15), 2),
-            })
-        
-        # Determine trend direction
-        final_demand = forecasts[-1]["predicted_demand"]
-        if final_demand > current_demand * 1.1:
-            direction = TrendDirection.RISING
-        elif final_demand < current_demand * 0.9:
-            direction = TrendDirection.DECLINING
-        else:
-            direction = TrendDirection.STABLE
-        
-        return TrendForecast(
-            skill_id=skill_id,
-            current_demand_score=round(current_demand, 2),
-            forecasts=forecasts,
-            trend_direction=direction,
-            confidence=0.7 if self.trend_model else 0.5,
-            factors=[
-                "Job posting volume",
-                "Application competition",
-                "Rate trends",
-                "Related skill growth",
-            ],
-        )
+            # Determine trend direction
+            current_demand = float(current[i])
+            final_demand = point[i][-1]
+            if final_demand > current_demand * 1.1:
+                direction = TrendDirection.RISING
+            elif final_demand < current_demand * 0.9:
+                direction = TrendDirection.DECLINING
+            else:
+                direction = TrendDirection.STABLE
+            
+            results.append(TrendForecast(
+                skill_id=skill_id,
+                current_demand_score=round(current_demand, 2),
+                forecasts=forecasts,
+                trend_direction=direction,
+                confidence=round(float(confidence[i]), 2),
+                factors=[
+                    "Job posting volume",
+                    "Application competition",
+                    "Rate trends",
+                    "Related skill growth",
+                ],
+            ))
+        
+        return results
@@ -0,0 +1,448 @@
+"""
+Rate Cube - Columnar bid history with precomputed rollups.
+
+Every bid outcome is one row per skill of the job, held as NumPy columns
+with the skill, experience level and location dictionary-encoded to
+small integer codes. Rollups are precomputed per skill for each
+(level, location) cell, including the "any level" and "any location"
+margins, so a benchmark, a comparison across skills or a breakdown by
+location or level is a dictionary probe into a stats row.
+
+Rows recorded since the last rebuild are queued and folded in by
+``rebuild``, which recomputes only the skills they touch. The
+``RateCubeBuilder`` job appends outcomes from ``RATE_CUBE_LATE_ARRIVAL_HOURS``
+before the cube's watermark onwards, skipping the ids it already counted,
+and publishes the result to ``RATE_CUBE_PATH``; serving workers reload it
+and replay their own rows that are newer than the published watermark.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.market_demand import skill_key
+
+logger = structlog.get_logger()
+
+SNAPSHOT_FILE = "rate_cube.npz"
+
+# Code of the "any" member in rollup cells
+ANY = -1
+
+# Percentiles of accepted rates kept per cell
+CUBE_PERCENTILES = np.array([0.25, 0.50, 0.75, 0.90])
+
+# Trend: mean accepted rate in the last window vs the one before it
+TREND_WINDOW_SECONDS = 90 * 86400
+MIN_TREND_SAMPLES = 5
+
+# Columns of a rollup stats row
+_COUNT, _WINS, _MEAN, _P25, _P50, _P75, _P90, _TREND = range(8)
+
+# Queued row: skill, level, location, rate, won, timestamp
+_Row = Tuple[str, str, str, float, bool, float]
+
+
+class _Dictionary:
+    """Dictionary encoding of one dimension's values."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = list(values)
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(self.values)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+@dataclass
+class RateSlice:
+    """Rollup of one (skill, level, location) cell; None dimensions mean any."""
+    skill: str
+    experience_level: Optional[str]
+    location: Optional[str]
+    bids: int
+    accepted: int
+    win_rate: float
+    mean_rate: Optional[float]
+    percentile_25: Optional[float]
+    percentile_50: Optional[float]
+    percentile_75: Optional[float]
+    percentile_90: Optional[float]
+    trend: Optional[float]  # relative change of the mean accepted rate
+
+
+def _rollup(
+    skill: np.ndarray,
+    level: np.ndarray,
+    location: np.ndarray,
+    rate: np.ndarray,
+    won: np.ndarray,
+    timestamp: np.ndarray,
+    now: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stats for every cell the rows fall into.
+
+    Returns the skill, level and location code of each cell (ANY for a
+    margin) and its stats row.
+    """
+    # Each row counts towards its exact cell and the three margins
+    n = len(rate)
+    any_code = np.full(n, ANY, dtype=np.int64)
+    cell_level = np.concatenate([level, any_code, level, any_code])
+    cell_location = np.concatenate([location, location, any_code, any_code])
+    n_levels = int(level.max()) + 2
+    n_locations = int(location.max()) + 2
+    key = (np.tile(skill.astype(np.int64), 4) * n_levels + cell_level + 1) * n_locations + cell_location + 1
+    rate, won, timestamp = np.tile(rate, 4), np.tile(won, 4), np.tile(timestamp, 4)
+
+    cells, group = np.unique(key, return_inverse=True)
+    stats = np.full((len(cells), 8), np.nan)
+    stats[:, _COUNT] = np.bincount(group, minlength=len(cells))
+    stats[:, _WINS] = np.bincount(group, weights=won, minlength=len(cells))
+
+    # Percentiles, mean and trend of accepted rates
+    accepted_group, accepted_rate = group[won], rate[won].astype(np.float64)
+    accepted_time = timestamp[won]
+    if len(accepted_rate):
+        order = np.lexsort((accepted_rate, accepted_group))
+        accepted_group, accepted_rate = accepted_group[order], accepted_rate[order]
+        accepted_time = accepted_time[order]
+
+        wins = stats[:, _WINS].astype(np.int64)
+        has_wins = wins > 0
+        starts = np.searchsorted(accepted_group, np.arange(len(cells)))
+        last = starts + np.maximum(wins, 1) - 1
+        position = starts[:, None] + CUBE_PERCENTILES * (np.maximum(wins, 1) - 1)[:, None]
+        low = np.minimum(np.floor(position).astype(np.int64), len(accepted_rate) - 1)
+        high = np.minimum(np.minimum(low + 1, last[:, None]), len(accepted_rate) - 1)
+        fraction = position - low
+        percentiles = accepted_rate[low] * (1 - fraction) + accepted_rate[high] * fraction
+        stats[has_wins, _P25:_P90 + 1] = percentiles[has_wins]
+
+        totals = np.bincount(accepted_group, weights=accepted_rate, minlength=len(cells))
+        stats[has_wins, _MEAN] = totals[has_wins] / wins[has_wins]
+
+        recent = accepted_time >= now - TREND_WINDOW_SECONDS
+        prior = ~recent & (accepted_time >= now - 2 * TREND_WINDOW_SECONDS)
+        windows = []
+        for mask in (recent, prior):
+            count = np.bincount(accepted_group, weights=mask, minlength=len(cells))
+            total = np.bincount(accepted_group, weights=accepted_rate * mask, minlength=len(cells))
+            windows.append((count, total / np.maximum(count, 1)))
+        (recent_count, recent_mean), (prior_count, prior_mean) = windows
+        trending = (recent_count >= MIN_TREND_SAMPLES) & (prior_count >= MIN_TREND_SAMPLES)
+        stats[trending, _TREND] = recent_mean[trending] / prior_mean[trending] - 1
+
+    cell_location = cells % n_locations - 1
+    rest = cells // n_locations
+    return rest // n_levels, rest % n_levels - 1, cell_location, stats
+
+
+class RateCube:
+    """In-memory rate cube with incremental rollups and snapshot reload."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.RATE_CUBE_PATH)
+        self._reset()
+        # Rows recorded in this process, replayed over newer snapshots
+        self._live: List[_Row] = []
+        self._snapshot_mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _reset(self) -> None:
+        self.skills = _Dictionary()
+        self.levels = _Dictionary()
+        self.locations = _Dictionary()
+        self._skill = np.empty(0, dtype=np.int32)
+        self._level = np.empty(0, dtype=np.int32)
+        self._location = np.empty(0, dtype=np.int32)
+        self._rate = np.empty(0, dtype=np.float32)
+        self._won = np.empty(0, dtype=bool)
+        self._timestamp = np.empty(0, dtype=np.float64)
+        self._pending: List[_Row] = []
+        # skill code -> ({(level, location): stats row}, stats)
+        self._rollups: Dict[int, Tuple[Dict[Tuple[int, int], int], np.ndarray]] = {}
+        self.watermark = 0.0
+        # Outcome id -> time of the outcomes counted within the late-arrival window
+        self.outcome_ids: Dict[str, float] = {}
+        self.updated_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._rate)
+
+    # -------------------------------------------------------------------------
+    # INGEST
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        skills: List[str],
+        rate: float,
+        won: bool,
+        experience_level: str = "mid",
+        location: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        live: bool = True,
+    ) -> None:
+        """Queue one bid outcome; it is counted from the next ``rebuild``."""
+        if not rate > 0:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        level = experience_level.strip().lower()
+        location = (location or "").strip().lower()
+        rows = [
+            (skill_key(skill), level, location, float(rate), bool(won), timestamp)
+            for skill in dict.fromkeys(skills)
+        ]
+        self._pending.extend(rows)
+        if live:
+            self._live.extend(rows)
+
+    def rebuild(self) -> int:
+        """Fold queued rows into the columns and refresh their skills' rollups."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+
+        skill, level, location, rate, won, timestamp = zip(*pending)
+        self._skill = np.concatenate([self._skill, [self.skills.encode(s) for s in skill]]).astype(np.int32)
+        self._level = np.concatenate([self._level, [self.levels.encode(v) for v in level]]).astype(np.int32)
+        self._location = np.concatenate(
+            [self._location, [self.locations.encode(v) for v in location]]
+        ).astype(np.int32)
+        self._rate = np.concatenate([self._rate, rate]).astype(np.float32)
+        self._won = np.concatenate([self._won, won]).astype(bool)
+        self._timestamp = np.concatenate([self._timestamp, timestamp])
+
+        touched = np.unique(self._skill[-len(pending):])
+        self._refresh_rollups(touched)
+        return len(pending)
+
+    def _refresh_rollups(self, skills: Optional[np.ndarray] = None) -> None:
+        """Recompute rollups for ``skills`` (all when None) from the columns."""
+        rows = slice(None) if skills is None else np.isin(self._skill, skills)
+        if not len(self._rate):
+            self._rollups = {}
+            return
+
+        cell_skill, cell_level, cell_location, stats = _rollup(
+            self._skill[rows], self._level[rows], self._location[rows],
+            self._rate[rows], self._won[rows], self._timestamp[rows],
+            now=time.time(),
+        )
+
+        rollups = {} if skills is None else dict(self._rollups)
+        bounds = np.flatnonzero(np.diff(cell_skill)) + 1
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(cell_skill)]):
+            cells = {
+                (int(lv), int(loc)): i
+                for i, (lv, loc) in enumerate(zip(cell_level[start:end], cell_location[start:end]))
+            }
+            rollups[int(cell_skill[start])] = (cells, stats[start:end])
+        # Single reference swap; queries in flight keep the old rollups
+        self._rollups = rollups
+        self.updated_at = datetime.utcnow()
+
+    # -------------------------------------------------------------------------
+    # QUERY
+    # -------------------------------------------------------------------------
+
+    def slice(
+        self,
+        skill: str,
+        experience_level: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Optional[RateSlice]:
+        """Rollup for one skill, optionally narrowed to a level and/or location."""
+        code = self.skills.codes.get(skill_key(skill))
+        rollup = self._rollups.get(code)
+        if rollup is None:
+            return None
+        level = ANY if experience_level is None else self.levels.codes.get(experience_level.strip().lower())
+        place = ANY if location is None else self.locations.codes.get(location.strip().lower())
+        if level is None or place is None:
+            return None
+
+        cells, stats = rollup
+        row = cells.get((level, place))
+        return None if row is None else self._slice(code, level, place, stats[row])
+
+    def compare(
+        self,
+        skills: List[str],
+        experience_level: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> Dict[str, Optional[RateSlice]]:
+        return {skill: self.slice(skill, experience_level, location) for skill in dict.fromkeys(skills)}
+
+    def by_location(self, skill: str, experience_level: Optional[str] = None) -> Dict[str, RateSlice]:
+        """Rollups of a skill for each location (optionally at one level)."""
+        return self._breakdown(skill, experience_level, axis=1)
+
+    def by_experience(self, skill: str, location: Optional[str] = None) -> Dict[str, RateSlice]:
+        """Rollups of a skill for each experience level (optionally in one location)."""
+        return self._breakdown(skill, location, axis=0)
+
+    def _breakdown(self, skill: str, fixed: Optional[str], axis: int) -> Dict[str, RateSlice]:
+        code = self.skills.codes.get(skill_key(skill))
+        rollup = self._rollups.get(code)
+        fixed_dictionary = self.locations if axis == 0 else self.levels
+        fixed_code = ANY if fixed is None else fixed_dictionary.codes.get(fixed.strip().lower())
+        if rollup is None or fixed_code is None:
+            return {}
+
+        names = (self.levels if axis == 0 else self.locations).values
+        cells, stats = rollup
+        breakdown = {}
+        for cell, row in cells.items():
+            member, other = cell[axis], cell[1 - axis]
+            if member != ANY and other == fixed_code:
+                breakdown[names[member]] = self._slice(code, *cell, stats[row])
+        return breakdown
+
+    def _slice(self, skill: int, level: int, location: int, stats: np.ndarray) -> RateSlice:
+        def value(column: int) -> Optional[float]:
+            return None if np.isnan(stats[column]) else float(stats[column])
+
+        return RateSlice(
+            skill=self.skills.values[skill],
+            experience_level=None if level == ANY else self.levels.values[level],
+            location=None if location == ANY else self.locations.values[location],
+            bids=int(stats[_COUNT]),
+            accepted=int(stats[_WINS]),
+            win_rate=float(stats[_WINS] / stats[_COUNT]),
+            mean_rate=value(_MEAN),
+            percentile_25=value(_P25),
+            percentile_50=value(_P50),
+            percentile_75=value(_P75),
+            percentile_90=value(_P90),
+            trend=value(_TREND),
+        )
+
+    # -------------------------------------------------------------------------
+    # PERSISTENCE
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Publish the columns (queued rows included) as the current snapshot."""
+        self.rebuild()
+        root = Path(path) if path else self.path
+        root.mkdir(parents=True, exist_ok=True)
+
+        # Ids are only needed to dedupe outcomes the builder may see again
+        watermark = float(self._timestamp.max()) if len(self._timestamp) else 0.0
+        horizon = watermark - settings.RATE_CUBE_LATE_ARRIVAL_HOURS * 3600
+        self.outcome_ids = {key: t for key, t in self.outcome_ids.items() if t >= horizon}
+
+        tmp = root / f".{SNAPSHOT_FILE}.{os.getpid()}"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                skills=np.array(self.skills.values, dtype=str),
+                levels=np.array(self.levels.values, dtype=str),
+                locations=np.array(self.locations.values, dtype=str),
+                skill=self._skill,
+                level=self._level,
+                location=self._location,
+                rate=self._rate,
+                won=self._won,
+                timestamp=self._timestamp,
+                outcome_ids=np.array(list(self.outcome_ids), dtype=str),
+                outcome_times=np.array(list(self.outcome_ids.values()), dtype=np.float64),
+            )
+        os.replace(tmp, root / SNAPSHOT_FILE)
+        self._live = []
+
+    def load(self) -> bool:
+        """Swap in a newer published snapshot. Returns True on swap."""
+        snapshot = self.path / SNAPSHOT_FILE
+        try:
+            mtime = snapshot.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._snapshot_mtime:
+            return False
+
+        with np.load(snapshot) as data:
+            self._reset()
+            self.skills = _Dictionary(data["skills"].tolist())
+            self.levels = _Dictionary(data["levels"].tolist())
+            self.locations = _Dictionary(data["locations"].tolist())
+            self._skill = data["skill"]
+            self._level = data["level"]
+            self._location = data["location"]
+            self._rate = data["rate"]
+            self._won = data["won"]
+            self._timestamp = data["timestamp"]
+            if "outcome_ids" in data:
+                self.outcome_ids = dict(zip(data["outcome_ids"].tolist(), data["outcome_times"].tolist()))
+        self.watermark = float(self._timestamp.max()) if len(self._timestamp) else 0.0
+        self._snapshot_mtime = mtime
+
+        # Replay this process's rows the snapshot does not include yet
+        self._live = [row for row in self._live if row[-1] > self.watermark]
+        self._pending = list(self._live)
+        self._refresh_rollups()
+        self.rebuild()
+        logger.info("Rate cube loaded", rows=len(self), skills=len(self.skills))
+        return True
+
+    async def _refresh_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not self.load():
+                    self.rebuild()
+            except Exception as e:
+                logger.error("Rate cube refresh failed", error=str(e))
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """Load now and keep the cube current in the background."""
+        self.load()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._refresh_loop(interval or settings.RATE_CUBE_REFRESH_SECONDS)
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def outcome_timestamp(value) -> float:
+    """Epoch seconds of a stored outcome time (datetime or ISO string)."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # Stored times are naive UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+_rate_cube: Optional[RateCube] = None
+
+
+def get_rate_cube() -> RateCube:
+    """Get the process-wide rate cube."""
+    global _rate_cube
+    if _rate_cube is None:
+        _rate_cube = RateCube()
+    return _rate_cube
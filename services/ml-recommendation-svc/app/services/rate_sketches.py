@@ -0,0 +1,648 @@
+"""
+Rate Sketches - Streaming market rate percentiles.
+
+Accepted rates reported through ``/ai/rate/feedback`` are folded into a
+t-digest per (skill, experience level, location). A t-digest keeps a few
+dozen weighted centroids, packed tightly near the tails, so percentiles
+come from a short interpolation instead of a sort over every historical
+bid. For the reported 25th-90th percentiles the error stays well under
+a percent, from a digest of about 400 bytes.
+
+Digests are mergeable: the digest of two shards is the merge of their
+digests. Every worker (shard) records into its own digests and persists
+them under its own name, either as a field of a per-key Redis hash or as
+its own file under ``RATE_SKETCH_PATH``. Readers merge every shard's
+digest into the view they serve from, so no shard ever rewrites
+another's data.
+
+Shard names are stable: ``RATE_SKETCH_SHARD``, or the hostname plus the
+gunicorn worker index. A restarted worker adopts its predecessor's
+digests instead of starting a new shard. Shards that stay silent for
+``RATE_SKETCH_SHARD_TTL_HOURS`` (retired hosts, pre-upgrade pid-named
+shards) are folded into a single compacted shard, so the number of
+shards stays bounded by the live workers.
+"""
+
+import asyncio
+import math
+import os
+import socket
+import struct
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.market_demand import skill_key
+from app.services.redis_client import LazyRedis
+
+logger = structlog.get_logger()
+
+# Centroid budget; a digest holds at most about compression / 2 centroids
+DEFAULT_COMPRESSION = 100
+
+# Values buffered before they are merged into the centroids
+BUFFER_FACTOR = 5
+
+# Serialized layout: version, compression, count, min, max, centroids
+_HEADER = struct.Struct("<BHdddI")
+_FORMAT_VERSION = 1
+
+# Percentiles reported as market rates
+MARKET_PERCENTILES = (0.25, 0.50, 0.75, 0.90)
+
+# Shard that stale shards are folded into
+COMPACTED_SHARD = "_compacted"
+COMPACT_LOCK = ".compact.lock"
+
+# Optimistic transaction attempts per compacted Redis hash
+COMPACT_RETRIES = 5
+
+SketchKey = Tuple[str, str, str]
+
+
+def sketch_key(skill: str, experience_level: str = "mid", location: Optional[str] = None) -> SketchKey:
+    """Normalized (skill, experience level, location) key."""
+    return skill_key(skill), experience_level.strip().lower(), (location or "").strip().lower()
+
+
+def default_shard() -> str:
+    """This worker's shard name; stable across restarts of the worker."""
+    if settings.RATE_SKETCH_SHARD:
+        return settings.RATE_SKETCH_SHARD
+    host = socket.gethostname()
+    # Set per worker by gunicorn.conf.py; a single-process server has one shard
+    worker = os.environ.get("WORKER_INDEX")
+    return f"{host}-w{worker}" if worker is not None else host
+
+
+def _compress(means: np.ndarray, weights: np.ndarray, compression: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge sorted centroids so each spans at most one unit of the k1 scale.
+
+    k1(q) = compression / (2 pi) * asin(2q - 1) is steep near q = 0 and 1,
+    so centroids stay small in the tails and grow towards the median.
+    """
+    order = np.argsort(means, kind="mergesort")
+    means, weights = means[order], weights[order]
+
+    cumulative = np.cumsum(weights)
+    q = (cumulative - weights / 2) / cumulative[-1]
+    k = np.floor(compression / (2 * math.pi) * np.arcsin(2 * q - 1))
+
+    starts = np.flatnonzero(np.concatenate(([True], k[1:] != k[:-1])))
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_means = np.add.reduceat(means * weights, starts) / merged_weights
+    return merged_means, merged_weights
+
+
+class TDigest:
+    """Mergeable quantile sketch (merging t-digest with the k1 scale)."""
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+        self._buffer_means: List[float] = []
+        self._buffer_weights: List[float] = []
+
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._means)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self._buffer_means.append(value)
+        self._buffer_weights.append(weight)
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._buffer_means) >= BUFFER_FACTOR * self.compression:
+            self._flush()
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "TDigest") -> None:
+        """Fold another digest into this one."""
+        if not other.count:
+            return
+        other._flush()
+        self._buffer_means.extend(other._means.tolist())
+        self._buffer_weights.extend(other._weights.tolist())
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._flush()
+
+    @classmethod
+    def merged(cls, digests: Iterable["TDigest"], compression: int = DEFAULT_COMPRESSION) -> "TDigest":
+        result = cls(compression)
+        for digest in digests:
+            result.merge(digest)
+        return result
+
+    def _flush(self) -> None:
+        if not self._buffer_means:
+            return
+        self._means, self._weights = _compress(
+            np.concatenate([self._means, self._buffer_means]),
+            np.concatenate([self._weights, self._buffer_weights]),
+            self.compression,
+        )
+        self._buffer_means = []
+        self._buffer_weights = []
+
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """Estimated values at the quantiles ``qs`` (NaN when empty)."""
+        qs = np.asarray(list(qs), dtype=np.float64)
+        if not self.count:
+            return np.full(len(qs), np.nan)
+        self._flush()
+
+        # Interpolate between centroid midpoints, pinned to the exact min / max
+        positions = np.cumsum(self._weights) - self._weights / 2
+        x = np.concatenate(([0.0], positions, [self.count]))
+        y = np.concatenate(([self.min], self._means, [self.max]))
+        return np.interp(np.clip(qs, 0, 1) * self.count, x, y)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    # -------------------------------------------------------------------------
+    # SERIALIZATION
+    # -------------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        self._flush()
+        header = _HEADER.pack(
+            _FORMAT_VERSION, self.compression, self.count, self.min, self.max, len(self._means)
+        )
+        return (
+            header
+            + self._means.astype(np.float32).tobytes()
+            + self._weights.astype(np.float32).tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> "TDigest":
+        version, compression, count, low, high, n = _HEADER.unpack_from(payload)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported t-digest format {version}")
+        body = np.frombuffer(payload, dtype=np.float32, count=2 * n, offset=_HEADER.size)
+
+        digest = cls(compression)
+        digest.count, digest.min, digest.max = count, low, high
+        digest._means = body[:n].astype(np.float64)
+        digest._weights = body[n:].astype(np.float64)
+        return digest
+
+
+def _write_shard_file(path: Path, digests: Dict[SketchKey, bytes], absorbed: Iterable[str] = ()) -> None:
+    """Atomically write a shard's serialized digests."""
+    tmp = path.with_name(f".{path.stem}.tmp.npz")
+    np.savez(
+        tmp,
+        keys=np.array(["|".join(key) for key in digests], dtype=str),
+        offsets=np.cumsum([0] + [len(blob) for blob in digests.values()]),
+        data=np.frombuffer(b"".join(digests.values()), dtype=np.uint8),
+        absorbed=np.array(list(absorbed), dtype=str),
+    )
+    os.replace(tmp, path)
+
+
+def _read_shard_file(path: Path) -> Dict[SketchKey, TDigest]:
+    """Digests of a shard file; empty when there is none."""
+    if not path.exists():
+        return {}
+    with np.load(path) as payload:
+        data = payload["data"].tobytes()
+        offsets = payload["offsets"]
+        return {
+            tuple(name.split("|")): TDigest.from_bytes(data[offsets[i]:offsets[i + 1]])
+            for i, name in enumerate(payload["keys"].tolist())
+        }
+
+
+@dataclass
+class RatePercentiles:
+    """Market rate percentiles answered from a sketch."""
+    percentile_25: float
+    percentile_50: float
+    percentile_75: float
+    percentile_90: float
+    sample_size: int
+    last_updated: datetime
+
+
+class RateSketchStore:
+    """
+    Per-(skill, level, location) rate digests for this shard, plus the
+    merged view across all shards that lookups are served from.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        path: Optional[str] = None,
+        shard: Optional[str] = None,
+        key_prefix: str = "ratesketch:",
+        compression: int = DEFAULT_COMPRESSION,
+    ):
+        self.path = Path(path or settings.RATE_SKETCH_PATH)
+        self.shard = shard or default_shard()
+        self.key_prefix = key_prefix
+        self.compression = compression
+        self._redis = LazyRedis(redis_url, "rate_sketches")
+
+        # This shard's observations, and every other shard's, merged
+        self._local: Dict[SketchKey, TDigest] = {}
+        self._remote: Dict[SketchKey, TDigest] = {}
+        # remote + local; updated in place as values are recorded
+        self._view: Dict[SketchKey, TDigest] = {}
+        self._updated: Dict[SketchKey, datetime] = {}
+        self._dirty: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self._compacted_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    # -------------------------------------------------------------------------
+    # WRITE / READ
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        skills: List[str],
+        rate: float,
+        experience_level: str = "mid",
+        location: Optional[str] = None,
+    ) -> None:
+        """Fold one observed rate into the digest of each skill."""
+        if not rate > 0:
+            return
+        now = datetime.utcnow()
+        for skill in dict.fromkeys(skills):
+            key = sketch_key(skill, experience_level, location)
+            for digests in (self._local, self._view):
+                digest = digests.get(key)
+                if digest is None:
+                    digest = digests[key] = TDigest(self.compression)
+                digest.add(rate)
+            self._updated[key] = now
+            self._dirty.add(key)
+
+    def percentiles(
+        self,
+        skill: str,
+        experience_level: str = "mid",
+        location: Optional[str] = None,
+        min_samples: Optional[int] = None,
+    ) -> Optional[RatePercentiles]:
+        """Market rate percentiles, or None below ``min_samples`` observations."""
+        key = sketch_key(skill, experience_level, location)
+        digest = self._view.get(key)
+        threshold = settings.RATE_SKETCH_MIN_SAMPLES if min_samples is None else min_samples
+        if digest is None or digest.count < max(threshold, 1):
+            return None
+
+        p25, p50, p75, p90 = digest.quantiles(MARKET_PERCENTILES).tolist()
+        return RatePercentiles(
+            percentile_25=p25,
+            percentile_50=p50,
+            percentile_75=p75,
+            percentile_90=p90,
+            sample_size=int(digest.count),
+            last_updated=self._updated[key],
+        )
+
+    def _set_remote(self, remote: Dict[SketchKey, TDigest]) -> None:
+        """Swap in freshly loaded shards and rebuild the merged view."""
+        now = datetime.utcnow()
+        view: Dict[SketchKey, TDigest] = {}
+        for key in remote.keys() | self._local.keys():
+            view[key] = TDigest.merged(
+                [d for d in (remote.get(key), self._local.get(key)) if d is not None],
+                self.compression,
+            )
+            self._updated.setdefault(key, now)
+        self._remote, self._view = remote, view
+
+    # -------------------------------------------------------------------------
+    # PERSISTENCE
+    # -------------------------------------------------------------------------
+
+    def _redis_key(self, key: SketchKey) -> str:
+        return self.key_prefix + "|".join(key)
+
+    @property
+    def _heartbeat_key(self) -> str:
+        return self.key_prefix + "shards"
+
+    async def adopt(self) -> None:
+        """Take over the digests a previous worker persisted under this shard's name."""
+        client = self._redis.client()
+        if client is None:
+            own = await asyncio.to_thread(_read_shard_file, self.path / f"{self.shard}.npz")
+        else:
+            try:
+                names = sorted(k.decode() if isinstance(k, bytes) else k
+                               for k in await client.smembers(self.key_prefix + "keys"))
+                pipe = client.pipeline()
+                for name in names:
+                    pipe.hget(name, self.shard)
+                payloads = await pipe.execute()
+            except Exception as e:
+                self._redis.failed(e)
+                return
+            own = {
+                tuple(name[len(self.key_prefix):].split("|")): TDigest.from_bytes(payload)
+                for name, payload in zip(names, payloads)
+                if payload
+            }
+
+        for key, digest in own.items():
+            local = self._local.get(key)
+            if local is not None:
+                digest.merge(local)
+            self._local[key] = digest
+        if own:
+            logger.info("Rate sketch shard adopted", shard=self.shard, keys=len(own))
+
+    async def sync(self) -> None:
+        """Publish this shard's changed digests, then reload every other shard's."""
+        client = self._redis.client()
+        if client is None:
+            # Serialize on the event loop; only file IO runs in the thread
+            dirty, self._dirty = self._dirty, set()
+            local = {key: self._local[key].to_bytes() for key in self._local} if dirty else None
+            try:
+                remote = await asyncio.to_thread(self._sync_disk, local)
+            except Exception:
+                self._dirty |= dirty
+                raise
+            self._set_remote(remote)
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        try:
+            if self._local:
+                pipe = client.pipeline()
+                for key in dirty:
+                    pipe.hset(self._redis_key(key), self.shard, self._local[key].to_bytes())
+                if dirty:
+                    pipe.sadd(self.key_prefix + "keys", *(self._redis_key(key) for key in dirty))
+                # Written with the digests, so a shard with fields always has a heartbeat
+                pipe.hset(self._heartbeat_key, self.shard, time.time())
+                await pipe.execute()
+
+            names = sorted(k.decode() if isinstance(k, bytes) else k
+                           for k in await client.smembers(self.key_prefix + "keys"))
+            pipe = client.pipeline()
+            for name in names:
+                pipe.hgetall(name)
+            shards = await pipe.execute()
+        except Exception as e:
+            self._dirty |= dirty
+            self._redis.failed(e)
+            return
+
+        remote: Dict[SketchKey, TDigest] = {}
+        for name, fields in zip(names, shards):
+            key = tuple(name[len(self.key_prefix):].split("|"))
+            others = [
+                TDigest.from_bytes(payload)
+                for shard, payload in fields.items()
+                if (shard.decode() if isinstance(shard, bytes) else shard) != self.shard
+            ]
+            if others:
+                remote[key] = TDigest.merged(others, self.compression)
+        self._set_remote(remote)
+
+    def _sync_disk(self, local: Optional[Dict[SketchKey, bytes]]) -> Dict[SketchKey, TDigest]:
+        """Write this shard's file (if changed) and merge every other shard file."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        own = self.path / f"{self.shard}.npz"
+        if local is not None:
+            _write_shard_file(own, local)
+        elif own.exists():
+            # Heartbeat: a shard file's mtime is its last sync
+            os.utime(own)
+
+        shards: Dict[SketchKey, List[TDigest]] = {}
+        for file in self.path.glob("*.npz"):
+            if file.stem == self.shard or file.name.startswith("."):
+                continue
+            for key, digest in _read_shard_file(file).items():
+                shards.setdefault(key, []).append(digest)
+        return {
+            key: TDigest.merged(digests, self.compression)
+            for key, digests in shards.items()
+        }
+
+    # -------------------------------------------------------------------------
+    # COMPACTION
+    # -------------------------------------------------------------------------
+
+    async def compact(self) -> int:
+        """Fold shards silent for longer than the shard TTL into the compacted shard."""
+        cutoff = time.time() - settings.RATE_SKETCH_SHARD_TTL_HOURS * 3600
+        client = self._redis.client()
+        if client is None:
+            compacted = await asyncio.to_thread(self._compact_disk, cutoff)
+        else:
+            try:
+                compacted = await self._compact_redis(client, cutoff)
+            except Exception as e:
+                self._redis.failed(e)
+                return 0
+        if compacted:
+            logger.info("Rate sketch shards compacted", shards=compacted)
+        return compacted
+
+    async def _compact_redis(self, client, cutoff: float) -> int:
+        """
+        Move stale shards' fields into the compacted field, hash by hash.
+
+        Each hash is rewritten in a WATCH/MULTI transaction that also
+        watches the heartbeats, so a shard that wakes up (or appears) while
+        its hash is being compacted is never folded away.
+        """
+        from redis.exceptions import WatchError
+
+        def decode(value):
+            return value.decode() if isinstance(value, bytes) else value
+
+        names = sorted(decode(k) for k in await client.smembers(self.key_prefix + "keys"))
+        retired = set()
+        for name in names:
+            async with client.pipeline(transaction=True) as pipe:
+                for _ in range(COMPACT_RETRIES):
+                    try:
+                        await pipe.watch(name, self._heartbeat_key)
+                        heartbeats = {
+                            decode(k): float(v)
+                            for k, v in (await pipe.hgetall(self._heartbeat_key)).items()
+                        }
+                        fields = {decode(k): v for k, v in (await pipe.hgetall(name)).items()}
+                        # Shards without a heartbeat predate heartbeats; count them as stale
+                        stale = [
+                            shard for shard in fields
+                            if shard not in (COMPACTED_SHARD, self.shard)
+                            and heartbeats.get(shard, 0.0) < cutoff
+                        ]
+                        if not stale:
+                            break
+                        merged = TDigest.merged(
+                            [TDigest.from_bytes(fields[s]) for s in stale + [COMPACTED_SHARD] if s in fields],
+                            self.compression,
+                        )
+                        pipe.multi()
+                        pipe.hset(name, COMPACTED_SHARD, merged.to_bytes())
+                        pipe.hdel(name, *stale)
+                        await pipe.execute()
+                        retired.update(stale)
+                        break
+                    except WatchError:
+                        continue
+
+        heartbeats = {
+            decode(k): float(v) for k, v in (await client.hgetall(self._heartbeat_key)).items()
+        }
+        expired = [s for s, beat in heartbeats.items() if beat < cutoff and s != self.shard]
+        if expired:
+            await client.hdel(self._heartbeat_key, *expired)
+        return len(retired)
+
+    def _compact_disk(self, cutoff: float) -> int:
+        """
+        Merge stale shard files into the compacted file, under a lock file.
+
+        Stale files are first renamed out of the readers' view. The
+        compacted file records the renamed files it absorbed, so a
+        compaction interrupted after writing it only deletes them, and
+        one interrupted before merges them again.
+        """
+        if not self.path.is_dir():
+            return 0
+        lock = self.path / COMPACT_LOCK
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            if lock.stat().st_mtime < time.time() - settings.RATE_SKETCH_COMPACT_SECONDS:
+                # Left behind by a crashed compaction; the next round retries
+                lock.unlink(missing_ok=True)
+            return 0
+
+        try:
+            target = self.path / f"{COMPACTED_SHARD}.npz"
+            digests = _read_shard_file(target)
+            absorbed = set()
+            if target.exists():
+                with np.load(target) as payload:
+                    absorbed = set(payload["absorbed"].tolist())
+
+            moved = []
+            for file in self.path.glob(".*.compacting.npz"):
+                if file.name in absorbed:
+                    file.unlink()
+                else:
+                    moved.append(file)
+            for file in self.path.glob("*.npz"):
+                if (
+                    file.name.startswith(".")
+                    or file.stem in (self.shard, COMPACTED_SHARD)
+                    or file.stat().st_mtime >= cutoff
+                ):
+                    continue
+                aside = self.path / f".{file.stem}.{uuid.uuid4().hex[:8]}.compacting.npz"
+                os.rename(file, aside)
+                moved.append(aside)
+
+            if not moved:
+                return 0
+
+            for file in moved:
+                for key, digest in _read_shard_file(file).items():
+                    current = digests.get(key)
+                    if current is None:
+                        digests[key] = digest
+                    else:
+                        current.merge(digest)
+
+            _write_shard_file(
+                target,
+                {key: digest.to_bytes() for key, digest in digests.items()},
+                absorbed=[file.name for file in moved],
+            )
+            for file in moved:
+                file.unlink()
+            return len(moved)
+        finally:
+            lock.unlink(missing_ok=True)
+
+    # -------------------------------------------------------------------------
+    # LIFECYCLE
+    # -------------------------------------------------------------------------
+
+    async def _sync_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error("Rate sketch sync failed", error=str(e))
+
+            if time.monotonic() - self._compacted_at >= settings.RATE_SKETCH_COMPACT_SECONDS:
+                self._compacted_at = time.monotonic()
+                try:
+                    await self.compact()
+                except Exception as e:
+                    logger.error("Rate sketch compaction failed", error=str(e))
+
+    async def start(self, interval: Optional[float] = None) -> None:
+        """Adopt this shard, load the others now and keep syncing in the background."""
+        try:
+            await self.adopt()
+            await self.sync()
+        except Exception as e:
+            logger.error("Rate sketch load failed", error=str(e))
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(
+                self._sync_loop(interval or settings.RATE_SKETCH_SYNC_SECONDS)
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Persist what this shard recorded since the last sync
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.error("Rate sketch sync failed", error=str(e))
+        await self._redis.close()
+
+
+_rate_sketches: Optional[RateSketchStore] = None
+
+
+def get_rate_sketch_store() -> RateSketchStore:
+    """Get the process-wide rate sketch store."""
+    global _rate_sketches
+    if _rate_sketches is None:
+        _rate_sketches = RateSketchStore(
+            redis_url=settings.REDIS_URL if settings.RATE_SKETCH_REDIS else None,
+        )
+    return _rate_sketches
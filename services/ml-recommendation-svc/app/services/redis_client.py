@@ -0,0 +1,58 @@
+"""
+Redis Client - Lazily connected, failure-tolerant Redis access.
+
+Redis is an optional tier for the service's caches and indexes. The
+client connects on first use. After an error it backs off for a while
+and reports no client, so callers degrade to local-only behaviour. If
+the redis package is missing, Redis is disabled for good.
+"""
+
+import time
+from typing import Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Back-off before reconnecting after a Redis failure
+REDIS_RETRY_SECONDS = 30.0
+
+
+class LazyRedis:
+    """Connects on first use and backs off after failures."""
+
+    def __init__(self, url: Optional[str], name: str):
+        self._url = url
+        self.name = name
+        self._redis = None
+        self._retry_at = 0.0
+        self.errors = 0
+
+    def client(self):
+        """The async client, or None while Redis is disabled or backing off."""
+        if self._redis is not None or self._url is None:
+            return self._redis
+        if time.monotonic() < self._retry_at:
+            return None
+
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("redis not available, running local only", component=self.name)
+            self._url = None
+            return None
+
+        self._redis = aioredis.from_url(self._url)
+        return self._redis
+
+    def failed(self, error: Exception) -> None:
+        """Drop the connection and back off after an error."""
+        logger.warning("Redis error", component=self.name, error=str(error))
+        self.errors += 1
+        self._redis = None
+        self._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
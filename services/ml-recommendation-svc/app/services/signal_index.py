@@ -0,0 +1,228 @@
+"""
+Signal Index - Per-skill market signal counters.
+
+A user's market signals are folded once into per-skill counters by
+signal type, plus the most recent few signals. After that, gap priority
+and candidate urgency are dictionary lookups instead of a rescan of the
+whole signal list for every target skill.
+
+For users with long histories, ``SignalIndexStore`` keeps a rolling
+index per user in Redis. Each request folds in only the signals past
+the stored watermark, and day buckets older than the window are
+subtracted back out. The watermark is the latest timestamp plus the
+signals already counted at it, so distinct signals sharing that
+timestamp are still counted once each.
+"""
+
+import json
+from collections import Counter, defaultdict, deque
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from app.schemas import MarketSignal
+from app.services.redis_client import LazyRedis
+
+logger = structlog.get_logger()
+
+# Number of most recent signals considered for urgency
+RECENT_SIGNAL_WINDOW = 5
+
+# Optimistic transaction attempts per stored index update
+UPDATE_RETRIES = 5
+
+
+def _skill_counters() -> Dict[str, Counter]:
+    # Module-level so indexes pickle for the process inference executor
+    return defaultdict(Counter)
+
+
+def signal_key(signal: MarketSignal) -> str:
+    """Identity of a signal among those sharing its timestamp."""
+    if signal.signal_id is not None:
+        return signal.signal_id
+    return json.dumps([
+        signal.signal_type,
+        sorted(set(signal.skill_ids)),
+        signal.job_id,
+        signal.outcome,
+        signal.match_score,
+    ])
+
+
+class SignalIndex:
+    """Per-skill counts by signal type, plus the recent-signal window."""
+
+    def __init__(self):
+        self.counts: Dict[str, Counter] = defaultdict(Counter)
+        # day -> skill -> signal type -> count, for rolling windows
+        self.daily: Dict[str, Dict[str, Counter]] = defaultdict(_skill_counters)
+        self.recent: Deque[Tuple[str, Tuple[str, ...]]] = deque(maxlen=RECENT_SIGNAL_WINDOW)
+        self.last_timestamp: Optional[datetime] = None
+        # Signals counted at last_timestamp, by key; None if unknown
+        self.at_watermark: Optional[Counter] = Counter()
+
+    @classmethod
+    def build(cls, signals: Iterable[MarketSignal]) -> "SignalIndex":
+        """Index signals in one pass over their skill mentions."""
+        index = cls()
+        for signal in signals:
+            index.add(signal)
+        return index
+
+    def add(self, signal: MarketSignal) -> None:
+        # A skill listed twice is still one signal for it
+        skill_ids = tuple(dict.fromkeys(signal.skill_ids))
+        day = signal.timestamp.date().isoformat()
+        for skill_id in skill_ids:
+            self.counts[skill_id][signal.signal_type] += 1
+            self.daily[day][skill_id][signal.signal_type] += 1
+
+        self.recent.append((signal.signal_type, skill_ids))
+        if self.last_timestamp is None or signal.timestamp > self.last_timestamp:
+            self.last_timestamp = signal.timestamp
+            self.at_watermark = Counter({signal_key(signal): 1})
+        elif signal.timestamp == self.last_timestamp and self.at_watermark is not None:
+            self.at_watermark[signal_key(signal)] += 1
+
+    def count(self, skill_id: str, signal_type: str) -> int:
+        """Signals of ``signal_type`` that mention ``skill_id``."""
+        counts = self.counts.get(skill_id)
+        return counts[signal_type] if counts else 0
+
+    def recent_urgency(self, weights: Dict[str, float], default: float) -> Dict[str, float]:
+        """Highest urgency among the recent signals mentioning each skill."""
+        urgency: Dict[str, float] = {}
+        for signal_type, skill_ids in self.recent:
+            value = weights.get(signal_type, default)
+            for skill_id in skill_ids:
+                if value > urgency.get(skill_id, float("-inf")):
+                    urgency[skill_id] = value
+        return urgency
+
+    def prune_before(self, cutoff: date) -> None:
+        """Drop day buckets older than ``cutoff`` from the running counts."""
+        for day in [d for d in self.daily if d < cutoff.isoformat()]:
+            for skill_id, by_type in self.daily.pop(day).items():
+                counts = self.counts[skill_id]
+                counts.subtract(by_type)
+                for signal_type in [t for t, n in counts.items() if n <= 0]:
+                    del counts[signal_type]
+                if not counts:
+                    del self.counts[skill_id]
+
+    # -------------------------------------------------------------------------
+    # SERIALIZATION
+    # -------------------------------------------------------------------------
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "daily": self.daily,
+            "recent": list(self.recent),
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None,
+            "at_watermark": self.at_watermark,
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> "SignalIndex":
+        data = json.loads(payload)
+        index = cls()
+        for day, skills in data["daily"].items():
+            for skill_id, by_type in skills.items():
+                index.daily[day][skill_id].update(by_type)
+                index.counts[skill_id].update(by_type)
+        index.recent.extend((t, tuple(skills)) for t, skills in data["recent"])
+        if data["last_timestamp"]:
+            index.last_timestamp = datetime.fromisoformat(data["last_timestamp"])
+        # Indexes stored before at_watermark was tracked
+        at_watermark = data.get("at_watermark")
+        index.at_watermark = Counter(at_watermark) if at_watermark is not None else None
+        return index
+
+
+class SignalIndexStore:
+    """Rolling per-user signal indexes persisted in Redis."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        window_days: int = 180,
+        key_prefix: str = "signals:",
+    ):
+        self.window_days = window_days
+        self.key_prefix = key_prefix
+        self._redis = LazyRedis(redis_url, "signal_index")
+
+    def key(self, tenant_id: str, user_id: str) -> str:
+        return f"{self.key_prefix}{tenant_id}:{user_id}"
+
+    async def update(
+        self,
+        tenant_id: str,
+        user_id: str,
+        signals: List[MarketSignal],
+    ) -> SignalIndex:
+        """
+        Fold new signals into the user's stored index and return it.
+
+        Signals before the stored watermark, or already counted at it, are
+        skipped. The read-merge-write runs as a WATCH/MULTI transaction,
+        retried when another worker updates the index in between, so
+        concurrent updates never drop each other's counts. Without Redis
+        this degrades to a per-request index.
+        """
+        client = self._redis.client()
+        if client is None:
+            return SignalIndex.build(signals)
+
+        from redis.exceptions import WatchError
+
+        key = self.key(tenant_id, user_id)
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                for _ in range(UPDATE_RETRIES):
+                    try:
+                        await pipe.watch(key)
+                        index = self._fold(await pipe.get(key), signals)
+                        pipe.multi()
+                        pipe.set(key, index.to_json(), ex=self.window_days * 86400)
+                        await pipe.execute()
+                        return index
+                    except WatchError:
+                        continue
+        except Exception as e:
+            self._redis.failed(e)
+            return SignalIndex.build(signals)
+
+        # Still contended: serve this request's view without storing it
+        logger.warning("Signal index update contended", key=key, retries=UPDATE_RETRIES)
+        return index
+
+    def _fold(self, payload: Optional[bytes], signals: List[MarketSignal]) -> SignalIndex:
+        """Stored index plus the signals past its watermark, pruned to the window."""
+        index = SignalIndex.from_json(payload) if payload else SignalIndex()
+        watermark = index.last_timestamp
+        counted = Counter(index.at_watermark or ())
+        seen: Counter = Counter()
+        for signal in signals:
+            if watermark is not None and signal.timestamp < watermark:
+                continue
+            if watermark is not None and signal.timestamp == watermark:
+                # Without a record of what was counted at the watermark, skip it
+                if index.at_watermark is None:
+                    continue
+                # Requests resend recent signals; count only the ones beyond
+                # those already counted at this timestamp
+                key = signal_key(signal)
+                seen[key] += 1
+                if seen[key] <= counted[key]:
+                    continue
+            index.add(signal)
+
+        latest = index.last_timestamp or datetime.utcnow()
+        index.prune_before((latest - timedelta(days=self.window_days)).date())
+        return index
+
+    async def close(self) -> None:
+        await self._redis.close()
@@ -0,0 +1,72 @@
+"""
+Text Analysis - Shared tokenization for proposal and job text.
+
+The proposal model and the proposal analyzer read the same few things
+from a text: whitespace words, period-delimited sentences, lowercase word
+tokens and the keywords among them. ``analyze_text`` derives all of them
+once and returns an immutable ``TextDocument`` that every feature and
+score reads from. Documents are cached by text, so a job description shared by
+many proposals is tokenized once.
+
+Keywords are interned: keyword sets of different documents share their
+strings, and set intersections mostly compare by identity.
+"""
+
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Tuple
+
+# Keywords are tokens longer than this
+MIN_KEYWORD_LENGTH = 3
+
+# Candidate keywords of lowercased text: whole word tokens long enough to count
+_KEYWORD = re.compile(rf"\b\w{{{MIN_KEYWORD_LENGTH + 1},}}\b")
+
+STOPWORDS: FrozenSet[str] = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'we', 'you', 'for', 'to', 'of',
+    'and', 'or', 'in', 'on', 'with',
+})
+
+# Distinct texts whose documents are kept
+DOCUMENT_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class TextDocument:
+    """Tokenized text; shared between callers, so immutable."""
+    text: str
+    lower: str
+    word_count: int  # whitespace-delimited words
+    sentences: Tuple[str, ...]  # split on '.', trailing fragment included
+    sentence_marks: int  # '.', '!' and '?'
+    question_count: int
+    keywords: Tuple[str, ...]  # distinct, in order of first appearance
+    keyword_set: FrozenSet[str]
+    keyword_count: int  # keyword occurrences, repeats included
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def analyze_text(text: str) -> TextDocument:
+    """Tokenize ``text`` into words, sentences and keywords."""
+    lower = text.lower()
+    keywords = [token for token in _KEYWORD.findall(lower) if token not in STOPWORDS]
+    distinct = tuple(sys.intern(token) for token in dict.fromkeys(keywords))
+    questions = text.count('?')
+
+    return TextDocument(
+        text=text,
+        lower=lower,
+        word_count=len(text.split()),
+        sentences=tuple(text.split('.')),
+        sentence_marks=text.count('.') + text.count('!') + questions,
+        question_count=questions,
+        keywords=distinct,
+        keyword_set=frozenset(distinct),
+        keyword_count=len(keywords),
+    )
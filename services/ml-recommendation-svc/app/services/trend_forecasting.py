@@ -0,0 +1,189 @@
+"""
+Trend Forecasting - Damped-trend exponential smoothing for many series.
+
+Demand history arrives as a skills x periods matrix (oldest period first,
+NaN where a skill has no data yet). Every series is fitted and projected
+together: the smoothing recursion steps through time once, updating the
+state of all skills and all candidate parameter sets as NumPy arrays.
+Parameters are picked per skill from a small grid by in-sample squared
+error, which needs no optimizer and gives the same answer for a skill
+whether it is forecast alone or in a batch of hundreds.
+
+The model is additive damped trend (ETS(A,Ad,N)) in error-correction form::
+
+    forecast  = level + phi * trend
+    error     = y - forecast
+    level     = forecast + alpha * error
+    trend     = phi * trend + beta * error
+
+Prediction intervals use the model's closed-form h-step variance.
+``forecast_demand`` maps posting-count projections onto the 0-100
+demand score scale used by the API.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from app.services.market_demand import NEUTRAL_DEMAND_SCORE
+
+# Candidate smoothing parameters (beta is a fraction of alpha, so beta <= alpha)
+ALPHAS = (0.1, 0.3, 0.5, 0.7, 0.9)
+BETA_FRACTIONS = (0.05, 0.2, 0.5)
+PHIS = (0.8, 0.9, 0.98)
+
+# z-score of the reported prediction interval (80%)
+INTERVAL_Z = 1.2816
+
+# Relative half-width of the forecast band for skills with no history
+UNKNOWN_TREND_BAND = 0.15
+
+
+@dataclass
+class HoltFit:
+    """Fitted state and parameters, one entry per series."""
+    level: np.ndarray
+    trend: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    phi: np.ndarray
+    sigma: np.ndarray
+    mape: np.ndarray
+    observations: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.level)
+
+
+def _parameter_grid() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    grid = np.array([
+        (alpha, alpha * fraction, phi)
+        for alpha, fraction, phi in itertools.product(ALPHAS, BETA_FRACTIONS, PHIS)
+    ])
+    # Shaped (grid, 1) to broadcast against (grid, series) state
+    return grid[:, 0:1], grid[:, 1:2], grid[:, 2:3]
+
+
+def fit_damped_holt(history: np.ndarray) -> HoltFit:
+    """
+    Fit every row of ``history`` (series x periods) at once.
+
+    Leading NaNs are allowed (shorter histories); a row with no data at
+    all fits to a zero level with zero observations.
+    """
+    y = np.asarray(history, dtype=np.float64)
+    if y.ndim != 2:
+        raise ValueError("history must be a (series, periods) matrix")
+    n_series, n_periods = y.shape
+
+    valid = ~np.isnan(y)
+    observations = valid.sum(axis=1)
+    first = np.where(observations > 0, valid.argmax(axis=1), 0)
+    start = np.where(observations > 0, y[np.arange(n_series), first], 0.0)
+
+    alpha, beta, phi = _parameter_grid()
+    n_grid = alpha.shape[0]
+
+    level = np.broadcast_to(start, (n_grid, n_series)).copy()
+    trend = np.zeros((n_grid, n_series))
+    sse = np.zeros((n_grid, n_series))
+    ape = np.zeros((n_grid, n_series))
+    scored = np.zeros(n_series)
+
+    for t in range(n_periods):
+        forecast = level + phi * trend
+        # No update before a series starts, at its first value, or on gaps
+        active = valid[:, t] & (t > first)
+        error = np.where(active, np.nan_to_num(y[:, t]) - forecast, 0.0)
+
+        sse += error ** 2
+        ape += np.abs(error) / np.maximum(np.abs(np.nan_to_num(y[:, t])), 1.0)
+        scored += active
+
+        level = forecast + alpha * error
+        trend = phi * trend + beta * error
+
+    # Best parameter set per series
+    best = (sse.argmin(axis=0), np.arange(n_series))
+
+    # Three fitted parameters; keep at least one degree of freedom
+    dof = np.maximum(scored - 3, 1)
+
+    return HoltFit(
+        level=level[best],
+        trend=trend[best],
+        alpha=alpha[best[0], 0],
+        beta=beta[best[0], 0],
+        phi=phi[best[0], 0],
+        sigma=np.sqrt(sse[best] / dof),
+        mape=ape[best] / np.maximum(scored, 1),
+        observations=observations,
+    )
+
+
+def project(
+    fit: HoltFit,
+    horizon: int,
+    z: float = INTERVAL_Z,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Point forecasts and interval bounds, each shaped (series, horizon)."""
+    steps = np.arange(1, horizon + 1)
+    phi = fit.phi[:, None]
+
+    # Sum of phi^1..phi^h: how much of the current trend survives damping
+    damped = phi * (1 - phi ** steps) / (1 - phi)
+    point = fit.level[:, None] + damped * fit.trend[:, None]
+
+    # Var(h) = sigma^2 * (1 + sum_{j<h} c_j^2), c_j = alpha + beta * damped_j
+    c = fit.alpha[:, None] + fit.beta[:, None] * damped[:, :-1]
+    spread = np.concatenate([np.zeros((len(fit), 1)), np.cumsum(c ** 2, axis=1)], axis=1)
+    margin = z * fit.sigma[:, None] * np.sqrt(1 + spread)
+
+    return point, point - margin, point + margin
+
+
+@dataclass
+class DemandForecast:
+    """Forecasts on the demand score scale; bounds shaped (series, horizon)."""
+    point: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    current: np.ndarray
+    confidence: np.ndarray
+
+
+def forecast_demand(
+    history: np.ndarray,
+    current: np.ndarray,
+    horizon: int,
+) -> DemandForecast:
+    """
+    Project posting histories and express them as demand scores.
+
+    Each forecast is the skill's current score, moved by the projected
+    relative change from its fitted posting level. Skills without a score
+    or with fewer than two observations get a flat neutral forecast.
+    """
+    current = np.asarray(current, dtype=np.float64)
+    fit = fit_damped_holt(history)
+    point, lower, upper = project(fit, horizon)
+
+    known = (fit.observations >= 2) & ~np.isnan(current)
+    scale = (np.where(known, current, 0.0) / np.maximum(np.abs(fit.level), 1.0))[:, None]
+    point = np.clip(point * scale, 0, 100)
+    lower = np.clip(lower * scale, 0, 100)
+    upper = np.clip(upper * scale, 0, 100)
+
+    point[~known] = NEUTRAL_DEMAND_SCORE
+    lower[~known] = NEUTRAL_DEMAND_SCORE * (1 - UNKNOWN_TREND_BAND)
+    upper[~known] = NEUTRAL_DEMAND_SCORE * (1 + UNKNOWN_TREND_BAND)
+
+    return DemandForecast(
+        point=point,
+        lower=lower,
+        upper=upper,
+        current=np.where(known, current, NEUTRAL_DEMAND_SCORE),
+        confidence=np.where(known, np.clip(1 - fit.mape, 0.3, 0.95), 0.3),
+    )
@@ -0,0 +1,140 @@
+"""
+Versioned Snapshots - Publish and hot-reload immutable snapshot directories.
+
+Precomputed artifacts (content catalog, forecast grid, win tables) share
+one on-disk layout::
+
+    <root>/
+        CURRENT             # {"version": "..."} - swapped atomically
+        <version>/
+            manifest.json   # version, built_at and artifact-specific fields
+            ...             # artifact files, usually memory-mapped
+
+A builder writes a new version directory next to the current one and
+publishes it by swapping CURRENT; readers check CURRENT's mtime and open
+the new version with a single reference swap, so lookups in flight keep
+the snapshot they started with.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+import structlog
+
+logger = structlog.get_logger()
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+KEEP_VERSIONS = 2
+
+S = TypeVar("S")
+
+
+def create_version(root: Path) -> Tuple[str, Path]:
+    """Create an empty directory for a new version. Returns (version, directory)."""
+    version = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    target = root / version
+    target.mkdir(parents=True, exist_ok=False)
+    return version, target
+
+
+def publish_version(root: Path, version: str, manifest: Dict[str, Any]) -> None:
+    """
+    Write a version's manifest and make it current.
+
+    Readers pick up the new version on their next reload check; the
+    previous version is kept so in-flight lookups are unaffected.
+    """
+    with open(root / version / MANIFEST_FILE, "w") as f:
+        json.dump({
+            "version": version,
+            **manifest,
+            "built_at": datetime.utcnow().isoformat(),
+        }, f)
+
+    # Atomically point readers at the new version
+    tmp = root / f".{CURRENT_FILE}.{version}"
+    tmp.write_text(json.dumps({"version": version}))
+    os.replace(tmp, root / CURRENT_FILE)
+
+    prune_versions(root, keep=version)
+
+
+def prune_versions(root: Path, keep: str) -> None:
+    """Remove old versions beyond the retention window."""
+    versions = sorted(
+        p for p in root.iterdir()
+        if p.is_dir() and (p / MANIFEST_FILE).exists()
+    )
+    others = [p for p in versions if p.name != keep]
+    for p in others[:max(len(others) - (KEEP_VERSIONS - 1), 0)]:
+        # Mapped files stay valid for readers still holding them open
+        shutil.rmtree(p, ignore_errors=True)
+
+
+class VersionedSnapshotReader(Generic[S]):
+    """
+    Read side of a versioned snapshot directory with hot reload.
+
+    Subclasses open one version directory into a snapshot object with a
+    ``version`` attribute, and say how often to check for a new one.
+    """
+
+    # Artifact name used in log messages
+    name = "Snapshot"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._snapshot: Optional[S] = None
+        self._current_mtime: Optional[float] = None
+        self._last_check = 0.0
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._snapshot.version if self._snapshot else None
+
+    def _open(self, directory: Path) -> S:
+        raise NotImplementedError
+
+    def _reload_interval(self) -> float:
+        raise NotImplementedError
+
+    def _describe(self, snapshot: S) -> Dict[str, Any]:
+        """Fields logged when a version is loaded."""
+        return {}
+
+    def load(self) -> bool:
+        """Open the current version if it changed. Returns True on swap."""
+        current = self.path / CURRENT_FILE
+        try:
+            mtime = current.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+        if mtime == self._current_mtime:
+            return False
+
+        version = json.loads(current.read_text())["version"]
+        if self._snapshot is None or self._snapshot.version != version:
+            snapshot = self._open(self.path / version)
+            # Single reference swap; lookups in flight keep the old snapshot
+            self._snapshot = snapshot
+            logger.info(f"{self.name} loaded", version=version, **self._describe(snapshot))
+        self._current_mtime = mtime
+        return True
+
+    def maybe_reload(self) -> None:
+        """Check for a newer version at most once per reload interval."""
+        now = time.monotonic()
+        if now - self._last_check < self._reload_interval():
+            return
+        self._last_check = now
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"{self.name} reload failed", error=str(e))
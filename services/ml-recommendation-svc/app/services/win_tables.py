@@ -0,0 +1,200 @@
+"""
+Win Tables - Precomputed win curves per job segment.
+
+Win curves for similar jobs are nearly identical, so the ``WinTableBuilder``
+job evaluates the rate model once per segment - primary skill, complexity
+and competition level - over a grid of rate-vs-budget x rate-vs-market
+ratios, for a reference freelancer bidding on the segment's typical job.
+Serving a curve is a bilinear interpolation in the segment's table; the
+rate model then shifts it for the actual freelancer and job.
+
+On-disk layout (one directory per built version)::
+
+    <WIN_TABLE_PATH>/
+        CURRENT             # {"version": "..."} - swapped atomically
+        <version>/
+            manifest.json   # segments, model version the tables were built with
+            tables.npy      # (segments, budget points, market points) float16 P(win)
+            axes.npz        # rate_vs_budget and rate_vs_market grid points
+            keys.npy        # segment keys, in table order
+
+The tables are memory-mapped; a lookup is a dict probe per segment.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+from app.services.market_demand import skill_key
+from app.services.versioned_snapshots import VersionedSnapshotReader, create_version, publish_version
+
+logger = structlog.get_logger()
+
+
+def ratio_axis() -> np.ndarray:
+    """Grid points of each ratio axis."""
+    return np.linspace(
+        settings.WIN_TABLE_RATIO_MIN, settings.WIN_TABLE_RATIO_MAX, settings.WIN_TABLE_POINTS
+    )
+
+
+def job_segment(job: dict) -> str:
+    """Segment key of a job: primary skill, complexity and competition level."""
+    skills = job.get("skills") or []
+    primary = skills[0] if skills else "*"
+    if isinstance(primary, dict):
+        primary = primary.get("name") or primary["id"]
+    complexity = job.get("complexity") or "medium"
+    competition = job.get("competition_level") or "medium"
+    return f"{skill_key(primary)}|{complexity}|{competition}"
+
+
+def write_win_tables(
+    segments: List[str],
+    tables: np.ndarray,
+    budget_axis: np.ndarray,
+    market_axis: np.ndarray,
+    model_version: str,
+    path: Optional[str] = None,
+) -> str:
+    """
+    Publish per-segment win tables as the current version.
+
+    ``tables`` is (segments, budget points, market points), in ``segments``
+    order. Returns the new version name.
+    """
+    root = Path(path or settings.WIN_TABLE_PATH)
+    version, target = create_version(root)
+
+    np.save(target / "tables.npy", np.clip(tables, 0.0, 1.0).astype(np.float16))
+    np.savez(target / "axes.npz", budget=budget_axis, market=market_axis)
+    np.save(target / "keys.npy", np.array(segments, dtype=str))
+
+    publish_version(root, version, {
+        "segments": len(segments),
+        "model_version": model_version,
+    })
+    logger.info("Win tables built", version=version, segments=len(segments))
+    return version
+
+
+def _interpolation_weights(axis: np.ndarray, values: np.ndarray):
+    """Lower grid index and weight of the upper point; clamped to the axis."""
+    values = np.clip(values, axis[0], axis[-1])
+    lower = np.clip(np.searchsorted(axis, values, side="right") - 1, 0, len(axis) - 2)
+    weight = (values - axis[lower]) / (axis[lower + 1] - axis[lower])
+    return lower, weight
+
+
+@dataclass
+class _TableSnapshot:
+    """One immutable, memory-mapped table version."""
+    version: str
+    model_version: str
+    index: Dict[str, int]
+    tables: np.ndarray
+    budget_axis: np.ndarray
+    market_axis: np.ndarray
+
+    @classmethod
+    def open(cls, directory: Path) -> "_TableSnapshot":
+        manifest = json.loads((directory / "manifest.json").read_text())
+        keys = np.load(directory / "keys.npy")
+        with np.load(directory / "axes.npz") as axes:
+            budget_axis, market_axis = axes["budget"], axes["market"]
+        return cls(
+            version=manifest["version"],
+            model_version=manifest["model_version"],
+            index={key: row for row, key in enumerate(keys.tolist())},
+            tables=np.load(directory / "tables.npy", mmap_mode="r"),
+            budget_axis=budget_axis,
+            market_axis=market_axis,
+        )
+
+    def interpolate(
+        self,
+        rows: np.ndarray,
+        rate_vs_budget: np.ndarray,
+        rate_vs_market: np.ndarray,
+    ) -> np.ndarray:
+        """Bilinear P(win) of each table row at (rows, points) ratio pairs."""
+        b, wb = _interpolation_weights(self.budget_axis, rate_vs_budget)
+        m, wm = _interpolation_weights(self.market_axis, rate_vs_market)
+        # Only the segments asked for are paged in
+        tables = np.asarray(self.tables[rows], dtype=np.float64)
+        r = np.arange(len(rows))[:, None]
+        return (
+            tables[r, b, m] * (1 - wb) * (1 - wm)
+            + tables[r, b + 1, m] * wb * (1 - wm)
+            + tables[r, b, m + 1] * (1 - wb) * wm
+            + tables[r, b + 1, m + 1] * wb * wm
+        )
+
+
+class WinTables(VersionedSnapshotReader[_TableSnapshot]):
+    """Read side of the win tables with hot reload."""
+
+    name = "Win tables"
+
+    def __init__(self, path: Optional[str] = None):
+        super().__init__(Path(path or settings.WIN_TABLE_PATH))
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def segments(self) -> int:
+        return len(self._snapshot.index) if self._snapshot else 0
+
+    def _open(self, directory: Path) -> _TableSnapshot:
+        return _TableSnapshot.open(directory)
+
+    def _reload_interval(self) -> float:
+        return settings.WIN_TABLE_RELOAD_SECONDS
+
+    def _describe(self, snapshot: _TableSnapshot) -> Dict[str, Any]:
+        return {"segments": len(snapshot.index)}
+
+    def lookup(
+        self,
+        segments: List[str],
+        model_version: str,
+        rate_vs_budget: np.ndarray,
+        rate_vs_market: np.ndarray,
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Interpolated P(win) for each segment at its (segments, points) ratios.
+
+        Returns a mask of the segments found and their probabilities (in
+        mask order). Nothing is found when the tables are missing or were
+        built with a different model version.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.model_version != model_version:
+            return np.zeros(len(segments), dtype=bool), None
+
+        rows = np.array([snapshot.index.get(s, -1) for s in segments], dtype=np.intp)
+        found = rows >= 0
+        if not found.any():
+            return found, None
+
+        return found, snapshot.interpolate(
+            rows[found], rate_vs_budget[found], rate_vs_market[found]
+        )
+
+
+_win_tables: Optional[WinTables] = None
+
+
+def get_win_tables() -> WinTables:
+    """Get the process-wide win tables."""
+    global _win_tables
+    if _win_tables is None:
+        _win_tables = WinTables()
+    return _win_tables
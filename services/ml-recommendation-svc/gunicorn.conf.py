@@ -0,0 +1,48 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The SERVICE_ROLE's eager models are loaded once in the master process
+before the workers fork, so every worker shares their read-only pages
+copy-on-write instead of holding a private copy. Lazy models still load
+on first use in each worker. Joblib artifacts are also memory-mapped
+(MODEL_MMAP), so their arrays stay in the shared page cache even after
+a worker restarts.
+
+Each worker also gets a stable WORKER_INDEX, its slot among the live
+workers, which a replacement worker reuses. Per-worker state such as rate
+sketch shards is named by it rather than by pid.
+"""
+
+import gc
+import itertools
+import os
+
+from app.core.config import settings
+
+bind = f"{settings.HOST}:{settings.PORT}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+
+def on_starting(server):
+    from app.services.model_service import preload_models
+
+    preload_models()
+
+    # Keep the garbage collector from touching (and so copying) the
+    # preloaded objects' pages in every worker
+    gc.freeze()
+
+
+def pre_fork(server, worker):
+    # Lowest free slot, so a replacement worker takes over its predecessor's
+    # index (and with it per-worker state such as its rate sketch shard)
+    used = {getattr(w, "index", None) for w in server.WORKERS.values()}
+    worker.index = next(i for i in itertools.count() if i not in used)
+
+
+def post_fork(server, worker):
+    os.environ["WORKER_INDEX"] = str(worker.index)
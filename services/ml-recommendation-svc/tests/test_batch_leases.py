@@ -0,0 +1,89 @@
+"""Tests for batch job leases."""
+
+import json
+import os
+import time
+
+import pytest
+
+from app.services.batch_recommendations import (
+    LEASE_FILE,
+    BatchRecommendationRunner,
+    LeaseLostError,
+    _write_partition,
+)
+
+
+def _runner(tmp_path):
+    return BatchRecommendationRunner(output_path=str(tmp_path), input_path=str(tmp_path))
+
+
+class TestBatchJobLease:
+    """Tests for BatchRecommendationRunner lease claiming."""
+
+    def test_fresh_lease_blocks_other_runner(self, tmp_path):
+        """A job running in another worker process is not started twice."""
+        owner, other = _runner(tmp_path), _runner(tmp_path)
+
+        assert owner._claim_lease(tmp_path)
+        assert not other._claim_lease(tmp_path)
+        assert json.loads((tmp_path / LEASE_FILE).read_text())["owner"] == owner.owner
+
+    def test_stale_lease_is_taken_over(self, tmp_path):
+        """A lease whose owner stopped heartbeating can be resumed elsewhere."""
+        owner, other = _runner(tmp_path), _runner(tmp_path)
+        assert owner._claim_lease(tmp_path)
+
+        lease = tmp_path / LEASE_FILE
+        lease.write_text(json.dumps({"owner": owner.owner, "heartbeat": time.time() - 2 * other.lease_seconds}))
+
+        assert other._claim_lease(tmp_path)
+        assert json.loads(lease.read_text())["owner"] == other.owner
+        assert [p.name for p in tmp_path.iterdir()] == [LEASE_FILE]
+
+    def test_unwritten_lease_counts_as_fresh(self, tmp_path):
+        """A lease created but not yet written belongs to a claim in progress."""
+        (tmp_path / LEASE_FILE).touch()
+
+        assert not _runner(tmp_path)._claim_lease(tmp_path)
+
+        stale = time.time() - 2 * _runner(tmp_path).lease_seconds
+        os.utime(tmp_path / LEASE_FILE, (stale, stale))
+        assert _runner(tmp_path)._claim_lease(tmp_path)
+
+    def test_release_keeps_other_owners_lease(self, tmp_path):
+        owner, other = _runner(tmp_path), _runner(tmp_path)
+        assert owner._claim_lease(tmp_path)
+
+        other._release_lease(tmp_path)
+        assert (tmp_path / LEASE_FILE).exists()
+
+        owner._release_lease(tmp_path)
+        assert not (tmp_path / LEASE_FILE).exists()
+
+
+class TestWritePartition:
+    """Tests for writing output partitions under a lease."""
+
+    ROWS = [{"user_id": "user-1", "recommendations": [], "error": None}]
+
+    def test_owner_writes_partition(self, tmp_path):
+        owner = _runner(tmp_path)
+        assert owner._claim_lease(tmp_path)
+
+        _write_partition(self.ROWS, tmp_path / "part-00000.ndjson", "ndjson", owner.owner)
+
+        assert json.loads((tmp_path / "part-00000.ndjson").read_text())["user_id"] == "user-1"
+
+    def test_shard_after_lease_lost_leaves_files_alone(self, tmp_path):
+        """A shard still running for the previous owner writes nothing."""
+        old, new = _runner(tmp_path), _runner(tmp_path)
+        assert new._claim_lease(tmp_path)
+        partition = tmp_path / "part-00000.ndjson"
+        partition.write_text("new owner's output\n")
+
+        with pytest.raises(LeaseLostError):
+            _write_partition(self.ROWS, partition, "ndjson", old.owner)
+
+        assert partition.read_text() == "new owner's output\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [LEASE_FILE, partition.name]
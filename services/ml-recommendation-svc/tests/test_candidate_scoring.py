@@ -0,0 +1,23 @@
+"""Tests for batched candidate scoring."""
+
+import numpy as np
+
+from app.services.candidate_scoring import BASE_RELEVANCE, CandidateScorer
+from app.services.signal_index import SignalIndex
+
+
+class TestCandidateScorer:
+    """Tests for CandidateScorer relevance."""
+
+    def test_catalog_similarity_counts_as_relevance(self):
+        """Semantic matches rank as relevant even without a skill id match."""
+        candidates = [
+            {"skill_ids": ["ml-ops"], "title": "Shipping models", "similarity": 0.8},
+            {"skill_ids": ["python"], "title": "Python basics", "similarity": 0.1},
+            {"skill_ids": ["cobol"], "title": "Template course"},
+        ]
+        gaps = [{"skill_name": "python", "gap_score": 70}]
+
+        scores = CandidateScorer(confidence=0.5).score(candidates, gaps, SignalIndex())
+
+        np.testing.assert_allclose(scores["relevance"], [0.8, 0.7, BASE_RELEVANCE])
@@ -0,0 +1,42 @@
+"""Tests for model preloading."""
+
+import pytest
+
+from app.core.config import settings
+from app.services import inference_executor, model_service
+from app.services.model_service import preload_models
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    """Every model available, recording which ones get loaded."""
+    loaded = []
+
+    def loader(name):
+        return lambda: loaded.append(name) or name
+
+    monkeypatch.setattr(
+        model_service,
+        "discover_model_loaders",
+        lambda: {name: ("joblib", loader(name)) for name in model_service.MODEL_ATTRS},
+    )
+    monkeypatch.setattr(settings, "EAGER_MODELS", None)
+    yield loaded
+    inference_executor.unregister_models()
+
+
+class TestPreloadModels:
+    """Tests for preload_models."""
+
+    def test_ai_role_preloads_nothing(self, loaders, monkeypatch):
+        monkeypatch.setattr(settings, "SERVICE_ROLE", "ai")
+
+        assert preload_models() == []
+        assert loaders == []
+
+    def test_preloads_only_the_roles_eager_models(self, loaders, monkeypatch):
+        monkeypatch.setattr(settings, "SERVICE_ROLE", "recommendations")
+
+        assert preload_models() == ["embedding", "recommendation", "skill_gap"]
+        assert "trend" not in loaders
+        assert inference_executor.loaded_model("trend") is None
@@ -0,0 +1,56 @@
+"""Tests for the rate cube builder job."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.jobs.rate_cube_builder import RateCubeBuilder
+from app.metrics import get_metrics
+from app.services.rate_cube import RateCube
+
+T0 = datetime(2024, 5, 1, 12)
+
+
+class _OutcomeDB:
+    """In-memory bid_outcomes table supporting the builder's query."""
+
+    def __init__(self):
+        self.rows = []
+
+    def add(self, outcome_id, created_at, outcome="won"):
+        self.rows.append({
+            "id": outcome_id,
+            "created_at": created_at,
+            "outcome": outcome,
+            "proposed_rate": 50.0,
+            "skills": ["python"],
+        })
+
+    async def query(self, collection, filters, limit, offset):
+        since = filters["created_at"]["$gte"]
+        rows = [r for r in self.rows if r["created_at"] >= since and r["outcome"] in filters["outcome"]["$in"]]
+        return rows[offset:offset + limit]
+
+
+def _run(db, path):
+    return asyncio.run(RateCubeBuilder(db, get_metrics(), cube=RateCube(path=str(path))).run())
+
+
+class TestRateCubeBuilder:
+    """Tests for RateCubeBuilder incremental updates."""
+
+    def test_picks_up_ties_and_late_arrivals_once(self, tmp_path):
+        db = _OutcomeDB()
+        db.add("a", T0)
+        db.add("b", T0 + timedelta(hours=1), outcome="lost")
+        assert _run(db, tmp_path).outcomes_added == 2
+
+        # Same time as the watermark, and stored late with an older time
+        db.add("c", T0 + timedelta(hours=1))
+        db.add("d", T0 - timedelta(hours=2))
+        assert _run(db, tmp_path).outcomes_added == 2
+        assert _run(db, tmp_path).outcomes_added == 0
+
+        cube = RateCube(path=str(tmp_path))
+        cube.load()
+        bids = cube.slice("python")
+        assert (bids.bids, bids.accepted) == (4, 3)
@@ -0,0 +1,119 @@
+"""Tests for the rate optimizer service."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.api import rate_optimizer
+from app.api.rate_optimizer import (
+    FreelancerProfile,
+    JobContext,
+    MarketRateData,
+    RateOptimizerService,
+    get_rate_optimizer_service,
+)
+from app.core.config import settings
+from app.services import rate_cube, rate_sketches
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A fresh process-wide service over empty rate sketches and cube."""
+    monkeypatch.setattr(settings, "RATE_SKETCH_PATH", str(tmp_path / "sketches"))
+    monkeypatch.setattr(settings, "RATE_CUBE_PATH", str(tmp_path / "cube"))
+    monkeypatch.setattr(rate_sketches, "_rate_sketches", None)
+    monkeypatch.setattr(rate_cube, "_rate_cube", None)
+    monkeypatch.setattr(rate_optimizer, "_service", None)
+    return get_rate_optimizer_service()
+
+
+class _MarketBackend:
+    """Market data backend with the per-skill lookup signature."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_rate_data(self, skill):
+        self.calls.append(skill)
+        return MarketRateData(
+            skill=skill,
+            experience_level="mid",
+            percentile_25=40.0,
+            percentile_50=55.0,
+            percentile_75=70.0,
+            percentile_90=90.0,
+            sample_size=500,
+            last_updated=datetime(2024, 5, 1),
+        )
+
+
+def _job(job_id="job-1", skills=("python",)):
+    return JobContext(
+        job_id=job_id,
+        title="Build an API",
+        skills_required=list(skills),
+        budget_min=40.0,
+        budget_max=90.0,
+        duration="1 month",
+        client_history={},
+        competition_level="medium",
+    )
+
+
+def _freelancer():
+    return FreelancerProfile(
+        user_id="user-1",
+        skills=["python"],
+        experience_years=5,
+        rating=4.8,
+        completion_rate=0.95,
+        win_rate=0.3,
+        average_rate=60.0,
+        rate_history=[],
+    )
+
+
+class TestGetRateOptimizerService:
+    """Tests for the get_rate_optimizer_service factory."""
+
+    def test_builds_one_shared_service(self, service):
+        assert get_rate_optimizer_service() is service
+
+    def test_market_rates_without_data_are_missing(self, service):
+        """Without recorded outcomes every skill reports no market data."""
+        rates = asyncio.run(service.get_market_rates(["python", "go"]))
+
+        assert rates == {"python": None, "go": None}
+
+    def test_recommends_from_default_market_rates(self, service):
+        recommendation = asyncio.run(service.get_optimal_rate(_job(), _freelancer()))
+
+        low, high = recommendation.rate_range
+        assert low <= recommendation.recommended_rate <= high
+        assert 0.0 <= recommendation.win_probability <= 1.0
+
+
+class TestMarketRates:
+    """Tests for market rate lookups against the market data backend."""
+
+    def test_backend_is_queried_once_per_skill(self, service):
+        """Backend data is per skill; levels and locations share one lookup."""
+        backend = _MarketBackend()
+        service = RateOptimizerService(
+            rate_model=service.model,
+            market_data=backend,
+            metrics=service.metrics,
+            rate_sketches=service.sketches,
+            rate_cube=service.cube,
+        )
+
+        async def lookups():
+            await service.get_market_rate("python", "mid")
+            await service.get_market_rate("python", "senior", "berlin")
+            return await service.get_market_rate("go")
+
+        rate = asyncio.run(lookups())
+
+        assert backend.calls == ["python", "go"]
+        assert rate.percentile_50 == 55.0
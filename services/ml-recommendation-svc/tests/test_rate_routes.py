@@ -0,0 +1,158 @@
+"""Tests for the rate optimizer routes."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import rate_optimizer
+from app.api.rate_optimizer import RateOptimizerService
+from app.api.routes.rate_routes import router
+from app.metrics import get_metrics
+from app.models.rate_model import RateSuccessModel
+from app.services import rate_cube, rate_sketches
+from app.services.feature_store import FeatureBackend, FeatureStore
+from app.services.rate_cube import RateCube
+from app.services.rate_sketches import RateSketchStore
+from app.services.win_tables import WinTables
+
+MISSING_JOB = "job-missing"
+
+
+class _Backend(FeatureBackend):
+    """Feature backend that has no record of one job."""
+
+    async def get_jobs(self, job_ids):
+        jobs = await super().get_jobs(job_ids)
+        jobs.pop(MISSING_JOB, None)
+        return jobs
+
+
+@pytest.fixture
+def cube(tmp_path, monkeypatch):
+    cube = RateCube(path=str(tmp_path / "cube"))
+    monkeypatch.setattr(rate_cube, "_rate_cube", cube)
+    return cube
+
+
+@pytest.fixture
+def sketches(tmp_path, monkeypatch):
+    sketches = RateSketchStore(path=str(tmp_path / "sketches"), shard="test")
+    monkeypatch.setattr(rate_sketches, "_rate_sketches", sketches)
+    return sketches
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch, cube, sketches):
+    model = RateSuccessModel(
+        feature_store=FeatureStore(backend=_Backend()),
+        win_tables=WinTables(str(tmp_path / "win_tables")),
+    )
+    service = RateOptimizerService(
+        rate_model=model,
+        market_data=None,
+        metrics=get_metrics(),
+        rate_sketches=sketches,
+        rate_cube=cube,
+    )
+    monkeypatch.setattr(rate_optimizer, "_service", service)
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _job(job_id):
+    return {
+        "job_id": job_id,
+        "title": "Build an API",
+        "skills_required": ["python"],
+        "budget_min": 40.0,
+        "budget_max": 90.0,
+        "duration": "1 month",
+        "client_history": {},
+        "competition_level": "medium",
+    }
+
+
+FREELANCER = {
+    "user_id": "user-1",
+    "skills": ["python"],
+    "experience_years": 5,
+    "rating": 4.8,
+    "completion_rate": 0.95,
+    "win_rate": 0.3,
+    "average_rate": 60.0,
+    "rate_history": [],
+}
+
+
+class TestOptimizeRatesBatch:
+    """Tests for POST /ai/rate/optimize/batch."""
+
+    def test_failing_job_does_not_fail_the_batch(self, client):
+        """A job without features gets an error entry in its own position."""
+        jobs = ["job-1", MISSING_JOB, "job-3"]
+
+        response = client.post(
+            "/ai/rate/optimize/batch",
+            json={"freelancer_profile": FREELANCER, "jobs": [_job(j) for j in jobs]},
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["succeeded"], body["failed"]) == (2, 1)
+        assert [r["job_id"] for r in body["results"]] == jobs
+
+        ok, missing, last = body["results"]
+        assert missing["recommendation"] is None
+        assert MISSING_JOB in missing["error"]
+        for result in (ok, last):
+            assert result["error"] is None
+            low, high = result["recommendation"]["rate_range"]
+            assert low <= result["recommendation"]["recommended_rate"] <= high
+
+
+class TestMarketRateBreakdown:
+    """Tests for GET /ai/rate/market/{skill}/breakdown."""
+
+    def test_breaks_down_by_location(self, client, cube):
+        for location, rate in [("berlin", 60.0), ("berlin", 80.0), ("lisbon", 40.0)]:
+            cube.record(["python"], rate, won=True, location=location)
+        cube.rebuild()
+
+        response = client.get("/ai/rate/market/python/breakdown", params={"by": "location"})
+
+        assert response.status_code == 200
+        slices = {s["location"]: s for s in response.json()["slices"]}
+        assert slices["berlin"]["accepted"] == 2
+        assert slices["lisbon"]["accepted"] == 1
+
+    def test_unknown_skill_has_no_slices(self, client):
+        response = client.get("/ai/rate/market/cobol/breakdown", params={"by": "experience_level"})
+
+        assert response.status_code == 200
+        assert response.json()["slices"] == []
+
+
+class TestRateFeedback:
+    """Tests for POST /ai/rate/feedback."""
+
+    def _feedback(self, client, outcome):
+        return client.post("/ai/rate/feedback", json={
+            "job_id": "job-1",
+            "freelancer_id": "user-1",
+            "proposed_rate": 60.0,
+            "final_rate": 65.0,
+            "outcome": outcome,
+            "skills": ["python", "python"],
+        })
+
+    def test_outcomes_are_counted_once(self, client, cube, sketches):
+        assert self._feedback(client, "won").status_code == 200
+        assert self._feedback(client, "lost").status_code == 200
+        assert self._feedback(client, "withdrawn").status_code == 200
+        cube.rebuild()
+
+        bids = cube.slice("python")
+        assert (bids.bids, bids.accepted) == (2, 1)
+        assert sketches.percentiles("python", min_samples=1).sample_size == 1
@@ -0,0 +1,85 @@
+"""Tests for rate sketch shards."""
+
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.rate_sketches import COMPACTED_SHARD, RateSketchStore
+
+
+def _store(tmp_path, shard):
+    return RateSketchStore(path=str(tmp_path), shard=shard)
+
+
+def _record(store, rates):
+    for rate in rates:
+        store.record(["python"], rate)
+
+
+class TestRateSketchShards:
+    """Tests for RateSketchStore shard naming and compaction on disk."""
+
+    def test_restarted_worker_adopts_its_shard(self, tmp_path):
+        """A worker reusing a shard name keeps its predecessor's observations."""
+        before = _store(tmp_path, "host-w0")
+        _record(before, range(1, 31))
+        asyncio.run(before.sync())
+
+        after = _store(tmp_path, "host-w0")
+        asyncio.run(after.adopt())
+        _record(after, [100])
+        asyncio.run(after.sync())
+
+        reader = _store(tmp_path, "reader")
+        asyncio.run(reader.sync())
+        assert reader.percentiles("python", min_samples=1).sample_size == 31
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["host-w0.npz"]
+
+    def test_stale_shards_are_compacted(self, tmp_path):
+        """Shards of retired workers are folded into one compacted shard."""
+        for shard in ("host-1234", "host-5678"):
+            store = _store(tmp_path, shard)
+            _record(store, range(1, 11))
+            asyncio.run(store.sync())
+        live = _store(tmp_path, "host-w0")
+        _record(live, range(1, 11))
+        asyncio.run(live.sync())
+
+        stale = time.time() - (settings.RATE_SKETCH_SHARD_TTL_HOURS + 1) * 3600
+        for shard in ("host-1234", "host-5678"):
+            os.utime(tmp_path / f"{shard}.npz", (stale, stale))
+
+        assert asyncio.run(live.compact()) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == [f"{COMPACTED_SHARD}.npz", "host-w0.npz"]
+
+        reader = _store(tmp_path, "reader")
+        asyncio.run(reader.sync())
+        assert reader.percentiles("python", min_samples=1).sample_size == 30
+
+    def test_interrupted_compaction_is_not_double_counted(self, tmp_path):
+        """Files the compacted shard already absorbed are only deleted."""
+        store = _store(tmp_path, "host-1234")
+        _record(store, range(1, 11))
+        asyncio.run(store.sync())
+        shard_file = tmp_path / "host-1234.npz"
+        payload = shard_file.read_bytes()
+        stale = time.time() - (settings.RATE_SKETCH_SHARD_TTL_HOURS + 1) * 3600
+        os.utime(shard_file, (stale, stale))
+
+        compactor = _store(tmp_path, "host-w0")
+        assert asyncio.run(compactor.compact()) == 1
+
+        # Crash after the compacted shard was written, before cleanup
+        with np.load(tmp_path / f"{COMPACTED_SHARD}.npz") as compacted:
+            (aside,) = compacted["absorbed"].tolist()
+        (tmp_path / aside).write_bytes(payload)
+
+        assert asyncio.run(compactor.compact()) == 0
+        assert not (tmp_path / aside).exists()
+
+        reader = _store(tmp_path, "reader")
+        asyncio.run(reader.sync())
+        assert reader.percentiles("python", min_samples=1).sample_size == 10
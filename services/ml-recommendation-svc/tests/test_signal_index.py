@@ -0,0 +1,75 @@
+"""Tests for the per-skill market signal index."""
+
+import pickle
+from datetime import datetime
+
+from app.schemas import MarketSignal
+from app.services.signal_index import SignalIndex, SignalIndexStore
+
+
+def _signals():
+    return [
+        MarketSignal(signal_type="job_view", skill_ids=["python", "django"], timestamp=datetime(2024, 5, 1)),
+        MarketSignal(signal_type="job_apply", skill_ids=["python"], timestamp=datetime(2024, 5, 2)),
+    ]
+
+
+class TestSignalIndex:
+    """Tests for SignalIndex."""
+
+    def test_pickle_round_trip(self):
+        """Indexes are sent to process-pool inference workers by pickle."""
+        index = SignalIndex.build(_signals())
+
+        restored = pickle.loads(pickle.dumps(index))
+
+        assert restored.counts == index.counts
+        assert restored.daily == index.daily
+        assert list(restored.recent) == list(index.recent)
+        assert restored.recent.maxlen == index.recent.maxlen
+        assert restored.last_timestamp == index.last_timestamp
+        assert restored.count("python", "job_apply") == 1
+
+    def test_restored_index_keeps_counting(self):
+        """Restored day buckets still create missing skills on demand."""
+        restored = pickle.loads(pickle.dumps(SignalIndex.build(_signals())))
+
+        restored.add(MarketSignal(signal_type="job_view", skill_ids=["rust"], timestamp=datetime(2024, 5, 2)))
+
+        assert restored.count("rust", "job_view") == 1
+        assert restored.daily["2024-05-02"]["rust"]["job_view"] == 1
+
+    def test_repeated_skill_counts_once(self):
+        index = SignalIndex.build([
+            MarketSignal(signal_type="job_view", skill_ids=["python", "python"], timestamp=datetime(2024, 5, 1)),
+        ])
+
+        assert index.count("python", "job_view") == 1
+        assert index.recent[-1] == ("job_view", ("python",))
+
+
+class TestSignalIndexStore:
+    """Tests for folding signals into a stored index."""
+
+    def _fold(self, stored, signals):
+        store = SignalIndexStore(redis_url=None)
+        return store._fold(stored.to_json() if stored else None, signals)
+
+    def test_resent_signals_are_counted_once(self):
+        first = self._fold(None, _signals())
+
+        again = self._fold(first, _signals())
+
+        assert again.count("python", "job_view") == 1
+        assert again.count("python", "job_apply") == 1
+
+    def test_new_signal_at_the_watermark_is_counted(self):
+        """A distinct signal sharing the watermark timestamp is not dropped."""
+        first = self._fold(None, _signals())
+        tie = MarketSignal(signal_type="job_apply", skill_ids=["django"], timestamp=datetime(2024, 5, 2))
+
+        index = self._fold(first, _signals() + [tie])
+
+        assert index.count("django", "job_apply") == 1
+        assert index.count("python", "job_apply") == 1
+        assert self._fold(index, _signals() + [tie]).count("django", "job_apply") == 1
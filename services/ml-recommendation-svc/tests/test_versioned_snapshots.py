@@ -0,0 +1,59 @@
+"""Tests for versioned snapshot publishing and reloading."""
+
+import json
+from pathlib import Path
+
+from app.services.versioned_snapshots import (
+    CURRENT_FILE,
+    KEEP_VERSIONS,
+    VersionedSnapshotReader,
+    create_version,
+    publish_version,
+)
+
+
+class _Snapshot:
+    def __init__(self, directory: Path):
+        self.version = json.loads((directory / "manifest.json").read_text())["version"]
+        self.value = (directory / "value.txt").read_text()
+
+
+class _Reader(VersionedSnapshotReader[_Snapshot]):
+    name = "Test snapshot"
+
+    def _open(self, directory: Path) -> _Snapshot:
+        return _Snapshot(directory)
+
+    def _reload_interval(self) -> float:
+        return 0.0
+
+
+def _publish(root: Path, value: str) -> str:
+    version, target = create_version(root)
+    (target / "value.txt").write_text(value)
+    publish_version(root, version, {"value": value})
+    return version
+
+
+class TestVersionedSnapshots:
+    """Tests for publish_version and VersionedSnapshotReader."""
+
+    def test_reader_follows_current(self, tmp_path):
+        reader = _Reader(tmp_path)
+        assert not reader.load()
+
+        first = _publish(tmp_path, "a")
+        assert reader.load()
+        assert not reader.load()
+        assert (reader.version, reader._snapshot.value) == (first, "a")
+
+        second = _publish(tmp_path, "b")
+        reader.maybe_reload()
+        assert (reader.version, reader._snapshot.value) == (second, "b")
+
+    def test_old_versions_are_pruned(self, tmp_path):
+        versions = [_publish(tmp_path, str(i)) for i in range(KEEP_VERSIONS + 2)]
+
+        kept = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+        assert kept == versions[-KEEP_VERSIONS:]
+        assert json.loads((tmp_path / CURRENT_FILE).read_text())["version"] == versions[-1]
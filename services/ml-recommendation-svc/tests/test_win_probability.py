@@ -0,0 +1,34 @@
+"""Tests for the win probability model."""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.models.win_probability import MIN_TRAINING_SAMPLES, WinProbabilityModel, model_version
+
+
+class TestWinProbabilityModel:
+    """Tests for WinProbabilityModel training guards and versions."""
+
+    def test_train_requires_minimum_samples(self, tmp_path):
+        """Tiny sets would leave the early-stopping validation split empty."""
+        rows = MIN_TRAINING_SAMPLES - 1
+        labels = np.arange(rows) % 2
+
+        with pytest.raises(ValueError, match="training samples"):
+            WinProbabilityModel.train(np.zeros((rows, 2)), labels, ["a", "b"], str(tmp_path / "m.txt"))
+
+    def test_train_requires_both_outcomes(self, tmp_path):
+        rows = MIN_TRAINING_SAMPLES
+
+        with pytest.raises(ValueError, match="both"):
+            WinProbabilityModel.train(np.zeros((rows, 2)), np.ones(rows), ["a", "b"], str(tmp_path / "m.txt"))
+
+    def test_version_follows_saved_file(self, tmp_path):
+        """Loaded and freshly trained models name the same file the same way."""
+        path = tmp_path / "m.txt"
+        path.write_text("")
+        os.utime(path, (1700000000, 1700000000))
+
+        assert model_version(path) == "lgbm-20231114221320"